@@ -0,0 +1,153 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Benchmark the checks and results files for each of the file compressions,
+configured in netcad.toml, for a single device with a large number of
+interface checks.  The report includes the bytes written, and the wall time
+to write and to read back, the checks file and each of the results formats.
+
+Examples
+--------
+    python benchmarks/bench_check_files.py --checks 50000
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+import time
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.checks import CheckResultsFormat, measure_many, results_file_load
+from netcad.checks.check_file_compression import (
+    FileCompression,
+    cv_file_compression,
+    zstandard,
+)
+from netcad.feats.topology.checks.check_interfaces import (
+    InterfaceCheckCollection,
+    InterfaceCheckResult,
+)
+from netcam.save_check_results import device_checks_save_results, cv_results_format
+
+from bench_check_results import make_checks
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def main():
+    """Run the benchmark for each of the file compressions"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--checks", type=int, default=50_000, help="number of interface checks"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="timing repeats, the best is reported"
+    )
+    args = parser.parse_args()
+
+    compressions = [
+        comp for comp in FileCompression if comp != FileCompression.zstd or zstandard
+    ]
+
+    collection = InterfaceCheckCollection(
+        device="bench-sw1", checks=make_checks(args.checks)
+    )
+    results = list(
+        measure_many(
+            InterfaceCheckResult(device="bench-sw1", check=check)
+            for check in collection.checks
+        )
+    )
+    dut = SimpleNamespace(device=SimpleNamespace(name="bench-sw1"))
+
+    print(
+        f"{'file':<14} {'compression':<12} {'bytes':>12} {'write(s)':>9} {'read(s)':>8}"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+
+        for comp in compressions:
+            cv_file_compression.set(comp)
+
+            def save_checks():
+                asyncio.run(collection.save(tmp_dir))
+                return collection.filepath(tmp_dir, collection.name)
+
+            def load_checks(_checks_file):
+                asyncio.run(InterfaceCheckCollection.load(tmp_dir))
+
+            _report("checks", comp, args.repeat, save_checks, load_checks)
+
+        for results_format in (CheckResultsFormat.json, CheckResultsFormat.jsonl):
+            cv_results_format.set(results_format)
+
+            for comp in compressions:
+                cv_file_compression.set(comp)
+                fmt = results_format.with_compression(comp)
+
+                def save_results():
+                    asyncio.run(
+                        device_checks_save_results(dut, "interfaces", results, tmp_dir)
+                    )
+                    return tmp_dir / f"interfaces{fmt.suffix}"
+
+                def load_results(results_file):
+                    for _ in results_file_load(results_file):
+                        pass
+
+                _report(
+                    f"results-{results_format}",
+                    comp,
+                    args.repeat,
+                    save_results,
+                    load_results,
+                )
+
+
+# -----------------------------------------------------------------------------
+#
+#                          PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def _report(
+    name: str, comp: FileCompression, repeat: int, save: Callable, load: Callable
+):
+    write_secs, read_secs = float("inf"), float("inf")
+
+    for _ in range(repeat):
+        secs, filepath = _timed(save)
+        write_secs = min(write_secs, secs)
+
+        secs, _ = _timed(load, filepath)
+        read_secs = min(read_secs, secs)
+
+    size = filepath.stat().st_size
+    print(f"{name:<14} {comp:<12} {size:>12,} {write_secs:>9.3f} {read_secs:>8.3f}")
+
+
+def _timed(func: Callable, *args):
+    ts_start = time.perf_counter()
+    rv = func(*args)
+    return time.perf_counter() - ts_start, rv
+
+
+if __name__ == "__main__":
+    main()
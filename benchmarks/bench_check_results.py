@@ -0,0 +1,152 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Benchmark the creation of check-results by a DUT plugin, comparing the
+validating constructor with the unvalidated pydantic model_construct, for a
+single device with a large number of interface checks.  The report includes the CPU
+time and the python heap allocated for creating the results, and for
+measuring and serializing them as the results file writer does.
+
+Examples
+--------
+    python benchmarks/bench_check_results.py --results 50000
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+import time
+import argparse
+import tracemalloc
+from typing import Callable, List
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.checks import measure_many
+from netcad.feats.topology.checks.check_interfaces import (
+    InterfaceCheck,
+    InterfaceCheckParams,
+    InterfaceCheckUsedExpectations,
+    InterfaceCheckResult,
+    InterfaceCheckMeasurement,
+)
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def main():
+    """Run the benchmark for both of the construction methods"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--results", type=int, default=50_000, help="number of check-results"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="timing repeats, the best is reported"
+    )
+    args = parser.parse_args()
+
+    checks = make_checks(args.results)
+
+    print(
+        f"{'method':<10} {'create(s)':>10} {'heap(MB)':>9} {'blocks':>10} "
+        f"{'measure+dump(s)':>16}"
+    )
+
+    for name, create in (("validated", create_validated), ("construct", create_construct)):
+        # the heap is traced in a separate pass since tracing slows the run.
+
+        tracemalloc.start()
+        snapshot_base = tracemalloc.take_snapshot()
+        results = create(checks)
+        stats = tracemalloc.take_snapshot().compare_to(snapshot_base, "filename")
+        tracemalloc.stop()
+
+        heap = sum(stat.size_diff for stat in stats)
+        blocks = sum(stat.count_diff for stat in stats)
+        del results
+
+        create_secs, finish_secs = float("inf"), float("inf")
+
+        for _ in range(args.repeat):
+            secs, results = _timed(create, checks)
+            create_secs = min(create_secs, secs)
+
+            secs, _ = _timed(_measure_dump, results)
+            finish_secs = min(finish_secs, secs)
+
+        print(
+            f"{name:<10} {create_secs:>10.3f} {heap / 2**20:>9.1f} {blocks:>10} "
+            f"{finish_secs:>16.3f}"
+        )
+
+
+def make_checks(count: int) -> List[InterfaceCheck]:
+    """Returns the interface checks, as loaded from a checks file"""
+    return [
+        InterfaceCheck(
+            check_params=InterfaceCheckParams(
+                interface=f"Ethernet{i}", interface_flags=None
+            ),
+            expected_results=InterfaceCheckUsedExpectations(
+                used=True, desc=f"uplink {i}", oper_up=True, speed=10_000
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def create_validated(checks: List[InterfaceCheck]) -> list:
+    """Create the results as a plugin does, with the validating constructor"""
+    results = list()
+
+    for check in checks:
+        result = InterfaceCheckResult(device="bench-sw1", check=check)
+        msrd = result.measurement
+        msrd.used, msrd.desc, msrd.oper_up, msrd.speed = True, "uplink", True, 10_000
+        results.append(result)
+
+    return results
+
+
+def create_construct(checks: List[InterfaceCheck]) -> list:
+    """Create the results without validation, using model_construct"""
+    return [
+        InterfaceCheckResult.model_construct(
+            device="bench-sw1",
+            check=check,
+            measurement=InterfaceCheckMeasurement.model_construct(
+                used=True, desc="uplink", oper_up=True, speed=10_000
+            ),
+        )
+        for check in checks
+    ]
+
+
+# -----------------------------------------------------------------------------
+#
+#                          PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def _measure_dump(results: list):
+    for result in measure_many(results):
+        result.model_dump(warnings="none")
+
+
+def _timed(func: Callable, *args):
+    ts_start = time.perf_counter()
+    rv = func(*args)
+    return time.perf_counter() - ts_start, rv
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Benchmark the netcam check execution pipeline using the replay DUT plugin, so
+that changes to the scheduling, checks loading, and results saving can be
+measured without network devices.
+
+For each of the device counts, a set of synthetic devices is created, each
+with an "interfaces" check collection, and the checks are executed through
+the same scheduler used by `netcam check`.  The report includes the
+throughput, the peak memory, and the latency spread of each phase.
+
+Examples
+--------
+    python benchmarks/bench_execute_checks.py --devices 100 --devices 1000
+    python benchmarks/bench_execute_checks.py --devices 10000 --checks 48 \
+        --latency 0.05 --jitter 0.02 --max-concurrent 500
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import resource
+import tempfile
+import tracemalloc
+from types import SimpleNamespace
+from collections import defaultdict, Counter
+from statistics import quantiles
+from pathlib import Path
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.logger import get_logger
+from netcad.checks import CheckResultsFormat
+from netcad.feats.topology.checks.check_interfaces import (
+    InterfaceCheckCollection,
+    InterfaceCheck,
+    InterfaceCheckParams,
+    InterfaceCheckUsedExpectations,
+)
+
+from netcam.run_checks import CheckRunOptions
+from netcam.schedule_checks import schedule_device_checks
+from netcam.timing import TimingRecorder, cv_timing
+from netcam.replay import ReplayDeviceUnderTest, ReplayConfig
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+DESIGN_NAME = "bench"
+
+
+def main():
+    """Run the benchmark for each of the requested device counts"""
+    args = _parse_args()
+    get_logger().setLevel(logging.WARNING)
+
+    print(
+        f"{'devices':>8} {'checks':>9} {'elapsed(s)':>10} {'devices/s':>10} "
+        f"{'checks/s':>10} {'max-rss(MB)':>11} {'heap-peak(MB)':>13}  "
+        "phase p50/p95/p99 (ms)"
+    )
+
+    for n_devices in args.devices:
+        with tempfile.TemporaryDirectory(prefix="netcam-bench-") as tmp_dir:
+            report = run_benchmark(Path(tmp_dir), n_devices, args)
+            _print_report(report)
+
+
+def run_benchmark(work_dir: Path, n_devices: int, args) -> dict:
+    """
+    Create the synthetic devices in the work directory, execute their checks,
+    and return the measurements.
+    """
+    checks_dir = work_dir / "checks"
+    devices = make_devices(checks_dir, n_devices, args.checks)
+
+    config = ReplayConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        setup_latency=args.setup_latency,
+        seed=0,
+    )
+
+    duts = list()
+    for device in devices:
+        dut = ReplayDeviceUnderTest(device=device, config=config)
+        dut.testcases_dir = checks_dir / DESIGN_NAME / device.name
+        duts.append(dut)
+
+    CheckRunOptions(
+        checks_dir=checks_dir,
+        max_concurrent=args.max_concurrent,
+        results_format=CheckResultsFormat(args.results_format),
+    ).apply()
+
+    recorder = TimingRecorder()
+    cv_timing.set(recorder)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    ts_start = time.perf_counter()
+    counts = asyncio.run(_run_checks(duts, args.max_concurrent))
+    elapsed = time.perf_counter() - ts_start
+
+    heap_peak = None
+    if args.tracemalloc:
+        _, heap_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    cv_timing.set(None)
+
+    return dict(
+        devices=n_devices,
+        checks=sum(counts.values()),
+        elapsed=elapsed,
+        max_rss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        heap_peak=heap_peak,
+        phases=_phase_percentiles(recorder.spans),
+    )
+
+
+def make_devices(checks_dir: Path, n_devices: int, n_checks: int) -> list:
+    """
+    Create the checks directory for each of the synthetic devices, and return
+    the device objects.  The devices provide only the attributes used by the
+    checks execution.
+    """
+    template = InterfaceCheckCollection(
+        device="{device}",
+        checks=[
+            InterfaceCheck(
+                check_params=InterfaceCheckParams(
+                    interface=f"Ethernet{i}", interface_flags=None
+                ),
+                expected_results=InterfaceCheckUsedExpectations(
+                    used=True, desc=f"uplink {i}", oper_up=True, speed=10_000
+                ),
+            )
+            for i in range(1, n_checks + 1)
+        ],
+    )
+
+    checks_json = json.dumps(template.model_dump(), indent=3)
+    design = SimpleNamespace(name=DESIGN_NAME)
+    features = dict(
+        topology=SimpleNamespace(check_collections=[InterfaceCheckCollection])
+    )
+    devices = list()
+
+    for i in range(n_devices):
+        name = f"bench-sw{i:05}"
+        dev_dir = checks_dir / DESIGN_NAME / name
+        dev_dir.mkdir(parents=True)
+
+        InterfaceCheckCollection.filepath(dev_dir, "interfaces").write_text(
+            checks_json.replace("{device}", name)
+        )
+
+        devices.append(SimpleNamespace(name=name, design=design, features=features))
+
+    return devices
+
+
+# -----------------------------------------------------------------------------
+#
+#                          PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+async def _run_checks(duts: list, max_concurrent: int) -> Counter:
+    counts = Counter()
+
+    async for dut in schedule_device_checks(duts, max_concurrent=max_concurrent):
+        counts.update(dut.result_counts)
+
+    return counts
+
+
+def _phase_percentiles(spans: list) -> dict:
+    durations = defaultdict(list)
+    for span in spans:
+        durations[span["phase"]].append(span["duration"] * 1000)
+
+    phases = dict()
+    for phase, values in durations.items():
+        if len(values) < 2:
+            phases[phase] = (values[0],) * 3
+            continue
+
+        cuts = quantiles(values, n=100, method="inclusive")
+        phases[phase] = (cuts[49], cuts[94], cuts[98])
+
+    return phases
+
+
+def _print_report(report: dict):
+    elapsed = report["elapsed"]
+    heap_peak = report["heap_peak"]
+    phases = "  ".join(
+        f"{phase}={p50:.1f}/{p95:.1f}/{p99:.1f}"
+        for phase, (p50, p95, p99) in report["phases"].items()
+    )
+
+    print(
+        f"{report['devices']:>8} {report['checks']:>9} {elapsed:>10.2f} "
+        f"{report['devices'] / elapsed:>10.1f} {report['checks'] / elapsed:>10.1f} "
+        f"{report['max_rss'] / 2**20:>11.1f} "
+        f"{heap_peak / 2**20 if heap_peak is not None else float('nan'):>13.1f}  "
+        f"{phases}"
+    )
+    sys.stdout.flush()
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--devices",
+        type=int,
+        action="append",
+        help="number of devices, may be repeated (default 100, 1000, 10000)",
+    )
+    parser.add_argument(
+        "--checks", type=int, default=24, help="interface checks per device"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="device latency (s) per check collection",
+    )
+    parser.add_argument("--jitter", type=float, default=0.0, help="latency jitter (s)")
+    parser.add_argument(
+        "--setup-latency", type=float, default=0.0, help="device login latency (s)"
+    )
+    parser.add_argument(
+        "--max-concurrent", type=int, default=100, help="max concurrent devices"
+    )
+    parser.add_argument(
+        "--results-format",
+        default="json",
+        choices=[str(fmt) for fmt in CheckResultsFormat],
+        help="results file format",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="report the peak python heap; slows the run noticeably",
+    )
+
+    args = parser.parse_args()
+    args.devices = args.devices or [100, 1_000, 10_000]
+    return args
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,12 @@
 #  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
 
 from .check import Check
-from .check_result import CheckResult, CheckResultList, CheckResultsCollection
+from .check_result import (
+    CheckResult,
+    CheckResultList,
+    CheckResultsCollection,
+    measure_many,
+)
 
 from .check_exclusively import (
     CheckExclusiveResult,
@@ -14,3 +19,8 @@ from .check_status import CheckStatus, CheckStatusFlag
 from .check_collection import CheckCollection, CheckCollectionT
 
 from .check_registry import register_collection
+from .check_results_file import (
+    CheckResultsFormat,
+    results_file_find,
+    results_file_load,
+)
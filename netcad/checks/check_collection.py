@@ -6,6 +6,7 @@
 # -----------------------------------------------------------------------------
 
 import sys
+from functools import lru_cache
 from typing import List, Optional, Any, Type, ClassVar
 from typing import TYPE_CHECKING
 from pathlib import Path
@@ -23,6 +24,14 @@ import aiofiles
 # -----------------------------------------------------------------------------
 
 from . import Check, CheckResult
+from .check_collection_cache import checks_cache_get, checks_cache_put
+from .check_file_compression import (
+    FileCompression,
+    cv_file_compression,
+    file_compress,
+    file_decompress,
+    file_find,
+)
 
 if TYPE_CHECKING:
     from netcad.design import DesignFeature
@@ -62,11 +71,32 @@ class CheckCollection(BaseModel):
 
     @staticmethod
     def filepath(testcase_dir: Path, service: str) -> Path:
-        return testcase_dir.joinpath(f"{service}.json")
+        """
+        Returns the checks file for the service, which may be compressed; see
+        FileCompression.  If the checks file does not exist the uncompressed
+        file name is returned.
+        """
+        checks_file = testcase_dir.joinpath(f"{service}.json")
+        return file_find(checks_file) or checks_file
 
     async def save(self, testcase_dir: Path):
-        async with aiofiles.open(self.filepath(testcase_dir, self.name), "w+") as ofile:
-            await ofile.write(json.dumps(self.model_dump(), indent=3))
+        compression = cv_file_compression.get()
+        checks_file = testcase_dir.joinpath(f"{self.name}.json{compression.suffix}")
+
+        # the uncompressed checks files are indented for the benefit of the
+        # User reading them.
+
+        indent = 3 if compression == FileCompression.none else None
+        content = json.dumps(self.model_dump(), indent=indent).encode()
+
+        async with aiofiles.open(checks_file, "wb") as ofile:
+            await ofile.write(file_compress(content, compression))
+
+        for each in FileCompression:
+            if each != compression:
+                checks_file.with_name(f"{self.name}.json{each.suffix}").unlink(
+                    missing_ok=True
+                )
 
     @classmethod
     def get_name(cls):
@@ -75,9 +105,19 @@ class CheckCollection(BaseModel):
 
     @classmethod
     async def load(cls, testcase_dir: Path):
-        async with aiofiles.open(cls.filepath(testcase_dir, cls.get_name())) as infile:
-            content = json.loads(await infile.read())
-            return cls.model_validate(content)
+        checks_file = cls.filepath(testcase_dir, cls.get_name())
+
+        if (collection := checks_cache_get(checks_file)) is not None:
+            return collection
+
+        # validate the JSON content directly rather than first decoding it
+        # into python objects.
+
+        async with aiofiles.open(checks_file, "rb") as infile:
+            collection = cls.model_validate_json(file_decompress(await infile.read()))
+
+        checks_cache_put(checks_file, collection)
+        return collection
 
     @classmethod
     def build(cls, obj: Any, design_feature: "DesignFeature") -> "CheckCollection":
@@ -117,7 +157,7 @@ class CheckCollection(BaseModel):
                 f"This check collection does not have bound check-type: {check_type}"
             )
 
-        return TypeAdapter(cls_type).validate_python(result)
+        return _result_type_adapter(cls_type).validate_python(result)
 
     def __init_subclass__(cls, **kwargs):
         mod = sys.modules.get(cls.__module__)
@@ -145,3 +185,18 @@ class CheckCollection(BaseModel):
 
 
 CheckCollectionT = Type[CheckCollection]
+
+
+# -----------------------------------------------------------------------------
+#
+#                          PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=None)
+def _result_type_adapter(cls_type: Type[CheckResult]) -> TypeAdapter:
+    # creating the TypeAdapter builds the validator for the check result type,
+    # which is far more costly than the validation of a result; so the adapter
+    # is created once per check result type.
+    return TypeAdapter(cls_type)
@@ -0,0 +1,87 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, Dict, Tuple, TYPE_CHECKING
+from contextvars import ContextVar
+from pathlib import Path
+
+if TYPE_CHECKING:
+    from .check_collection import CheckCollection
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    "cv_checks_cache",
+    "checks_cache_get",
+    "checks_cache_put",
+    "checks_cache_clear",
+]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+# when True, the validated check collections are retained in memory so that
+# loading the same, unchanged, checks file again does not re-validate it.  This
+# is used by long-running processes that load the checks repeatedly; a single
+# `netcam check` run loads each checks file once so the cache is disabled by
+# default to avoid retaining all collections in memory.
+
+cv_checks_cache = ContextVar("checks_cache", default=False)
+
+# key=checks file path, value=tuple(file-stat-key, collection)
+_checks_cache: Dict[Path, Tuple[Tuple[int, int], "CheckCollection"]] = dict()
+
+
+def checks_cache_get(checks_file: Path) -> Optional["CheckCollection"]:
+    """
+    Returns a copy of the cached check collection if the checks file has not
+    changed since it was cached; otherwise None.  The copy is shallow; the
+    Caller may replace the collection attributes, for example the list of
+    checks, but should not modify the checks themselves.
+    """
+    if not cv_checks_cache.get():
+        return None
+
+    if not (cached := _checks_cache.get(checks_file)):
+        return None
+
+    stat_key, collection = cached
+    if stat_key != _stat_key(checks_file):
+        del _checks_cache[checks_file]
+        return None
+
+    return collection.model_copy()
+
+
+def checks_cache_put(checks_file: Path, collection: "CheckCollection"):
+    """Retain a copy of the validated check collection, if enabled"""
+    if cv_checks_cache.get():
+        _checks_cache[checks_file] = (
+            _stat_key(checks_file),
+            collection.model_copy(),
+        )
+
+
+def checks_cache_clear():
+    _checks_cache.clear()
+
+
+# -----------------------------------------------------------------------------
+#
+#                          PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def _stat_key(checks_file: Path) -> Tuple[int, int]:
+    st = checks_file.stat()
+    return st.st_mtime_ns, st.st_size
@@ -0,0 +1,244 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, IO
+from contextvars import ContextVar
+from pathlib import Path
+from enum import auto
+import gzip
+import zlib
+import io
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+# zstandard is optional; when installed the checks and results files can be
+# compressed with zstd, which is both faster and smaller than gzip.
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.config import netcad_globals
+from netcad.helpers import StrEnum
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    "FileCompression",
+    "cv_file_compression",
+    "file_compression_check",
+    "file_compression_config",
+    "file_compress",
+    "file_compressobj",
+    "file_decompress",
+    "file_find",
+    "file_open_text",
+    "file_read_bytes",
+]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+# noinspection PyArgumentList
+class FileCompression(StrEnum):
+    """
+    The compression used when writing the checks and results files.  The
+    compression is identified by the file suffix, for example
+    "interfaces.json.gz", and the readers detect compressed content from the
+    file itself so that they do not need to know which compression was used by
+    the writer.
+    """
+
+    none = auto()
+    gzip = auto()
+
+    # requires the zstandard package
+    zstd = auto()
+
+    @property
+    def suffix(self) -> str:
+        return _COMPRESSION_SUFFIX[self]
+
+    @classmethod
+    def from_suffix(cls, suffix: str) -> "FileCompression":
+        return next(comp for comp in cls if comp.suffix == suffix)
+
+
+# the compression used when writing the checks and results files; set from
+# the netcad.toml configuration, see file_compression_config.
+
+cv_file_compression = ContextVar("file_compression", default=FileCompression.none)
+
+
+def file_compression_config() -> FileCompression:
+    """
+    Returns the file compression from the netcad configuration file, for
+    example:
+
+        [checks]
+        compression = "zstd"
+
+    The default is no compression.
+    """
+    value = netcad_globals.g_config.get("checks", {}).get("compression", "none")
+
+    try:
+        compression = FileCompression(value)
+    except ValueError:
+        raise RuntimeError(
+            f"Invalid checks compression: {value}, "
+            f"expected one of: {', '.join(FileCompression)}"
+        )
+
+    file_compression_check(compression)
+    return compression
+
+
+def file_compression_check(compression: FileCompression):
+    """
+    Check that the compression can be used, raising RuntimeError when its
+    optional package is not installed.
+    """
+    if compression == FileCompression.zstd and not zstandard:
+        raise RuntimeError(_ZSTD_REQUIRED)
+
+
+def file_compress(content: bytes, compression: FileCompression) -> bytes:
+    """Returns the content compressed; used to write a complete file"""
+    if not (compressor := file_compressobj(compression)):
+        return content
+
+    return compressor.compress(content) + compressor.flush()
+
+
+def file_compressobj(compression: FileCompression):
+    """
+    Returns the incremental compressor, with `compress` and `flush` methods,
+    used to write a file in batches; or None when there is no compression.
+    """
+    match compression:
+        case FileCompression.gzip:
+            # wbits=31 produces the gzip container rather than raw zlib.
+            return zlib.compressobj(level=_GZIP_LEVEL, wbits=31)
+
+        case FileCompression.zstd:
+            file_compression_check(compression)
+            return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compressobj()
+
+    return None
+
+
+def file_find(filepath: Path) -> Optional[Path]:
+    """
+    Locate the file, given its uncompressed path, regardless of the
+    compression that was used to write it.  If more than one exists, for
+    example the User changed the compression without removing the previous
+    files, the most recent is returned.
+
+    Returns
+    -------
+    The Path to the file, or None if the file does not exist.
+    """
+    found = [
+        each
+        for comp in FileCompression
+        if (each := filepath.with_name(filepath.name + comp.suffix)).exists()
+    ]
+
+    if len(found) < 2:
+        return found[0] if found else None
+
+    return max(found, key=lambda f: f.stat().st_mtime)
+
+
+def file_read_bytes(filepath: Path) -> bytes:
+    """Returns the content of the file, decompressed if required"""
+    return file_decompress(filepath.read_bytes())
+
+
+def file_decompress(content: bytes) -> bytes:
+    """Returns the file content decompressed, or as-is if not compressed"""
+    match _detect(content[:4]):
+        case FileCompression.gzip:
+            return gzip.decompress(content)
+
+        case FileCompression.zstd:
+            return _zstd_reader(io.BytesIO(content)).read()
+
+    return content
+
+
+def file_open_text(filepath: Path) -> IO[str]:
+    """
+    Returns the file opened for reading text, decompressing the content as it
+    is read if required.
+    """
+    with filepath.open("rb") as ifile:
+        magic = ifile.read(4)
+
+    match _detect(magic):
+        case FileCompression.gzip:
+            return gzip.open(filepath, "rt")
+
+        case FileCompression.zstd:
+            return io.TextIOWrapper(_zstd_reader(filepath.open("rb")))
+
+    return filepath.open()
+
+
+# -----------------------------------------------------------------------------
+#
+#                            PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+_COMPRESSION_SUFFIX = {
+    FileCompression.none: "",
+    FileCompression.gzip: ".gz",
+    FileCompression.zstd: ".zst",
+}
+
+# the compression levels favor the write time over the size; the checks and
+# results files are very repetitive so that the higher levels gain little.
+
+_GZIP_LEVEL = 6
+_ZSTD_LEVEL = 3
+
+_ZSTD_REQUIRED = "zstd compression requires zstandard to be installed"
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _detect(magic: bytes) -> FileCompression:
+    if magic.startswith(_GZIP_MAGIC):
+        return FileCompression.gzip
+
+    if magic.startswith(_ZSTD_MAGIC):
+        return FileCompression.zstd
+
+    return FileCompression.none
+
+
+def _zstd_reader(ifile):
+    if not zstandard:
+        raise RuntimeError(_ZSTD_REQUIRED)
+
+    return zstandard.ZstdDecompressor().stream_reader(ifile, closefd=True)
@@ -5,7 +5,8 @@
 # System Imports
 # -----------------------------------------------------------------------------
 
-from typing import Optional, Any, List, TypeVar, Generic
+from typing import Optional, Any, List, Tuple, Iterable, TypeVar, Generic
+from functools import lru_cache
 import typing
 
 # -----------------------------------------------------------------------------
@@ -29,7 +30,12 @@ from .check_result_log import CheckResultLogs
 # Exports
 # -----------------------------------------------------------------------------
 
-__all__ = ["CheckResult", "CheckResultList", "CheckResultsCollection"]
+__all__ = [
+    "CheckResult",
+    "CheckResultList",
+    "CheckResultsCollection",
+    "measure_many",
+]
 
 
 # -----------------------------------------------------------------------------
@@ -137,7 +143,6 @@ class CheckResult(BaseModel, Generic[CheckT], metaclass=MetaCheckResult):
         """
 
         arbitrary_types_allowed = True
-        json_encoders = {CheckResultLogs: lambda log: log.data}
 
     # noinspection PyUnusedLocal
     @field_validator("check_id", mode="before")
@@ -154,6 +159,17 @@ class CheckResult(BaseModel, Generic[CheckT], metaclass=MetaCheckResult):
         return id(self)
 
 
+def measure_many(results: Iterable[CheckResult], **kwargs) -> List[CheckResult]:
+    """
+    Measure each of the check-results, see CheckResult.measure, returning the
+    list of results.  The DUT plugins use this to measure all of the results
+    of a check collection at once, for example:
+
+        return measure_many(results, on_mismatch=self._on_mismatch)
+    """
+    return [_finalize_result(result, **kwargs) for result in results]
+
+
 # -----------------------------------------------------------------------------
 #
 #                            PRIVATE CODE BEGINS
@@ -198,22 +214,29 @@ def _finalize_result(result: CheckResult, **kwargs) -> CheckResult:
     # Check for per-field mismatches on the measurement compared to expected.
     # -------------------------------------------------------------------------
 
-    def mismatch_is_error(_field, _expded, _actual):
-        """by default the field mismatch is a check failure"""
-        return CheckStatus.FAIL
+    on_mismatch = kwargs.get("on_mismatch") or _mismatch_is_error
+    plan = _measure_plan(type(msrd), type(expd))
 
-    on_mismatch = kwargs.get("on_mismatch") or mismatch_is_error
+    # check to see if there are any field-mismatches; the mismatched fields
+    # are kept in the order of the measurement fields.
 
-    # check to see if there are any field-mismatches
-    mismatch_fields = set()
+    mismatch_fields = dict()
     check_status_flags = CheckStatusFlag.PASS
+    msrd_values = msrd.__dict__
+    expd_values = getattr(expd, "__dict__", None) or {}
+    logs = list()
+
+    for field, expd_is_field in plan:
+        m_field = msrd_values[field]
 
-    for field in msrd.__fields__:
-        m_field = getattr(msrd, field)
+        if expd_is_field:
+            e_field = expd_values.get(field)
+        else:
+            e_field = getattr(expd, field, None)
 
-        if (e_field := getattr(expd, field, None)) is None:
+        if e_field is None:
             # extra data supplied by DUT
-            result.logs.INFO(field, m_field)
+            logs.append((CheckStatus.INFO, field, m_field))
             continue
 
         # if the fields are mismatched, then invoke the developer callback (or
@@ -222,12 +245,13 @@ def _finalize_result(result: CheckResult, **kwargs) -> CheckResult:
 
         if e_field != m_field:
             field_status = on_mismatch(field, e_field, m_field) or CheckStatus.FAIL
-            field_status_flag = field_status.to_flag()
-            check_status_flags |= field_status_flag
+            check_status_flags |= field_status.to_flag()
             if field_status != CheckStatus.SKIP:
-                mismatch_fields.add(field)
+                mismatch_fields[field] = True
+
+        logs.append((field_status, field, {"expected": e_field, "measured": m_field}))
 
-        result.logs.log(field_status, field, {"expected": e_field, "measured": m_field})
+    result.logs.root.extend(logs)
 
     if mismatch_fields:
         setattr(result, "field", ", ".join(mismatch_fields))
@@ -238,6 +262,23 @@ def _finalize_result(result: CheckResult, **kwargs) -> CheckResult:
     return result
 
 
+def _mismatch_is_error(_field, _expded, _actual):
+    """by default the field mismatch is a check failure"""
+    return CheckStatus.FAIL
+
+
+@lru_cache(maxsize=None)
+def _measure_plan(msrd_cls: type, expd_cls: type) -> Tuple[Tuple[str, bool], ...]:
+    """
+    Returns the measurement plan for the pair of measurement and expected
+    classes, computed once per pair: the measurement field names, in order,
+    each with a flag that is True when the expected class defines the same
+    field so that the value can be taken directly from the instance.
+    """
+    expd_fields = getattr(expd_cls, "model_fields", None) or {}
+    return tuple((field, field in expd_fields) for field in msrd_cls.model_fields)
+
+
 CheckResultsCollection = List[CheckResult]
 
 
@@ -1,18 +1,36 @@
 from typing import List, Optional
 from functools import partial
+from contextvars import ContextVar
+import sys
 
 from rich.table import Table, Text
 from rich.pretty import Pretty
-from pydantic import Field, RootModel
+from pydantic import Field, RootModel, SerializationInfo
+from pydantic import field_validator, field_serializer
 
 from netcad.checks.check_status import CheckStatus
 
+# when False (default), the PASS log entries are written to the results files
+# without the measured value, since the PASS entries are the large majority
+# and the measured value is the same as the expected value.
+
+cv_log_pass = ContextVar("log_pass", default=False)
+
+# the serialization context used by the Caller writing the results files, for
+# example: result.model_dump(context=RESULTS_FILE_CONTEXT)
+
+RESULTS_FILE_CONTEXT = {"results_file": True}
+
 
 class CheckResultLogs(RootModel):
     """
     The CheckResultLog is a field within the CheckResult class.  It is used to
     store the check-result logging information so that it can be expressed to
     the User in an easy manner.
+
+    Each log entry is the tuple (status, field, data).  The status is the
+    CheckStatus member, and the field name is interned, so that the many log
+    entries of a large run share these values.
     """
 
     root: List = Field(default_factory=list)
@@ -21,15 +39,13 @@ class CheckResultLogs(RootModel):
         if not table:
             table = Table(show_header=False, box=None)
 
-        status_id_hash = {id(log): CheckStatus(log[0]) for log in self.root}
-
-        def sorted_by_status(_log):
-            return status_id_hash[id(_log)].to_flag()
-
-        for log in sorted(self.root, key=sorted_by_status, reverse=True):
-            st_enum = status_id_hash[id(log)]
-            status, field, log_info = log
+        entries = sorted(
+            ((CheckStatus(log[0]), log) for log in self.root),
+            key=lambda item: item[0].to_flag(),
+            reverse=True,
+        )
 
+        for st_enum, (status, field, log_info) in entries:
             if st_enum == CheckStatus.PASS:
                 log_info = log_info["expected"]
 
@@ -40,7 +56,7 @@ class CheckResultLogs(RootModel):
         return table
 
     def log(self, /, status, field, data):
-        self.root.append([status, field, data])
+        self.root.append((status, field, data))
 
     def info(self, field, data):
         self.log(CheckStatus.INFO, field, data)
@@ -51,6 +67,25 @@ class CheckResultLogs(RootModel):
     def fail(self, field, data):
         self.log(CheckStatus.FAIL, field, data)
 
+    # noinspection PyNestedDecorators
+    @field_validator("root", mode="after")
+    @classmethod
+    def _compact_entries(cls, root: List) -> List:
+        """the log entries read from a results file are stored compactly"""
+        return [
+            (_status_map.get(log[0], log[0]), sys.intern(log[1]), log[2])
+            if len(log) == 3 and isinstance(log[1], str)
+            else log
+            for log in root
+        ]
+
+    @field_serializer("root")
+    def _serialize_entries(self, root: List, info: SerializationInfo) -> List:
+        if cv_log_pass.get() or not (info.context or {}).get("results_file"):
+            return root
+
+        return [_pass_summary(log) for log in root]
+
     def __getattr__(self, item):
         """
         Define the getattr oberload so the caller can invite the logging methods
@@ -66,3 +101,17 @@ class CheckResultLogs(RootModel):
             return partial(self.log, as_status)
         except ValueError:
             return None
+
+
+_status_map = {str(status): status for status in CheckStatus}
+
+
+def _pass_summary(log):
+    """the PASS log entry with only the expected value; see cv_log_pass"""
+    if len(log) != 3 or log[0] != CheckStatus.PASS:
+        return log
+
+    if not isinstance(data := log[2], dict):
+        return log
+
+    return log[0], log[1], {"expected": data.get("expected")}
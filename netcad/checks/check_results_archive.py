@@ -0,0 +1,402 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Iterable, Iterator, Optional, Sequence, Dict, List
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from array import array
+from enum import auto
+import zipfile
+import json
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+# pyarrow is optional; when installed the archives can be written as Parquet
+# files for use by other analytics tools.
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.helpers import StrEnum
+from .check_results_file import (
+    CHECKS_DIGEST_FILENAME,
+    CheckResultsFormat,
+    results_file_load,
+)
+from .check_results_summary import RESULTS_SUMMARY_FILENAME
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["ArchiveFormat", "CheckResultsArchive", "ARCHIVE_COLUMNS"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+# the columns of each archived result.  The result logs are kept in a separate
+# "logs" column, as JSON, that is read only when requested.
+
+ARCHIVE_COLUMNS = (
+    "design",
+    "device",
+    "collection",
+    "check_type",
+    "check_id",
+    "status",
+    "field",
+)
+
+
+# noinspection PyArgumentList
+class ArchiveFormat(StrEnum):
+    """
+    The results archive file formats.  The format is identified by the file
+    suffix.
+    """
+
+    # a zip file of dictionary-encoded columns; requires only the standard
+    # library.
+    columns = auto()
+
+    # a Parquet file; requires pyarrow.
+    parquet = auto()
+
+    @property
+    def suffix(self) -> str:
+        return ".ncra" if self == ArchiveFormat.columns else ".parquet"
+
+    @classmethod
+    def default(cls) -> "ArchiveFormat":
+        """Parquet when pyarrow is installed, otherwise columns"""
+        return cls.parquet if pyarrow else cls.columns
+
+    @classmethod
+    def from_path(cls, archive_file: Path) -> "ArchiveFormat":
+        for fmt in cls:
+            if archive_file.suffix == fmt.suffix:
+                return fmt
+
+        raise ValueError(f"Unknown results archive format: {archive_file.name}")
+
+
+class CheckResultsArchive:
+    """
+    A columnar archive of the check results of a run, for scanning the
+    results of many runs and devices without parsing the results files.  The
+    archive is created from the per-device results files, see `create`, and
+    is read-only.
+
+    Attributes
+    ----------
+    archive_file: Path
+        The archive file.
+
+    format: ArchiveFormat
+        The archive file format.
+
+    Examples
+    --------
+        archive = CheckResultsArchive(archive_file)
+        for row in archive.query(status=["FAIL"], check_type=["interface"]):
+            print(row["device"], row["check_id"], row["field"])
+    """
+
+    def __init__(self, archive_file: Path):
+        self.archive_file = archive_file
+        self.format = ArchiveFormat.from_path(archive_file)
+
+        if self.format == ArchiveFormat.parquet:
+            if not pyarrow:
+                raise RuntimeError(
+                    f"{archive_file.name}: Parquet archives require pyarrow"
+                )
+            self._reader = _ParquetReader(archive_file)
+        else:
+            self._reader = _ColumnsReader(archive_file)
+
+    @property
+    def meta(self) -> dict:
+        """The archive metadata; for example the time the archive was created"""
+        return self._reader.meta
+
+    def __len__(self) -> int:
+        return self._reader.meta["rows"]
+
+    @classmethod
+    def create(
+        cls,
+        archive_file: Path,
+        checks_dir: Path,
+        designs: Optional[Sequence[str]] = None,
+    ) -> "CheckResultsArchive":
+        """
+        Create the archive from all of the per-device results files in the
+        checks directory, or only those of the given designs.  The archive
+        format is determined by the archive file suffix; see ArchiveFormat.
+        """
+        fmt = ArchiveFormat.from_path(archive_file)
+        columns = {name: list() for name in ARCHIVE_COLUMNS}
+        logs = list()
+
+        for row, row_logs in _checks_dir_rows(checks_dir, designs):
+            for name, value in zip(ARCHIVE_COLUMNS, row):
+                columns[name].append(value)
+            logs.append(row_logs)
+
+        meta = dict(
+            rows=len(logs),
+            created=datetime.now().isoformat(),
+            checks_dir=str(checks_dir),
+        )
+
+        if fmt == ArchiveFormat.parquet:
+            if not pyarrow:
+                raise RuntimeError(
+                    f"{archive_file.name}: Parquet archives require pyarrow"
+                )
+            _write_parquet(archive_file, columns, logs, meta)
+        else:
+            _write_columns(archive_file, columns, logs, meta)
+
+        return cls(archive_file)
+
+    def query(
+        self, with_logs: bool = False, **filters: Iterable[str]
+    ) -> Iterator[dict]:
+        """
+        Yields the archived results, as dict of the archive columns, that
+        match the filters.  Each filter is the column name and the list of
+        allowed values, for example status=["FAIL"].  When `with_logs` is
+        True, each row includes the result "logs".
+        """
+        rows = self._reader.select(_filters(filters))
+        columns = {name: self._reader.column(name, rows) for name in ARCHIVE_COLUMNS}
+
+        if with_logs:
+            columns["logs"] = map(json.loads, self._reader.logs(rows))
+
+        names = list(columns)
+        for values in zip(*columns.values()):
+            yield dict(zip(names, values))
+
+    def counts(self, by: str = "status", **filters: Iterable[str]) -> Counter:
+        """
+        Returns the count of the results that match the filters by the values
+        of the `by` column.
+        """
+        if by not in ARCHIVE_COLUMNS:
+            raise ValueError(f"Unknown archive column: {by}")
+
+        rows = self._reader.select(_filters(filters))
+        return Counter(self._reader.column(by, rows))
+
+
+# -----------------------------------------------------------------------------
+#
+#                            PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+_COLUMNS_FORMAT_VERSION = 1
+
+
+def _filters(filters: Dict[str, Iterable[str]]) -> Dict[str, set]:
+    if unknown := set(filters) - set(ARCHIVE_COLUMNS):
+        raise ValueError(f"Unknown archive columns: {', '.join(sorted(unknown))}")
+
+    return {name: set(values) for name, values in filters.items() if values}
+
+
+def _checks_dir_rows(checks_dir: Path, designs: Optional[Sequence[str]]) -> Iterator:
+    """
+    Yields (row, logs-json) for each of the results in the per-device results
+    files, <checks_dir>/<design>/<device>/results/<collection>.<format>.
+    """
+    suffixes = [fmt.suffix for fmt in CheckResultsFormat]
+
+    # the results directory also holds the bookkeeping files, with the same
+    # suffix as the results files, that are not archived.
+    sidecars = (CHECKS_DIGEST_FILENAME, RESULTS_SUMMARY_FILENAME)
+
+    for results_dir in sorted(checks_dir.glob("*/*/results")):
+        dev_dir = results_dir.parent
+        design, device = dev_dir.parent.name, dev_dir.name
+
+        if designs and design not in designs:
+            continue
+
+        for results_file in sorted(results_dir.iterdir()):
+            name = results_file.name
+            if name in sidecars:
+                continue
+
+            if not (sfx := next(filter(name.endswith, suffixes), None)):
+                continue
+
+            collection = name.removesuffix(sfx)
+
+            for payload in results_file_load(results_file):
+                check = payload["check"]
+                row = (
+                    design,
+                    device,
+                    collection,
+                    check.get("check_type"),
+                    payload.get("check_id"),
+                    payload.get("status"),
+                    payload.get("field"),
+                )
+                yield row, json.dumps(payload.get("logs") or [])
+
+
+# -----------------------------------------------------------------------------
+# Columns format: a zip file with the meta.json, and for each column the list
+# of unique values, <column>.values.json, and the row values as indexes into
+# that list, <column>.codes.  The logs column is logs.jsonl.
+# -----------------------------------------------------------------------------
+
+
+def _write_columns(
+    archive_file: Path, columns: Dict[str, List], logs: List[str], meta: dict
+):
+    with zipfile.ZipFile(archive_file, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(
+            "meta.json",
+            json.dumps(dict(meta, version=_COLUMNS_FORMAT_VERSION)),
+        )
+
+        for name, values in columns.items():
+            unique = dict.fromkeys(values)
+            value_codes = {value: code for code, value in enumerate(unique)}
+            codes = array("I", map(value_codes.__getitem__, values))
+
+            zf.writestr(f"{name}.values.json", json.dumps(list(unique)))
+            zf.writestr(f"{name}.codes", codes.tobytes())
+
+        zf.writestr("logs.jsonl", "\n".join(logs))
+
+
+class _ColumnsReader:
+    def __init__(self, archive_file: Path):
+        self.zf = zipfile.ZipFile(archive_file)
+        self.meta = json.loads(self.zf.read("meta.json"))
+        self._columns: Dict[str, tuple] = dict()
+
+    def _column_codes(self, name: str) -> tuple:
+        if (column := self._columns.get(name)) is None:
+            codes = array("I")
+            codes.frombytes(self.zf.read(f"{name}.codes"))
+            values = json.loads(self.zf.read(f"{name}.values.json"))
+            column = self._columns[name] = (values, codes)
+
+        return column
+
+    def select(self, filters: Dict[str, set]) -> Optional[List[int]]:
+        """Returns the matching row numbers, or None for all rows"""
+        rows = None
+
+        # each filter is applied to the integer codes of the column rather
+        # than the values.
+
+        for name, allowed in filters.items():
+            values, codes = self._column_codes(name)
+            want = {code for code, value in enumerate(values) if value in allowed}
+
+            if rows is None:
+                rows = [row for row, code in enumerate(codes) if code in want]
+            else:
+                rows = [row for row in rows if codes[row] in want]
+
+        return rows
+
+    def column(self, name: str, rows: Optional[List[int]]) -> List:
+        values, codes = self._column_codes(name)
+
+        if rows is None:
+            return [values[code] for code in codes]
+
+        return [values[codes[row]] for row in rows]
+
+    def logs(self, rows: Optional[List[int]]) -> List[str]:
+        all_logs = self.zf.read("logs.jsonl").decode().split("\n")
+        return all_logs if rows is None else [all_logs[row] for row in rows]
+
+
+# -----------------------------------------------------------------------------
+# Parquet format: one table with the archive columns, dictionary encoded, and
+# the logs column; the meta is stored in the schema metadata.
+# -----------------------------------------------------------------------------
+
+
+def _write_parquet(
+    archive_file: Path, columns: Dict[str, List], logs: List[str], meta: dict
+):
+    table = pyarrow.table(
+        {
+            **{
+                name: pyarrow.array(values, type=pyarrow.string()).dictionary_encode()
+                for name, values in columns.items()
+            },
+            "logs": pyarrow.array(logs, type=pyarrow.string()),
+        }
+    )
+    table = table.replace_schema_metadata({"netcad": json.dumps(meta)})
+    pyarrow.parquet.write_table(table, archive_file)
+
+
+class _ParquetReader:
+    def __init__(self, archive_file: Path):
+        self.pf = pyarrow.parquet.ParquetFile(archive_file)
+        self.meta = json.loads(self.pf.schema_arrow.metadata[b"netcad"])
+        self._table = None
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = self.pf.read(columns=list(ARCHIVE_COLUMNS))
+        return self._table
+
+    def select(self, filters: Dict[str, set]):
+        # the selected rows are the pyarrow array of row indexes, so that an
+        # empty selection keeps the index type used by take.
+        if not filters:
+            return None
+
+        mask = None
+        for name, allowed in filters.items():
+            column = self.table.column(name).cast(pyarrow.string())
+            each = pyarrow.compute.is_in(column, value_set=pyarrow.array(allowed))
+            mask = each if mask is None else pyarrow.compute.and_(mask, each)
+
+        return pyarrow.compute.indices_nonzero(mask)
+
+    def column(self, name: str, rows) -> List:
+        column = self.table.column(name)
+        if rows is not None:
+            column = column.take(rows)
+        return column.cast(pyarrow.string()).to_pylist()
+
+    def logs(self, rows) -> List[str]:
+        column = self.pf.read(columns=["logs"]).column("logs")
+        if rows is not None:
+            column = column.take(rows)
+        return column.to_pylist()
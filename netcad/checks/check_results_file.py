@@ -0,0 +1,209 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Iterable, Iterator, Optional
+from pathlib import Path
+from enum import auto
+import json
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+import aiofiles
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.helpers import StrEnum
+from .check_file_compression import (
+    FileCompression,
+    file_compressobj,
+    file_open_text,
+)
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    "CHECKS_DIGEST_FILENAME",
+    "CheckResultsFormat",
+    "results_file_find",
+    "results_file_load",
+    "results_file_write",
+]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+# the number of serialized results that are buffered before being written to
+# the results file.
+
+RESULTS_WRITE_BATCH = 1000
+
+# the digest of the checks files used to produce the results, written to the
+# results directory by netcam; see netcam.rerun_checks.
+
+CHECKS_DIGEST_FILENAME = "checks-digest.json"
+
+
+# noinspection PyArgumentList
+class CheckResultsFormat(StrEnum):
+    """
+    The on-disk formats for a check-collection results file.  The format is
+    identified by the file suffix so that readers do not need to know which
+    format was used by the writer.
+    """
+
+    # the original format, a single JSON list of results.
+    json = auto()
+
+    # JSON Lines, one result per line, that can be written and read one
+    # result at a time.
+    jsonl = auto()
+
+    # the compressed formats; see FileCompression.
+    json_gz = "json.gz"
+    json_zst = "json.zst"
+    jsonl_gz = "jsonl.gz"
+    jsonl_zst = "jsonl.zst"
+
+    @property
+    def suffix(self) -> str:
+        return f".{self.value}"
+
+    @property
+    def compression(self) -> FileCompression:
+        _, _, ext = self.value.partition(".")
+        return FileCompression.from_suffix(f".{ext}" if ext else "")
+
+    @property
+    def is_jsonl(self) -> bool:
+        return self.value.startswith("jsonl")
+
+    def with_compression(self, compression: FileCompression) -> "CheckResultsFormat":
+        """
+        Returns the format using the given compression, for example json with
+        gzip is json.gz.  No compression returns the format unchanged.
+        """
+        if compression == FileCompression.none:
+            return self
+
+        base, _, _ = self.value.partition(".")
+        return CheckResultsFormat(base + compression.suffix)
+
+    @classmethod
+    def from_path(cls, results_file: Path) -> "CheckResultsFormat":
+        name = results_file.name
+        return next(fmt for fmt in cls if name.endswith(fmt.suffix))
+
+
+def results_file_find(results_dir: Path, name: str) -> Optional[Path]:
+    """
+    Locate the results file for the check collection `name` regardless of
+    the format that was used to write it.
+
+    Returns
+    -------
+    The Path to the results file, or None if there are no results.
+    """
+    found = [
+        each
+        for fmt in CheckResultsFormat
+        if (each := results_dir / f"{name}{fmt.suffix}").exists()
+    ]
+
+    if not found:
+        return None
+
+    # the writer removes the other formats, but in the event that the User has
+    # copied files around, use the most recent one.
+
+    return max(found, key=lambda f: f.stat().st_mtime)
+
+
+def results_file_load(results_file: Path) -> Iterator[dict]:
+    """
+    Yields each of the result payloads, as dict, from the results file.
+    """
+    # the content is decompressed as it is read, if required, regardless of
+    # the file suffix.
+
+    with file_open_text(results_file) as ifile:
+        if not CheckResultsFormat.from_path(results_file).is_jsonl:
+            yield from json.load(ifile)
+        else:
+            yield from map(json.loads, filter(None, map(str.strip, ifile)))
+
+
+async def results_file_write(
+    results_dir: Path,
+    name: str,
+    payloads: Iterable[str],
+    results_format: CheckResultsFormat = CheckResultsFormat.jsonl,
+) -> Path:
+    """
+    Write the results file for the check collection `name` in JSON Lines
+    format. The payloads are the JSON serialized results, written in batches
+    as they are consumed, so that the complete results file is never held in
+    memory.  Any results file for the same check collection in another format
+    is removed.
+
+    Parameters
+    ----------
+    results_dir:
+        The directory where the results file is written.
+
+    name:
+        The check collection name, used as the file name.
+
+    payloads:
+        The JSON serialized results; one per result.
+
+    results_format:
+        One of the jsonl formats, for example jsonl.gz.
+
+    Returns
+    -------
+    The Path of the results file.
+    """
+    results_file = results_dir / f"{name}{results_format.suffix}"
+
+    # the stream is compressed incrementally so that the batches can be
+    # written as they are produced.
+
+    compressor = file_compressobj(results_format.compression)
+
+    async with aiofiles.open(results_file, "wb") as ofile:
+        batch = list()
+
+        async def flush():
+            content = ("\n".join(batch) + "\n").encode()
+            batch.clear()
+            await ofile.write(compressor.compress(content) if compressor else content)
+
+        for payload in payloads:
+            batch.append(payload)
+            if len(batch) >= RESULTS_WRITE_BATCH:
+                await flush()
+
+        if batch:
+            await flush()
+
+        if compressor:
+            await ofile.write(compressor.flush())
+
+    for fmt in CheckResultsFormat:
+        if fmt != results_format:
+            results_dir.joinpath(f"{name}{fmt.suffix}").unlink(missing_ok=True)
+
+    return results_file
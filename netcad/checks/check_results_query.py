@@ -0,0 +1,299 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Iterable, Iterator, Optional, List, Set, Tuple
+from dataclasses import dataclass, fields
+from collections import defaultdict
+from fnmatch import fnmatchcase
+from pathlib import Path
+import json
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from .check_result import CheckResult
+from .check_results_file import CheckResultsFormat, results_file_load
+from .check_file_compression import file_open_text
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    "ResultsQuery",
+    "RESULTS_INDEX_DIRNAME",
+    "ResultsIndexRecorder",
+    "results_index_record",
+    "results_index_load",
+    "results_query_file",
+]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+# The per results file index is stored in a subdirectory of the device results
+# directory, <results>/.index/<collection>.json, so that the results file
+# readers do not mistake it for a results file.  The index records the row
+# numbers, in the results file, for each of the values of the indexed keys:
+#
+#   "check_type": {"interface": [0, 1, 2, ...]},
+#   "status": {"PASS": [0, 2], "FAIL": [1]},
+#   "field": {"speed": [1], ...},
+#   "check_id": ["Ethernet1", "Ethernet2", ...]
+#
+# The "field" key includes the result field and the fields of the result log
+# entries as they are written to the results file.  As with the results
+# summary, the results file stat is recorded so that the index is only used
+# when the results file has not since been changed.
+
+RESULTS_INDEX_DIRNAME = ".index"
+
+RESULTS_INDEX_KEYS = ("check_type", "status", "field")
+
+
+@dataclass
+class ResultsQuery:
+    """
+    The predicates used to select check results.  Each predicate is a list of
+    glob-style patterns, for example "Ethernet4*"; a result matches a
+    predicate if any of the patterns match, and matches the query if all
+    the predicates match.  An empty predicate matches all results.
+
+    Attributes
+    ----------
+    device, collection:
+        Match the device name and check collection name; these select the
+        results files rather than the results.
+
+    check_type, check_id, status:
+        Match the result values.
+
+    field:
+        Match the result field or any of the result log entry fields; for
+        example "speed".
+
+    Examples
+    --------
+        query = ResultsQuery.from_where(["check_type=interface", "field=speed"])
+    """
+
+    device: Tuple[str, ...] = ()
+    collection: Tuple[str, ...] = ()
+    check_type: Tuple[str, ...] = ()
+    check_id: Tuple[str, ...] = ()
+    status: Tuple[str, ...] = ()
+    field: Tuple[str, ...] = ()
+
+    @classmethod
+    def keys(cls) -> List[str]:
+        """the keys that can be used in a where expression"""
+        return [each.name for each in fields(cls)]
+
+    @classmethod
+    def from_where(cls, where: Iterable[str], **predicates) -> "ResultsQuery":
+        """
+        Create the query from the where expressions, each "key=pattern", and
+        any other predicates.  The where expressions for the same key are
+        combined with the other predicates for that key.
+        """
+        by_key = defaultdict(list)
+
+        for expr in where:
+            key, sep, pattern = expr.partition("=")
+            if not sep or (key := key.strip()) not in cls.keys():
+                raise ValueError(
+                    f"Invalid where expression: {expr}, expected key=pattern "
+                    f"with key one of: {', '.join(cls.keys())}"
+                )
+            by_key[key].append(pattern.strip())
+
+        for key, patterns in predicates.items():
+            by_key[key].extend(patterns)
+
+        return cls(**{key: tuple(patterns) for key, patterns in by_key.items()})
+
+    def match(self, key: str, value: Optional[str]) -> bool:
+        """True if the value matches the predicate for the key"""
+        if not (patterns := getattr(self, key)):
+            return True
+
+        value = value or ""
+        return any(fnmatchcase(value, pattern) for pattern in patterns)
+
+    def match_any(self, key: str, values: Iterable[str]) -> bool:
+        """True if any of the values match the predicate for the key"""
+        if not getattr(self, key):
+            return True
+
+        return any(self.match(key, value) for value in values)
+
+    def match_payload(self, payload: dict) -> bool:
+        """True if the result payload, as read from the results file, matches"""
+        return (
+            self.match("status", payload.get("status"))
+            and self.match("check_type", payload.get("check", {}).get("check_type"))
+            and self.match("check_id", payload.get("check_id"))
+            and self.match_any("field", _payload_fields(payload))
+        )
+
+
+class ResultsIndexRecorder:
+    """
+    Builds the index of the results for the check collection as each result
+    is saved, in the order the results are written to the results file.
+    """
+
+    def __init__(self):
+        self.index = {key: defaultdict(list) for key in RESULTS_INDEX_KEYS}
+        self.check_ids = list()
+
+    def add(self, res: CheckResult):
+        row = len(self.check_ids)
+        index = self.index
+
+        index["check_type"][res.check.check_type].append(row)
+        index["status"][str(res.status)].append(row)
+
+        for fld in _result_fields(res):
+            index["field"][fld].append(row)
+
+        self.check_ids.append(res.check_id or res.check.check_id())
+
+    def write(self, results_dir: Path, tc_name: str, results_file: Path):
+        """Record the index for the results that were saved to the file"""
+        st = results_file.stat()
+
+        (index_dir := results_dir / RESULTS_INDEX_DIRNAME).mkdir(exist_ok=True)
+        index_dir.joinpath(f"{tc_name}.json").write_text(
+            json.dumps(
+                dict(
+                    results_file=results_file.name,
+                    mtime_ns=st.st_mtime_ns,
+                    size=st.st_size,
+                    check_id=self.check_ids,
+                    **self.index,
+                )
+            )
+        )
+
+
+def results_index_record(
+    results_dir: Path, tc_name: str, results_file: Path, results: List[CheckResult]
+):
+    """
+    Record the index of the results that were saved to the results file.
+    """
+    recorder = ResultsIndexRecorder()
+    for res in results:
+        recorder.add(res)
+
+    recorder.write(results_dir, tc_name, results_file)
+
+
+def results_index_load(results_dir: Path, tc_name: str) -> Optional[dict]:
+    """
+    Returns the index of the check collection results file, or None if there
+    is no index or the results file has changed since the index was recorded.
+    """
+    index_file = results_dir / RESULTS_INDEX_DIRNAME / f"{tc_name}.json"
+
+    try:
+        index = json.loads(index_file.read_text())
+        st = results_dir.joinpath(index["results_file"]).stat()
+    except (FileNotFoundError, KeyError, json.JSONDecodeError):
+        return None
+
+    if (st.st_mtime_ns, st.st_size) != (index["mtime_ns"], index["size"]):
+        return None
+
+    return index
+
+
+def results_query_file(
+    results_dir: Path, tc_name: str, results_file: Path, query: ResultsQuery
+) -> Iterator[dict]:
+    """
+    Yields the result payloads of the results file that match the query.  When
+    the results file index is available, only the matching results are
+    decoded, and the results file is not read at all when there are none.
+    """
+    if (index := results_index_load(results_dir, tc_name)) is None:
+        yield from filter(query.match_payload, results_file_load(results_file))
+        return
+
+    if not (rows := _index_rows(index, query)):
+        return
+
+    # the JSON Lines files are read line by line, decoding only the matching
+    # rows; otherwise the complete results file is decoded.
+
+    fmt = CheckResultsFormat.from_path(results_file)
+
+    if not fmt.is_jsonl:
+        payloads = results_file_load(results_file)
+        yield from (payload for row, payload in enumerate(payloads) if row in rows)
+        return
+
+    with file_open_text(results_file) as ifile:
+        for row, line in enumerate(filter(None, map(str.strip, ifile))):
+            if row in rows:
+                yield json.loads(line)
+
+
+# -----------------------------------------------------------------------------
+#
+#                            PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def _result_fields(res: CheckResult) -> Set[str]:
+    fields_ = {log[1] for log in res.logs.root if len(log) == 3}
+
+    if res.field:
+        fields_.add(res.field)
+
+    return fields_
+
+
+def _payload_fields(payload: dict) -> Set[str]:
+    fields_ = {
+        log[1]
+        for log in payload.get("logs") or ()
+        if isinstance(log, list) and len(log) == 3
+    }
+
+    if fld := payload.get("field"):
+        fields_.add(fld)
+
+    return fields_
+
+
+def _index_rows(index: dict, query: ResultsQuery) -> Set[int]:
+    """Returns the row numbers of the results that match the query"""
+    rows = set(range(len(index["check_id"])))
+
+    for key in RESULTS_INDEX_KEYS:
+        if not getattr(query, key):
+            continue
+
+        rows &= {
+            row
+            for value, value_rows in index[key].items()
+            if query.match(key, value)
+            for row in value_rows
+        }
+
+    if query.check_id:
+        check_ids = index["check_id"]
+        rows = {row for row in rows if query.match("check_id", check_ids[row])}
+
+    return rows
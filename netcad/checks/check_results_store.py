@@ -0,0 +1,240 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Iterable, Iterator, Optional, Sequence, Dict, Tuple
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+import sqlite3
+import json
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["CheckResultsStore", "ResultsStoreRow"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+# (check_type, check_id, status, field, payload-json)
+ResultsStoreRow = Tuple[str, Optional[str], str, Optional[str], str]
+
+RESULTS_STORE_FILENAME = "results.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL,
+    design TEXT NOT NULL,
+    device TEXT NOT NULL,
+    collection TEXT NOT NULL,
+    check_type TEXT NOT NULL,
+    check_id TEXT,
+    status TEXT NOT NULL,
+    field TEXT,
+    payload TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS results_run ON results (run_id);
+CREATE INDEX IF NOT EXISTS results_device ON results (design, device, collection);
+CREATE INDEX IF NOT EXISTS results_status ON results (design, status);
+CREATE INDEX IF NOT EXISTS results_check_id ON results (check_id);
+CREATE INDEX IF NOT EXISTS results_field ON results (field);
+"""
+
+
+class CheckResultsStore:
+    """
+    The results store is an optional SQLite database, located in the checks
+    directory, that holds the most recent results of each device check
+    collection.  When the store exists, `netcam check` keeps it up to date in
+    addition to the per-device results files, and the consumers of results
+    use queries rather than parsing each of the results files.
+
+    Attributes
+    ----------
+    db_file: Path
+        The SQLite database file.
+
+    run_id: int
+        The ID of the check run writing results, see `start_run`.
+    """
+
+    def __init__(self, db_file: Path):
+        self.db_file = db_file
+        self.run_id: Optional[int] = None
+        self.conn = sqlite3.connect(db_file, timeout=30)
+
+        # WAL mode allows the readers to proceed while a check run is writing
+        # results into the store.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def db_path(checks_dir: Path) -> Path:
+        return checks_dir / RESULTS_STORE_FILENAME
+
+    @classmethod
+    def find(cls, checks_dir: Path) -> Optional["CheckResultsStore"]:
+        """
+        Returns the results store located in the checks directory, or None if
+        the User has not enabled the store.
+        """
+        if not (db_file := cls.db_path(checks_dir)).exists():
+            return None
+
+        return cls(db_file)
+
+    # -------------------------------------------------------------------------
+    #                             Writing results
+    # -------------------------------------------------------------------------
+
+    def start_run(self) -> int:
+        """Record the start of a check run, returning the run ID"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (started) VALUES (?)",
+                (datetime.now().isoformat(),),
+            )
+
+        self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def save_results(
+        self,
+        design: str,
+        device: str,
+        collection: str,
+        rows: Iterable[ResultsStoreRow],
+    ):
+        """
+        Replace the stored results for the device check collection with the
+        given rows, recorded as part of the current run.
+        """
+        key = (design, device, collection)
+
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM results WHERE design=? AND device=? AND collection=?",
+                key,
+            )
+            self.conn.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((self.run_id, *key, *row) for row in rows),
+            )
+
+    # -------------------------------------------------------------------------
+    #                             Reading results
+    # -------------------------------------------------------------------------
+
+    def count_results(
+        self,
+        designs: Sequence[str],
+        collections: Sequence[str],
+        statuses: Sequence[str],
+        include_fields: Sequence[str] = (),
+        exclude_fields: Sequence[str] = (),
+    ) -> Dict[str, Counter]:
+        """
+        Returns the count of results by status for each device in the given
+        designs.
+
+        Returns
+        -------
+        dict: key=device-name, value=Counter of status values
+        """
+        where, params = _where(
+            design=designs,
+            collection=collections,
+            status=statuses,
+            include_fields=include_fields,
+            exclude_fields=exclude_fields,
+        )
+
+        dev_counts = defaultdict(Counter)
+
+        for device, status, count in self.conn.execute(
+            f"SELECT device, status, count(*) FROM results WHERE {where} "
+            "GROUP BY device, status",
+            params,
+        ):
+            dev_counts[device][status] = count
+
+        return dev_counts
+
+    def load_results(
+        self,
+        design: str,
+        device: str,
+        collection: str,
+        statuses: Sequence[str],
+        include_fields: Sequence[str] = (),
+        exclude_fields: Sequence[str] = (),
+    ) -> Iterator[dict]:
+        """
+        Yields the result payloads for the device check collection that
+        match the status and field criteria.
+        """
+        where, params = _where(
+            design=[design],
+            device=[device],
+            collection=[collection],
+            status=statuses,
+            include_fields=include_fields,
+            exclude_fields=exclude_fields,
+        )
+
+        for (payload,) in self.conn.execute(
+            f"SELECT payload FROM results WHERE {where} ORDER BY rowid", params
+        ):
+            yield json.loads(payload)
+
+    def close(self):
+        self.conn.close()
+
+
+# -----------------------------------------------------------------------------
+#
+#                            PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def _where(
+    include_fields: Sequence[str], exclude_fields: Sequence[str], **columns
+) -> Tuple[str, list]:
+    """
+    Build the SQL WHERE clause, and parameters, for the given column values.
+    The field include/exclude semantics are the same as the `netcam show
+    check` filters; a result without a field value is never included, and
+    never excluded.
+    """
+    clauses, params = list(), list()
+
+    for column, values in columns.items():
+        clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+
+    if include_fields:
+        clauses.append(f"field IN ({', '.join('?' * len(include_fields))})")
+        params.extend(include_fields)
+
+    if exclude_fields:
+        clauses.append(
+            f"(field IS NULL OR field NOT IN ({', '.join('?' * len(exclude_fields))}))"
+        )
+        params.extend(exclude_fields)
+
+    return " AND ".join(clauses), params
@@ -0,0 +1,159 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Iterable, Optional, Dict, List, Tuple
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+import threading
+import json
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from .check_result import CheckResult
+from .check_status import CheckStatus
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    "RESULTS_SUMMARY_FILENAME",
+    "ResultsSummaryCounts",
+    "ResultsSummaryRecorder",
+    "results_summary_record",
+    "results_summary_load",
+]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+# The per-device summary of the check results, stored in the device results
+# directory, so that the summary views do not need to load every results
+# file.  The summary is keyed by the check collection name:
+#
+#   "interfaces": {
+#       "results_file": "interfaces.json",
+#       "mtime_ns": ..., "size": ...,
+#       "timestamp": "2024-01-01T00:00:00",
+#       "counts": [["PASS", "oper_up", 10], ["FAIL", "speed", 1], ...],
+#       "failed": ["Ethernet1", ...]
+#   }
+#
+# The results file stat is recorded so that a summary entry is only used when
+# the results file has not since been changed by other means.
+
+RESULTS_SUMMARY_FILENAME = "summary.json"
+
+# list of (status, field, count)
+ResultsSummaryCounts = List[Tuple[str, Optional[str], int]]
+
+
+class ResultsSummaryRecorder:
+    """
+    Builds the summary of the results for the check collection as each result
+    is saved, so that the results need not be retained to record the summary
+    once the results file is written.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.failed = list()
+
+    def add(self, res: CheckResult):
+        self.counts[(res.status, res.field)] += 1
+        if res.status == CheckStatus.FAIL:
+            self.failed.append(res.check.check_id())
+
+    def write(self, results_dir: Path, tc_name: str, results_file: Path):
+        """Record the summary for the results that were saved to the file"""
+        st = results_file.stat()
+
+        with _summary_lock:
+            summary = _summary_load(results_dir)
+
+            summary[tc_name] = dict(
+                results_file=results_file.name,
+                mtime_ns=st.st_mtime_ns,
+                size=st.st_size,
+                timestamp=datetime.now().isoformat(timespec="seconds"),
+                counts=[
+                    (str(status), fld, count)
+                    for (status, fld), count in self.counts.items()
+                ],
+                failed=self.failed,
+            )
+
+            _summary_file(results_dir).write_text(json.dumps(summary))
+
+
+def results_summary_record(
+    results_dir: Path, tc_name: str, results_file: Path, results: Iterable[CheckResult]
+):
+    """
+    Record the summary of the results for the check collection that were
+    saved to the results file.
+    """
+    recorder = ResultsSummaryRecorder()
+    for res in results:
+        recorder.add(res)
+
+    recorder.write(results_dir, tc_name, results_file)
+
+
+def results_summary_load(results_dir: Path) -> Dict[str, dict]:
+    """
+    Returns the results summary of each check collection, by name, for the
+    device results directory.  A collection is omitted if its results file has
+    changed, or was removed, since the summary was recorded; the Caller should
+    use the results file instead.
+    """
+    summary = _summary_load(results_dir)
+
+    for tc_name, tc_summary in list(summary.items()):
+        try:
+            st = results_dir.joinpath(tc_summary["results_file"]).stat()
+            current = (st.st_mtime_ns, st.st_size)
+        except (FileNotFoundError, KeyError):
+            current = None
+
+        if current != (tc_summary.get("mtime_ns"), tc_summary.get("size")):
+            del summary[tc_name]
+
+    return summary
+
+
+# -----------------------------------------------------------------------------
+#
+#                            PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+# the summary file is shared by the check collections of the device, which may
+# be recorded at the same time by the threads of a concurrent run.
+
+_summary_lock = threading.Lock()
+
+
+def _summary_file(results_dir: Path) -> Path:
+    return results_dir / RESULTS_SUMMARY_FILENAME
+
+
+def _summary_load(results_dir: Path) -> dict:
+    if not (summary_file := _summary_file(results_dir)).exists():
+        return dict()
+
+    try:
+        return json.loads(summary_file.read_text())
+    except json.JSONDecodeError:
+        return dict()
@@ -26,6 +26,10 @@ from netcad.config import Environment
 from netcad.cli.common_opts import opt_devices, opt_designs
 from netcad.device import Device
 from netcad.design import load_design
+from netcad.checks.check_file_compression import (
+    cv_file_compression,
+    file_compression_config,
+)
 
 from .clig_build import clig_build
 
@@ -88,6 +92,9 @@ def cli_build_tests(devices: Tuple[str], designs: Tuple[str], checks_dir: Path):
 
     log.info(f"Building device audits for {len(device_objs)} devices")
 
+    # the checks files are compressed when configured in netcad.toml
+    cv_file_compression.set(file_compression_config())
+
     async def run():
         tasks = [
             asyncio.create_task(
@@ -6,7 +6,10 @@
 #   Author: Andrey Paramonov (aparamon)
 #
 # in a discussion on how to treat a large collection of tasks.  I've modified the code
-# slightly so that I get back the original coroutine; but beyond that it is as it was found.
+# slightly so that I get back the original coroutine, and so that the results
+# are yielded in the order the tasks complete rather than the order in which
+# they were submitted; a slow task must not hold the concurrency slots of the
+# tasks that finished after it.
 
 
 import asyncio
@@ -21,55 +24,70 @@ __all__ = ["as_completed", "igather"]
 async def as_completed(coros, limit=None):
     coros = iter(coros)
 
-    buf = asyncio.Queue()
+    done = asyncio.Queue()
+    running = set()
     sem = asyncio.Semaphore(limit or DEFAULT_MAX_TASKS)
 
-    async def submit(_coros, _buf):
+    def on_task_done(_task):
+        # release the slot as soon as the task is done so the next coroutine
+        # can be scheduled, regardless of when the consumer gets to it.
+        running.discard(_task)
+        sem.release()
+        done.put_nowait(_task)
+
+    async def submit(_coros):
+        submitted = 0
         while True:
             await sem.acquire()
             try:
                 # TODO: additionally support async iterators
                 _coro = next(_coros)
             except StopIteration:
-                break
-            _task = asyncio.create_task(_coro)
-            _buf.put_nowait(_task)
-        await _buf.put(None)
-
-    async def consume(_buf):
-        while True:
-            _task = await _buf.get()
-            if _task:
-                v = await asyncio.wait_for(_task, None)
                 sem.release()
-                yield (
-                    _task.get_coro(),
-                    v,
-                )  # the yield will be Tuple(original-coro, task-result)
-            else:
                 break
-
-    submit_task = asyncio.create_task(submit(coros, buf))
+            _task = asyncio.create_task(_coro)
+            _task.add_done_callback(on_task_done)
+            running.add(_task)
+            submitted += 1
+
+        # the sentinel carries the total number of submitted tasks so that the
+        # consumer knows how many more completions to wait for.
+        done.put_nowait(submitted)
+
+    async def consume():
+        yielded, total = 0, None
+        while total is None or yielded < total:
+            _task = await done.get()
+            if isinstance(_task, int):
+                total = _task
+                continue
+
+            yielded += 1
+            yield (
+                _task.get_coro(),
+                _task.result(),
+            )  # the yield will be Tuple(original-coro, task-result)
+
+    submit_task = asyncio.create_task(submit(coros))
 
     try:
-        async for result in consume(buf):
+        async for result in consume():
             yield result
 
-    except Exception as exc:  # noqa
+    except BaseException as exc:  # noqa
         submit_task.cancel()
+
         # cancel scheduled
-        while not buf.empty():
-            task = buf.get_nowait()
-            if task:
-                task.cancel()
-                try:
-                    await task
-                except Exception:
-                    pass
+        for task in list(running):
+            task.cancel()
+            try:
+                await task
+            except BaseException:
+                pass
 
         # cancel pending
         for coro in coros:
-            asyncio.create_task(coro).cancel()
+            coro.close()
 
         raise exc
 
@@ -5,3 +5,4 @@ from .services_analyzer import ServicesAnalyzer
 from .design_service import DesignService
 from .service_report import DesignServiceReport
 from .service_check import DesignServiceCheck
+from .check_result_ref import CheckResultRef
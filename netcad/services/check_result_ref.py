@@ -0,0 +1,203 @@
+#  Copyright (c) 2025 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional
+from functools import lru_cache
+from pathlib import Path
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.checks import CheckCollectionT, CheckResult, CheckStatus
+from netcad.checks import results_file_load
+from netcad.checks.check_results_store import CheckResultsStore
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    "CheckResultRef",
+    "CheckResultsSource",
+    "ResultsFileSource",
+    "ResultsStoreSource",
+]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+class CheckResultsSource:
+    """
+    The source of the check results of a device check collection, from which
+    the analyzer results are hydrated.  The results are identified by their
+    row in the list of results returned by `load`.
+    """
+
+    def __init__(self, check_collection: CheckCollectionT):
+        self.check_collection = check_collection
+
+    def load(self) -> list[dict]:
+        raise NotImplementedError()
+
+
+class ResultsFileSource(CheckResultsSource):
+    """The results are the payloads of the device results file"""
+
+    def __init__(self, check_collection: CheckCollectionT, results_file: Path):
+        super().__init__(check_collection)
+        self.results_file = results_file
+
+    def load(self) -> list[dict]:
+        return list(results_file_load(self.results_file))
+
+
+class ResultsStoreSource(CheckResultsSource):
+    """The results are the PASS/FAIL results of the device in the store"""
+
+    def __init__(
+        self,
+        check_collection: CheckCollectionT,
+        db_file: Path,
+        design: str,
+        device: str,
+    ):
+        super().__init__(check_collection)
+        self.db_file = db_file
+        self.design = design
+        self.device = device
+
+    def load(self) -> list[dict]:
+        store = CheckResultsStore(self.db_file)
+
+        try:
+            return list(
+                store.load_results(
+                    design=self.design,
+                    device=self.device,
+                    collection=self.check_collection.get_name(),
+                    statuses=("PASS", "FAIL"),
+                )
+            )
+        finally:
+            store.close()
+
+
+class CheckResultRef:
+    """
+    The reference to a check result used by the ServicesAnalyzer in place of
+    the CheckResult, so that the analyzer retains only the values needed to
+    build and analyze the services graph.  The complete CheckResult, for
+    example to report the result logs, is hydrated from the results source
+    when the `result` is first used.
+
+    Attributes
+    ----------
+    device, check_type, check_id, status:
+        The result values.
+
+    source: CheckResultsSource
+        The source of the result, shared by the results of the same device
+        check collection.
+
+    row: int
+        The row of the result in the source.
+    """
+
+    __slots__ = (
+        "device",
+        "check_type",
+        "check_id",
+        "status",
+        "source",
+        "row",
+        "_result",
+    )
+
+    def __init__(
+        self,
+        device: str,
+        check_type: str,
+        check_id: str,
+        status: CheckStatus,
+        source: CheckResultsSource,
+        row: int,
+    ):
+        self.device = device
+        self.check_type = check_type
+        self.check_id = check_id
+        self.status = status
+        self.source = source
+        self.row = row
+        self._result: Optional[CheckResult] = None
+
+    @classmethod
+    def from_payload(
+        cls, payload: dict, source: CheckResultsSource, row: int
+    ) -> "CheckResultRef":
+        """
+        Create the reference from the result payload, as read from the results
+        source, without validating the payload.
+        """
+        ref = cls(
+            device=payload["device"],
+            check_type=payload["check"]["check_type"],
+            check_id=payload.get("check_id"),
+            status=CheckStatus(payload["status"]),
+            source=source,
+            row=row,
+        )
+
+        # the check-id is written to the results files; otherwise the check is
+        # needed to determine it.
+
+        if ref.check_id is None:
+            ref._result = source.check_collection.parse_result(payload)
+            ref.check_id = ref._result.check.check_id()
+
+        return ref
+
+    @property
+    def result(self) -> CheckResult:
+        """the complete check result, hydrated from the source when first used"""
+        if self._result is None:
+            payload = _source_payloads(self.source)[self.row]
+            if (check_id := payload.get("check_id")) and check_id != self.check_id:
+                raise RuntimeError(
+                    f"Check result {self.check_id} changed in results source: "
+                    f"{self.device}, {self.check_type}"
+                )
+
+            self._result = self.source.check_collection.parse_result(payload)
+
+        return self._result
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}({self.device}, {self.check_type}, "
+            f"{self.check_id}, {self.status})"
+        )
+
+
+# -----------------------------------------------------------------------------
+#
+#                            PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+# the reports hydrate the results of the same device check collection together,
+# so the most recently used source payloads are retained rather than reading
+# the source for each result.
+
+
+@lru_cache(maxsize=32)
+def _source_payloads(source: CheckResultsSource) -> list[dict]:
+    return source.load()
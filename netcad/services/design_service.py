@@ -22,6 +22,7 @@ from rich.text import Text, Style
 from netcad.checks import CheckResult
 
 from .service_report import DesignServiceReport
+from .check_result_ref import CheckResultRef
 
 if TYPE_CHECKING:
     from .services_analyzer import ServicesAnalyzer
@@ -73,7 +74,7 @@ class DesignService:
         self.is_subservice = is_subservice
 
         # track the list of failed feature checks.
-        self.failed: list[CheckResult] = list()
+        self.failed: list[CheckResultRef] = list()
 
         # add this service to the set of design services.
         self.design.services[name] = self
@@ -128,15 +129,21 @@ class DesignService:
         )
 
         for check in sorted(self.failed, key=lambda i: i.device):
-            fail_logs = [log for log in check.logs.root if log[0] == "FAIL"]
+            fail_logs = [log for log in check.result.logs.root if log[0] == "FAIL"]
             device = check.device
             check_id = check.check_id
-            table.add_row(device, check.check.check_type, check_id, Pretty(fail_logs))
+            table.add_row(device, check.check_type, check_id, Pretty(fail_logs))
 
         return table
 
     @staticmethod
-    def build_feature_logs_table(check, title=None) -> Table:
+    def build_feature_logs_table(
+        check: CheckResult | CheckResultRef, title=None
+    ) -> Table:
+        # the analyzer results are hydrated so that the logs can be shown.
+        if isinstance(check, CheckResultRef):
+            check = check.result
+
         green = Style(color="green")
         red = Style(color="red")
 
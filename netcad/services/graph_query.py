@@ -5,9 +5,9 @@
 # System Imports
 # -----------------------------------------------------------------------------
 
-from typing import Callable
-from operator import attrgetter
-from collections import deque, defaultdict
+from typing import Callable, Iterable
+from itertools import chain
+from collections import defaultdict
 
 # -----------------------------------------------------------------------------
 # Public Imports
@@ -20,7 +20,7 @@ import igraph
 # Exports
 # -----------------------------------------------------------------------------
 
-__all__ = ["GraphQuery"]
+__all__ = ["GraphQuery", "GraphIndex"]
 
 # -----------------------------------------------------------------------------
 #
@@ -28,20 +28,119 @@ __all__ = ["GraphQuery"]
 #
 # -----------------------------------------------------------------------------
 
+_NO_IDS = frozenset()
+
+
+class GraphIndex:
+    """
+    The inverted indexes of an igraph graph used by GraphQuery; for each of
+    the indexed vertex and edge attributes, the mapping of each attribute
+    value to the set of vertex, or edge, IDs.  The index also retains the
+    graph edge list and the incident edges of each vertex, so that the query
+    traversals do not use the igraph Vertex and Edge objects.
+
+    The index is a snapshot of the graph; a new index must be created when the
+    graph, or the indexed attribute values, are changed.
+    """
+
+    VERTEX_KEYS = ("kind", "service", "check_type", "device", "status")
+    EDGE_KEYS = ("kind", "service")
+
+    def __init__(self, graph: igraph.Graph):
+        self.graph = graph
+        self.vertex = self._build(graph.vs, self.VERTEX_KEYS)
+        self.edge = self._build(graph.es, self.EDGE_KEYS)
+        self.edges = graph.get_edgelist()
+        self.out_edges = graph.get_inclist(mode="out")
+        self.in_edges = graph.get_inclist(mode="in")
+
+    @staticmethod
+    def lookup(
+        index: dict[str, dict], query: dict, ids: set[int] | None = None
+    ) -> tuple[set[int] | None, list[str], dict]:
+        """
+        Returns the IDs that match the indexed keys of the query, starting from
+        the given IDs, or None when there are no given IDs and no indexed keys;
+        the indexed keys used; and the remaining query that must be applied
+        using the igraph select.
+
+        The IDs returned may be the index sets themselves, and must not be
+        changed by the Caller.
+        """
+        used = list()
+        remaining = dict()
+
+        for key, value in query.items():
+            if (values := index.get(key)) is None:
+                remaining[key] = value
+                continue
+
+            # the set intersection iterates the smaller of the two sets, so
+            # the cost is that of the given IDs rather than the index.
+
+            matched = values.get(value, _NO_IDS)
+            ids = matched if ids is None else ids & matched
+            used.append(key)
+
+        return ids, used, remaining
+
+    @staticmethod
+    def _build(seq: igraph.VertexSeq | igraph.EdgeSeq, keys: Iterable[str]) -> dict:
+        attrs = seq.attributes()
+        index = dict()
+
+        # an attribute that does not exist in the graph is indexed as None for
+        # all IDs, as the attribute value would be if it had been added.
+
+        for key in keys:
+            index[key] = values = defaultdict(set)
+            if key not in attrs:
+                values[None] = set(range(len(seq)))
+                continue
+
+            for idx, value in enumerate(seq[key]):
+                values[value].add(idx)
+
+        return index
+
 
 class GraphQuery:
     """
     A class to query an igraph graph using a very simplified gremlin inspired
     syntax.
-    """
 
-    target_vertex = attrgetter("target_vertex")
-    source_vertex = attrgetter("source_vertex")
-    index = attrgetter("index")
+    When given the GraphIndex of the graph, the query steps use the index, so
+    that the matching nodes and edges are found as set operations over the
+    graph IDs rather than by selecting the edges of each node; query keys that
+    are not indexed are applied using the igraph select.  Otherwise the steps
+    use the igraph select, and the index is created only when needed by the
+    `select` step, which would otherwise scan all of the graph nodes.  The
+    `explain` method returns the plan of the query steps taken, including the
+    indexes used.
+
+    Examples
+    --------
+        GraphQuery(graph)(node).out_(service="fabric", kind="r").nodes
+    """
 
-    def __init__(self, graph):
+    def __init__(self, graph: igraph.Graph, index: GraphIndex | None = None):
         self.graph = graph
-        self.nodes: deque[igraph.Vertex] = deque()
+        self._index = index
+        self.vids: set[int] = set()
+        self.plan: list[str] = list()
+
+    @property
+    def index(self) -> GraphIndex:
+        """the graph index, created when first used"""
+        if self._index is None:
+            self._index = GraphIndex(self.graph)
+        return self._index
+
+    @property
+    def nodes(self) -> list[igraph.Vertex]:
+        """the current set of nodes, in graph order"""
+        vs = self.graph.vs
+        return [vs[vid] for vid in sorted(self.vids)]
 
     def groupby(self, key: Callable):
         pf = defaultdict(list)
@@ -53,66 +152,121 @@ class GraphQuery:
         """returns the first node in the current set of nodes, or None"""
         return first(self.nodes)
 
+    def select(self, **query) -> "GraphQuery":
+        """
+        Set the starting nodes for the query to the graph nodes that match the
+        query.
+        """
+        vids, used, remaining = self.index.lookup(self.index.vertex, query)
+        if vids is None:
+            vids = set(range(self.graph.vcount()))
+
+        self.vids = self._select_vertices(vids, remaining)
+        self.plan = list()
+        self._explain("select", query, used, remaining)
+        return self
+
     def out_(self, **query) -> "GraphQuery":
         """
         Query the current set of graph nodes that are connected to the current
         nodes by an outgoing edge that matches the query.
         """
-        found_nodes = deque()
-        while True:
-            try:
-                node = self.nodes.popleft()
-            except IndexError:
-                break
-
-            found_nodes.extend(
-                map(
-                    self.target_vertex,
-                    self.graph.es.select(map(self.index, node.out_edges()), **query),
-                )
-            )
-
-        self.nodes = found_nodes
-        return self
+        return self._traverse("out_", "out", query)
 
     def in_(self, **query) -> "GraphQuery":
         """
         Query the current set of graph nodes that are connected to the current
         nodes by an incoming edge that matches the query.
         """
-        found_nodes = deque()
-        while True:
-            try:
-                node = self.nodes.popleft()
-            except IndexError:
-                break
-
-            found_nodes.extend(
-                map(
-                    self.source_vertex,
-                    self.graph.es.select(map(self.index, node.in_edges()), **query),
-                )
-            )
-
-        self.nodes = found_nodes
-        return self
+        return self._traverse("in_", "in", query)
 
     def node(self, **query) -> "GraphQuery":
         """
         Query the current set of nodes that match the query.
         """
-        self.nodes = deque(self.graph.vs.select(map(self.index, self.nodes), **query))
+        if self._index is None:
+            vids, used, remaining = self.vids, [], query
+        else:
+            vids, used, remaining = self._index.lookup(
+                self._index.vertex, query, ids=self.vids
+            )
+
+        self.vids = self._select_vertices(vids, remaining)
+        self._explain("node", query, used, remaining)
         return self
 
+    def explain(self) -> str:
+        """
+        Returns the plan of the query steps taken, one line per step, showing
+        the indexed keys, the keys applied using the igraph select, and the
+        number of nodes found.
+        """
+        return "\n".join(self.plan)
+
     def __call__(self, *start_nodes: igraph.Vertex):
         """
         Set the starting nodes for the query.
         """
-        self.nodes = deque(start_nodes)
+        self.vids = {node.index for node in start_nodes}
+        self.plan = list()
+        self._explain("start", {}, [], {})
         return self
 
     def __len__(self):
         """
         Get the number of nodes in the current set of nodes.
         """
-        return len(self.nodes)
+        return len(self.vids)
+
+    # -------------------------------------------------------------------------
+    #
+    #                             PRIVATE METHODS
+    #
+    # -------------------------------------------------------------------------
+
+    def _traverse(self, step: str, mode: str, query: dict) -> "GraphQuery":
+        # the edges of the current nodes that match the indexed query keys,
+        # then the remaining query keys; the nodes found are the other
+        # endpoint of each of these edges.
+
+        graph, index = self.graph, self._index
+
+        if index is None:
+            eids = set(
+                chain.from_iterable(graph.incident(vid, mode=mode) for vid in self.vids)
+            )
+            used, remaining = [], query
+        else:
+            incident = index.out_edges if mode == "out" else index.in_edges
+            eids = set(chain.from_iterable(map(incident.__getitem__, self.vids)))
+            eids, used, remaining = index.lookup(index.edge, query, ids=eids)
+
+        if remaining and eids:
+            eids = {edge.index for edge in graph.es.select(sorted(eids), **remaining)}
+
+        endpoint = 1 if mode == "out" else 0
+
+        if index is None:
+            self.vids = {graph.es[eid].tuple[endpoint] for eid in eids}
+        else:
+            self.vids = {index.edges[eid][endpoint] for eid in eids}
+
+        self._explain(step, query, used, remaining)
+        return self
+
+    def _select_vertices(self, vids: set[int], query: dict) -> set[int]:
+        if not query or not vids:
+            return vids
+
+        return {node.index for node in self.graph.vs.select(sorted(vids), **query)}
+
+    def _explain(self, step: str, query: dict, used: list[str], remaining: dict):
+        args = ", ".join(f"{key}={value!r}" for key, value in query.items())
+        plan = f"{step}({args})"
+
+        if used:
+            plan += f" index[{', '.join(used)}]"
+        if remaining:
+            plan += f" select[{', '.join(remaining)}]"
+
+        self.plan.append(f"{plan} -> {len(self.vids)} nodes")
@@ -5,9 +5,10 @@
 # System Imports
 # -----------------------------------------------------------------------------
 
-from typing import TYPE_CHECKING, Iterator
+from typing import TYPE_CHECKING, Any, Iterator, Iterable
 from collections import defaultdict, deque
-import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
 # -----------------------------------------------------------------------------
@@ -23,19 +24,34 @@ from rich.console import Console
 # -----------------------------------------------------------------------------
 
 from ..config import netcad_globals
-from ..checks import CheckCollectionT, CheckResult, CheckStatus
+from ..checks import CheckCollectionT, CheckStatus
+from ..checks import results_file_find, results_file_load
+from ..checks.check_results_store import CheckResultsStore
 
 if TYPE_CHECKING:
     from netcad.device import Device
     from netcad.design import Design, DesignFeature
 
 from .design_service import DesignService
+from .check_result_ref import CheckResultRef, ResultsFileSource, ResultsStoreSource
+from .graph_query import GraphQuery, GraphIndex
 from .services_typedefs import ResultMapT, NodeObjIDMapT
 
 
 class ServicesAnalyzer:
-    def __init__(self, design: "Design"):
+    def __init__(self, design: "Design", max_workers: int | None = None):
+        """
+        Parameters
+        ----------
+        design: Design
+            The design whose services are analyzed.
+
+        max_workers: int, optional
+            The number of threads used to load the check results files; by
+            default the ThreadPoolExecutor default.
+        """
         self.design = design
+        self.max_workers = max_workers
 
         # initalize the top level status to pass.  Could be set to FAIL if any
         # managed service status is "FAIL".
@@ -61,7 +77,7 @@ class ServicesAnalyzer:
         #   key=check-type (str),
         #   value=dict
         #       key=check-id (str),
-        #       value=CheckResult
+        #       value=CheckResultRef
         # -----------------------------------------------------------------------------
 
         self.results_map: ResultMapT = defaultdict(lambda: defaultdict(dict))
@@ -69,6 +85,22 @@ class ServicesAnalyzer:
         # maps any object to a graph-node.
         self.nodes_map: NodeObjIDMapT = bidict()
 
+        # the graph is built in two phases: the nodes and edges are queued,
+        # with their attributes, by the add methods and then added to the
+        # graph in bulk by `commit`; adding each node and edge to the igraph
+        # graph individually is quadratic.  The node ids map each queued, or
+        # committed, object to its graph vertex index.
+
+        self._node_ids: dict[Any, int] = dict()
+        self._queued_nodes: list[tuple[Any, dict]] = list()
+        self._queued_edges: list[tuple[int, int]] = list()
+        self._queued_edge_attrs: list[dict] = list()
+
+        # the graph query index is created when first used, and discarded
+        # when the graph is changed by the commit or the analysis.
+
+        self._graph_index: GraphIndex | None = None
+
         # this queue is used for processing services; so that a service can
         # define a subservice within itself, and the subservice can be
         # processed after the parent service is processed.
@@ -87,17 +119,18 @@ class ServicesAnalyzer:
         function returns True when the node is created and False when the
         existing node is found.
 
-        When created the node is added to the nodes_map dictionary.
+        When created the node is queued, and is added to the graph and to the
+        nodes_map dictionary by `commit`.
 
         Returns
         -------
         True when the node was created
         False when the node already existed
         """
-        if self.nodes_map.get(obj):
+        if obj in self._node_ids:
             return False
 
-        self.nodes_map[obj] = self.graph.add_vertex(obj, **kwargs)
+        self._queue_node(obj, name=obj, **kwargs)
         return True
 
     def add_service_node(self, service: "DesignService"):
@@ -143,9 +176,13 @@ class ServicesAnalyzer:
     # -------------------------------------------------------------------------
 
     def add_edge(self, source, target, **kwargs):
-        self.graph.add_edge(
-            self.nodes_map[source].index, self.nodes_map[target].index, **kwargs
-        )
+        """
+        Queue the edge between the source and target objects, each of which
+        must have been added as a node.  The edge is added to the graph by
+        `commit`.
+        """
+        self._queued_edges.append((self._node_ids[source], self._node_ids[target]))
+        self._queued_edge_attrs.append(kwargs)
 
     def add_design_edge(self, source, target, **kwargs):
         self.add_edge(source, target, kind="d", **kwargs)
@@ -156,6 +193,55 @@ class ServicesAnalyzer:
     def add_check_edge(self, service, source, target, **kwargs):
         self.add_edge(source, target, kind="r", service=service.name, **kwargs)
 
+    # -------------------------------------------------------------------------
+    # graph commit
+    # -------------------------------------------------------------------------
+
+    def commit(self):
+        """
+        Add the queued nodes and edges to the graph, in a single call for each,
+        and add the queued node objects to the nodes_map.  This function is
+        called by the analyzer before the graph is used; for example before
+        analyzing each service.
+        """
+        self._graph_index = None
+
+        if nodes := self._queued_nodes:
+            start = self.graph.vcount()
+            self.graph.add_vertices(
+                len(nodes), attributes=_attrs_columns(attrs for _, attrs in nodes)
+            )
+            vs = self.graph.vs
+            self.nodes_map.putall(
+                (obj, vs[index]) for index, (obj, _) in enumerate(nodes, start=start)
+            )
+            self._queued_nodes = list()
+
+        if edges := self._queued_edges:
+            self.graph.add_edges(
+                edges, attributes=_attrs_columns(self._queued_edge_attrs)
+            )
+            self._queued_edges = list()
+            self._queued_edge_attrs = list()
+
+    # -------------------------------------------------------------------------
+    # graph query
+    # -------------------------------------------------------------------------
+
+    @property
+    def graph_index(self) -> GraphIndex:
+        """the query index of the committed graph"""
+        if self._graph_index is None:
+            self._graph_index = GraphIndex(self.graph)
+        return self._graph_index
+
+    def query(self) -> GraphQuery:
+        """
+        Returns a GraphQuery of the analysis graph that uses the graph index,
+        so that the index is shared by each of the service report queries.
+        """
+        return GraphQuery(self.graph, index=self.graph_index)
+
     # -------------------------------------------------------------------------
     #
     #                          Primary Analyzer Actions
@@ -175,9 +261,12 @@ class ServicesAnalyzer:
                 break
             svc.build(ai=self)
 
+        self.commit()
+
     async def check(self):
         for svc in self.design.services.values():
             await svc.check(ai=self)
+            self.commit()
             self.analyze(svc)
 
     def build_reports(self, flags):
@@ -198,6 +287,7 @@ class ServicesAnalyzer:
     # -------------------------------------------------------------------------
 
     def analyze(self, svc: "DesignService"):
+        self._graph_index = None
         node = self.nodes_map[svc]
 
         self._analyze_service_node(svc, node)
@@ -207,27 +297,106 @@ class ServicesAnalyzer:
             svc.status = "FAIL"
 
     def _analyze_service_node(self, svc: "DesignService", start_node: igraph.Vertex):
-        edges = [
-            edge
-            for edge in start_node.out_edges()
-            if edge["service"] == svc.name and not edge["stop"]
-        ]
-        targets = [edge.target_vertex for edge in edges]
+        """
+        Aggregate the check result counts of the service subgraph, the nodes
+        reachable from the start node by the service edges, into each of the
+        subgraph nodes that has children.  A node counts are those of the
+        distinct check results reachable from the node, including its own.
+        A check result reached by more than one path, for example an
+        interface check result that is also part of a cabling check, is
+        counted once in each node above it.  The nodes are visited once, in
+        reverse topological order.
+
+        The failed check results in the subgraph are added to the service
+        failed list.
+        """
+        graph = self.graph
+        children = self._service_children(svc)
+
+        # walk the service subgraph from the start node; the vertex IDs are
+        # mapped to the subgraph IDs, in the order found.
+
+        sub_vids = [start_node.index]
+        sub_ids = {start_node.index: 0}
+        sub_edges = list()
+
+        for vid in sub_vids:
+            for target in children.get(vid, ()):
+                if (target_id := sub_ids.get(target)) is None:
+                    target_id = sub_ids[target] = len(sub_vids)
+                    sub_vids.append(target)
+                sub_edges.append((sub_ids[vid], target_id))
+
+        subgraph = igraph.Graph(n=len(sub_vids), edges=sub_edges, directed=True)
+        topo_order = subgraph.topological_sorting(mode="out")
+
+        if len(topo_order) != len(sub_vids):
+            raise ValueError(f"Analyzer failed due to a cycle in service: {svc.name}")
+
+        # the counts are held in lists indexed by the subgraph ID; only the
+        # check result nodes have their own counts.  The check results are
+        # held as the set of their subgraph IDs.
+
+        vs = graph.vs
+        check_ids = vs["check_id"] if "check_id" in vs.attributes() else None
+        pass_counts = [0] * len(sub_vids)
+        fail_counts = [0] * len(sub_vids)
+        result_ids = set()
+
+        if check_ids:
+            for sub_id, vid in enumerate(sub_vids):
+                if check_ids[vid] is None:
+                    continue
+
+                node = vs[vid]
+                pass_counts[sub_id] = node["pass_count"]
+                fail_counts[sub_id] = node["fail_count"]
+
+                if pass_counts[sub_id] is None or fail_counts[sub_id] is None:
+                    raise ValueError(
+                        "Analyzer failed due to missing counters in node: "
+                        f"{node.attributes()}"
+                    )
+
+                result_ids.add(sub_id)
+                if node["status"] == "FAIL":
+                    svc.failed.append(self.nodes_map.inverse[node])
+
+        sub_children = subgraph.get_adjlist(mode="out")
+        reached: list[set[int] | None] = [None] * len(sub_vids)
+
+        for sub_id in reversed(topo_order):
+            own = {sub_id} if sub_id in result_ids else set()
+            reached[sub_id] = own.union(
+                *(reached[target] for target in sub_children[sub_id])
+            )
 
-        for target in targets:
-            if target["check_id"] and target["status"] == "FAIL":
-                svc.failed.append(target)
+            if not sub_children[sub_id] and sub_id != 0:
+                continue
 
-            self._analyze_service_node(svc, target)
+            node = vs[sub_vids[sub_id]]
+            node["pass_count"] = sum(pass_counts[each] for each in reached[sub_id])
+            node["fail_count"] = sum(fail_counts[each] for each in reached[sub_id])
 
-            try:
-                start_node["pass_count"] += target["pass_count"]
-                start_node["fail_count"] += target["fail_count"]
+    def _service_children(self, svc: "DesignService") -> dict[int, set[int]]:
+        """
+        Returns the service edges, excluding any marked "stop", as the mapping
+        of each source vertex ID to the set of target vertex IDs.
+        """
+        es = self.graph.es
+        if "service" not in es.attributes():
+            return dict()
 
-            except TypeError:
-                raise ValueError(
-                    f"Analyzer failed due to missing counters in node: {target.attributes()}"
-                )
+        stops = es["stop"] if "stop" in es.attributes() else repeat(None)
+        children = defaultdict(set)
+
+        for (source, target), service, stop in zip(
+            self.graph.get_edgelist(), es["service"], stops
+        ):
+            if service == svc.name and not stop:
+                children[source].add(target)
+
+        return children
 
     def service_graph(self, svc: "DesignService") -> Iterator[DesignService]:
         """
@@ -267,67 +436,148 @@ class ServicesAnalyzer:
     # -------------------------------------------------------------------------
 
     def _load_feature_results(self):
-        for feat in self.design.features.values():
-            for check_type in feat.check_collections:
-                for device in self.devices:
-                    result_objs = self._load_check_type_results(device, check_type)
-                    self._add_result_nodes(device, feature=feat, results=result_objs)
+        # if the User has enabled the results store, then the results are
+        # queried from the store rather than loading each results file.
 
-    def _load_check_type_results(
-        self, device: "Device", check_type: CheckCollectionT
-    ) -> Iterator[dict]:
-        # if the check results file does not exist, then return an empty
-        # iterator so the calling scope is AOK.
+        store = CheckResultsStore.find(netcad_globals.g_netcad_checks_dir)
 
-        results_file = self._device_results_file(device, check_type)
+        loads = [
+            (feat, check_type, device)
+            for feat in self.design.features.values()
+            for check_type in feat.check_collections
+            for device in self.devices
+        ]
 
-        if not results_file.exists():
-            return ()
+        if store:
+            for feat, check_type, device in loads:
+                result_objs = self._load_check_type_results(
+                    device, check_type, store=store
+                )
+                self._add_result_nodes(device, feature=feat, results=result_objs)
+
+            store.close()
+            self.commit()
+            return
+
+        # otherwise the results files are loaded, and the results parsed,
+        # concurrently; the result nodes are added to the graph in the order
+        # of the loads as each completes.
 
+        def load_results(load):
+            _feat, _check_type, _device = load
+            return list(self._load_check_type_results(_device, _check_type))
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="netcad-services"
+        ) as executor:
+            for (feat, check_type, device), result_objs in zip(
+                loads, executor.map(load_results, loads)
+            ):
+                self._add_result_nodes(device, feature=feat, results=result_objs)
+
+        self.commit()
+
+    def _load_check_type_results(
+        self,
+        device: "Device",
+        check_type: CheckCollectionT,
+        store: CheckResultsStore | None = None,
+    ) -> Iterable[CheckResultRef]:
         # TODO: for now only include the PASS/FAIL status results.  We should
         #       add the INFO nodes to the graph as there could be meaningful
         #       use of these nodes for report processing.
+        #
+        # The results are not parsed; the analyzer retains a reference to each
+        # result, see CheckResultRef, and the reports hydrate the results that
+        # they show.
+
+        if store:
+            source = ResultsStoreSource(
+                check_type,
+                db_file=store.db_file,
+                design=device.design.name,
+                device=device.name,
+            )
+            payloads = store.load_results(
+                design=device.design.name,
+                device=device.name,
+                collection=check_type.get_name(),
+                statuses=("PASS", "FAIL"),
+            )
+            return [
+                CheckResultRef.from_payload(payload, source, row)
+                for row, payload in enumerate(payloads)
+            ]
 
-        return (
-            check_type.parse_result(res_obj)
-            for res_obj in json.load(results_file.open())
-            if res_obj["status"] in ("PASS", "FAIL")
-        )
+        # if the check results file does not exist, then return an empty
+        # iterator so the calling scope is AOK.
+
+        if not (results_file := self._device_results_file(device, check_type)):
+            return ()
+
+        source = ResultsFileSource(check_type, results_file=results_file)
+
+        return [
+            CheckResultRef.from_payload(payload, source, row)
+            for row, payload in enumerate(results_file_load(results_file))
+            if payload["status"] in ("PASS", "FAIL")
+        ]
 
     def _add_result_nodes(
-        self, device: "Device", feature: "DesignFeature", results: Iterator[CheckResult]
+        self,
+        device: "Device",
+        feature: "DesignFeature",
+        results: Iterable[CheckResultRef],
     ):
-        for res_obj in results:
-            check = res_obj.check
-            check_type = check.check_type
-
+        for res_ref in results:
             # add the node to the design results-graph so features can
             # cross-functionally use them.
-            if res_obj.status == CheckStatus.PASS:
+            if res_ref.status == CheckStatus.PASS:
                 counts = {"pass_count": 1, "fail_count": 0}
             else:
                 counts = {"pass_count": 0, "fail_count": 1}
 
-            self.nodes_map[res_obj] = self.graph.add_vertex(
+            self._queue_node(
+                res_ref,
                 feature=feature.name,
-                check_type=check_type,
-                check_id=res_obj.check_id,
-                status=str(res_obj.status),
-                device=res_obj.device,
+                check_type=res_ref.check_type,
+                check_id=res_ref.check_id,
+                status=str(res_ref.status),
+                device=res_ref.device,
                 kind="r",
                 **counts,
             )
 
-            self.results_map[device][check_type][res_obj.check_id] = res_obj
+            self.results_map[device][res_ref.check_type][res_ref.check_id] = res_ref
+
+    def _queue_node(self, obj, **attrs):
+        self._node_ids[obj] = self.graph.vcount() + len(self._queued_nodes)
+        self._queued_nodes.append((obj, attrs))
 
     @staticmethod
-    def _device_results_file(device: "Device", check_type: CheckCollectionT) -> Path:
+    def _device_results_file(
+        device: "Device", check_type: CheckCollectionT
+    ) -> Path | None:
         check_name = check_type.get_name()
         base_dir = netcad_globals.g_netcad_checks_dir
-        return (
-            base_dir
-            / device.design.name
-            / device.name
-            / "results"
-            / f"{check_name}.json"
+        return results_file_find(
+            base_dir / device.design.name / device.name / "results", check_name
         )
+
+
+def _attrs_columns(attrs_list: Iterable[dict]) -> dict[str, list]:
+    """
+    Returns the attributes of each of the queued nodes, or edges, as the
+    columns used by the igraph bulk add methods; an attribute that is not
+    given for a node, or edge, is None as it would be when added individually.
+    """
+    attrs_list = list(attrs_list)
+    columns = dict()
+
+    for row, attrs in enumerate(attrs_list):
+        for key, value in attrs.items():
+            if (column := columns.get(key)) is None:
+                column = columns[key] = [None] * len(attrs_list)
+            column[row] = value
+
+    return columns
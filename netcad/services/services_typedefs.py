@@ -21,7 +21,9 @@ import igraph
 from netcad.device import Device
 from netcad.checks import CheckResult
 
-CheckIDObjMapT = Dict[str, CheckResult]
+from .check_result_ref import CheckResultRef
+
+CheckIDObjMapT = Dict[str, CheckResultRef]
 CheckTypeCheckIdMapT = DefaultDict[str, CheckIDObjMapT]
 ResultMapT = DefaultDict[Device, CheckTypeCheckIdMapT]
 CheckResultT = Type[CheckResult]
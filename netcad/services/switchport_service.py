@@ -23,7 +23,6 @@ from netcad.feats.vlans import InterfaceL2, VlanProfile, InterfaceVlan
 from netcad.feats.vlans.checks.check_switchports import SwitchportCheck
 
 from .design_service import DesignService
-from .graph_query import GraphQuery
 from .service_report import DesignServiceReport
 from .service_check import DesignServiceCheck
 from .topology_service import TopologyService
@@ -203,12 +202,8 @@ class SwitchportService(DesignService):
         # ---------------------------------------------------------------------
 
         pass_fail = (
-            GraphQuery(ai.graph)(
-                *ai.graph.vs.select(
-                    service=self.name,
-                    check_type=self.CheckSwitchports.check_type,
-                )
-            )
+            ai.query()
+            .select(service=self.name, check_type=self.CheckSwitchports.check_type)
             .out_()
             .groupby(itemgetter("status"))
         )
@@ -31,7 +31,6 @@ from netcad.feats.topology.checks.check_cabling_nei import InterfaceCablingCheck
 from netcad.feats.topology.checks.check_ipaddrs import IPInterfaceCheck
 from netcad.feats.topology.checks.check_transceivers import TransceiverCheck
 
-from .graph_query import GraphQuery
 from .service_check import DesignServiceCheck
 from .service_report import DesignServiceReport, color_pass_fail
 from .design_service import DesignService
@@ -347,7 +346,7 @@ class TopologyService(DesignService):
         # ---------------------------------------------------------------------
 
         svc_cable_node = (
-            GraphQuery(ai.graph)(ai.nodes_map[self])
+            ai.query()(ai.nodes_map[self])
             .out_()
             .node(check_type=self.CheckCabling.check_type)
             .first()
@@ -382,9 +381,7 @@ class TopologyService(DesignService):
             # find all the device specific checks (really only one right now,
             # but could be more in the future).
 
-            pass_fail = (
-                GraphQuery(ai.graph)(dev_node).out_().groupby(itemgetter("status"))
-            )
+            pass_fail = ai.query()(dev_node).out_().groupby(itemgetter("status"))
             dev_fail = bool(pass_fail["FAIL"])
             pass_fail_c[not dev_fail] += 1
 
@@ -433,9 +430,7 @@ class TopologyService(DesignService):
         for if_obj, if_node in pass_fail_nodes[False]:
             table = Table()
 
-            check_nodes = (
-                GraphQuery(ai.graph)(if_node).out_(service=self.name, kind="r").nodes
-            )
+            check_nodes = ai.query()(if_node).out_(service=self.name, kind="r").nodes
 
             for check_obj in map(ai.nodes_map.inv.__getitem__, check_nodes):
                 table.add_row(self.build_feature_logs_table(check_obj))
@@ -461,9 +456,7 @@ class TopologyService(DesignService):
         pass_table = Table("Device", "Interface", "Desc", "Profile", "Logs")
         for if_obj, if_node in pass_fail_nodes[True]:
             table = Table()
-            check_nodes = (
-                GraphQuery(ai.graph)(if_node).out_(service=self.name, kind="r").nodes
-            )
+            check_nodes = ai.query()(if_node).out_(service=self.name, kind="r").nodes
             for check_obj in map(ai.nodes_map.inv.__getitem__, check_nodes):
                 table.add_row(self.build_feature_logs_table(check_obj))
 
@@ -504,7 +497,7 @@ class TopologyService(DesignService):
                 color_pass_fail(if_check.status == "PASS"),
                 dev_obj.name,
                 if_check.check_id,
-                if_check.check.expected_results.if_ipaddr,
+                if_check.result.check.expected_results.if_ipaddr,
             )
 
         ok = pass_fail_c["FAIL"] == 0
@@ -0,0 +1 @@
+from . import clig_archive
@@ -0,0 +1,168 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Tuple, Optional
+from collections import Counter
+from pathlib import Path
+from datetime import datetime
+import json
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.config import Environment, netcad_globals
+from netcad.checks.check_results_archive import (
+    CheckResultsArchive,
+    ArchiveFormat,
+    ARCHIVE_COLUMNS,
+)
+
+from ..cli_netcam_main import cli
+
+# -----------------------------------------------------------------------------
+# Exports (none)
+# -----------------------------------------------------------------------------
+
+__all__ = []
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+@cli.group(name="archive")
+def clig_archive():
+    """Check results archive commands"""
+    pass
+
+
+@clig_archive.command(name="create")
+@click.option(
+    "--checks-dir",
+    help="location of the device checks results",
+    type=click.Path(path_type=Path, resolve_path=True, exists=True),
+    envvar=Environment.NETCAD_CHECKSDIR,
+)
+@click.option("--design", "designs", multiple=True, help="archive only these designs")
+@click.option(
+    "--format",
+    "archive_format",
+    type=click.Choice([str(each) for each in ArchiveFormat]),
+    help="archive format, default parquet when pyarrow is installed",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(path_type=Path),
+    help="archive file, default is timestamped in the checks-dir",
+)
+def cli_archive_create(
+    checks_dir: Optional[Path],
+    designs: Tuple[str],
+    archive_format: Optional[str],
+    output: Optional[Path],
+):
+    """Create the archive of the check results of all devices"""
+
+    checks_dir = checks_dir or netcad_globals.g_netcad_checks_dir
+    fmt = ArchiveFormat(archive_format) if archive_format else ArchiveFormat.default()
+
+    if not output:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = checks_dir / f"results-{stamp}{fmt.suffix}"
+
+    elif output.suffix != fmt.suffix:
+        output = output.with_suffix(fmt.suffix)
+
+    try:
+        archive = CheckResultsArchive.create(output, checks_dir, designs=designs)
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc))
+
+    print(f"Archived {len(archive)} results: {output}")
+
+
+@clig_archive.command(name="query")
+@click.argument(
+    "archive_files",
+    nargs=-1,
+    required=True,
+    type=click.Path(path_type=Path, exists=True, dir_okay=False),
+)
+@click.option("--design", "designs", multiple=True, help="filter design(s)")
+@click.option("--device", "devices", multiple=True, help="filter device(s)")
+@click.option("--collection", "collections", multiple=True, help="filter collections")
+@click.option("--check-type", "check_types", multiple=True, help="filter check types")
+@click.option("--status", "statuses", multiple=True, help="filter status, e.g. FAIL")
+@click.option(
+    "--count",
+    "count_by",
+    type=click.Choice(ARCHIVE_COLUMNS),
+    help="show only the result counts by this column",
+)
+@click.option("--logs", "with_logs", is_flag=True, help="output the result logs")
+def cli_archive_query(
+    archive_files: Tuple[Path],
+    count_by: Optional[str],
+    with_logs: bool,
+    **filters,
+):
+    """Query the check results of one or more archives"""
+
+    filters = dict(
+        design=filters["designs"],
+        device=filters["devices"],
+        collection=filters["collections"],
+        check_type=filters["check_types"],
+        status=filters["statuses"],
+    )
+
+    try:
+        archives = [CheckResultsArchive(each) for each in archive_files]
+    except (RuntimeError, ValueError) as exc:
+        raise click.ClickException(str(exc))
+
+    if count_by:
+        _show_counts(archives, count_by, filters)
+        return
+
+    # the matching results are output as JSON Lines so that the output can be
+    # piped to other tools.
+
+    for archive in archives:
+        for row in archive.query(with_logs=with_logs, **filters):
+            print(json.dumps(row))
+
+
+# -----------------------------------------------------------------------------
+#
+#                            PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def _show_counts(archives, count_by: str, filters: dict):
+    table = Table(count_by, "Count")
+    totals = Counter()
+    for archive in archives:
+        totals.update(archive.counts(by=count_by, **filters))
+
+    for value, count in sorted(totals.items(), key=lambda i: str(i[0])):
+        table.add_row(str(value), str(count))
+
+    Console().print(table)
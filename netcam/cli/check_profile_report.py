@@ -0,0 +1,182 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import List, Sequence
+from collections import defaultdict
+from statistics import quantiles
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+from rich.console import Console
+from rich.table import Table
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcam.timing import TimingPhase
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["display_profile_report"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def display_profile_report(console: Console, spans: List[dict], top: int = 10):
+    """
+    Display the `netcam check --profile` report from the run timing spans:
+        * the slowest devices, with the time spent in each phase
+        * the slowest device check collections
+        * the p50/p95/p99 spread of each phase
+    """
+    if not spans:
+        return
+
+    console.print(
+        "\n",
+        _slowest_devices_table(spans, top),
+        "\n",
+        _slowest_collections_table(spans, top),
+        "\n",
+        _phase_spread_table(spans),
+        "\n",
+    )
+
+
+# -----------------------------------------------------------------------------
+#
+#                          PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+_DEVICE_PHASES = (
+    TimingPhase.setup,
+    TimingPhase.load,
+    TimingPhase.execute,
+    TimingPhase.save,
+    TimingPhase.teardown,
+)
+
+
+def _secs(value: float) -> str:
+    return f"{value:.3f}"
+
+
+def _slowest_devices_table(spans: List[dict], top: int) -> Table:
+    dev_phases = defaultdict(lambda: defaultdict(float))
+
+    for span in spans:
+        dev_phases[span["device"]][span["phase"]] += span["duration"]
+
+    table = Table(
+        "Device",
+        "Total (s)",
+        *(f"{phase.title()} (s)" for phase in _DEVICE_PHASES),
+        title=f"Slowest Devices (top {top})",
+        header_style="bold magenta",
+    )
+
+    slowest = sorted(
+        dev_phases.items(), key=lambda item: item[1][TimingPhase.device], reverse=True
+    )
+
+    for dev_name, phases in slowest[:top]:
+        table.add_row(
+            dev_name,
+            _secs(phases[TimingPhase.device]),
+            *(_secs(phases[phase]) for phase in _DEVICE_PHASES),
+        )
+
+    return table
+
+
+def _slowest_collections_table(spans: List[dict], top: int) -> Table:
+    coll_phases = defaultdict(lambda: defaultdict(float))
+
+    for span in spans:
+        if span["collection"]:
+            key = (span["device"], span["collection"])
+            coll_phases[key][span["phase"]] += span["duration"]
+
+    table = Table(
+        "Device",
+        "Checks",
+        "Total (s)",
+        "Load (s)",
+        "Execute (s)",
+        "Save (s)",
+        title=f"Slowest Checks (top {top})",
+        header_style="bold magenta",
+    )
+
+    slowest = sorted(
+        coll_phases.items(), key=lambda item: sum(item[1].values()), reverse=True
+    )
+
+    for (dev_name, collection), phases in slowest[:top]:
+        table.add_row(
+            dev_name,
+            collection,
+            _secs(sum(phases.values())),
+            _secs(phases[TimingPhase.load]),
+            _secs(phases[TimingPhase.execute]),
+            _secs(phases[TimingPhase.save]),
+        )
+
+    return table
+
+
+def _phase_spread_table(spans: List[dict]) -> Table:
+    phase_durations = defaultdict(list)
+
+    for span in spans:
+        phase_durations[span["phase"]].append(span["duration"])
+
+    table = Table(
+        "Phase",
+        "Count",
+        "p50 (s)",
+        "p95 (s)",
+        "p99 (s)",
+        "Max (s)",
+        title="Phase Spread",
+        header_style="bold magenta",
+    )
+
+    for phase in TimingPhase:
+        if not (durations := phase_durations.get(phase)):
+            continue
+
+        p50, p95, p99 = _percentiles(durations)
+        table.add_row(
+            str(phase),
+            str(len(durations)),
+            _secs(p50),
+            _secs(p95),
+            _secs(p99),
+            _secs(max(durations)),
+        )
+
+    return table
+
+
+def _percentiles(durations: Sequence[float]) -> tuple:
+    # quantiles requires at least two data points.
+    if len(durations) < 2:
+        return durations[0], durations[0], durations[0]
+
+    cuts = quantiles(durations, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
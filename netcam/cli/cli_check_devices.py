@@ -26,7 +26,7 @@ from rich.table import Table
 
 from netcad.config import Environment, netcad_globals
 from netcad.logger import get_logger
-from netcam.dut import DeviceUnderTest
+from netcam.dut import DeviceUnderTest, DEFAULT_MAX_DUT_THREADS
 from netcad.cli.common_opts import opt_devices, opt_designs
 from netcad.cli.device_inventory import get_devices_from_designs
 
@@ -34,10 +34,18 @@ from netcad.cli.device_inventory import get_devices_from_designs
 
 from netcam.cli import cli
 
-from netcam.execute_checks import (
-    execute_device_checks,
-    cv_check_list,
-    cv_service_list,
+from netcam.schedule_checks import DeviceCheckOrder, DEFAULT_MAX_CONCURRENT_DEVICES
+from netcam.run_checks import CheckRunOptions, run_device_checks
+from netcam.shard_checks import shard_device_checks
+from netcam.monitor_checks import monitor_device_checks
+from netcam.rerun_checks import RerunSelect
+from netcam.timing import TimingRecorder, cv_timing
+from netcam.cli.check_profile_report import display_profile_report
+from netcad.checks import CheckResultsFormat
+from netcad.checks.check_results_store import CheckResultsStore
+from netcad.checks.check_file_compression import (
+    file_compression_check,
+    file_compression_config,
 )
 from netcad.cli.keywords import color_pass_fail
 
@@ -77,12 +85,123 @@ __all__ = []
     type=click.Path(path_type=Path, resolve_path=True, exists=True, writable=True),
     envvar=Environment.NETCAD_CHECKSDIR,
 )
+@click.option(
+    "--max-concurrent",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_CONCURRENT_DEVICES,
+    show_default=True,
+    help="maximum number of devices checked at the same time",
+)
+@click.option(
+    "--max-threads",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_DUT_THREADS,
+    show_default=True,
+    help=(
+        "maximum number of blocking device plugin calls run at the same time, "
+        "across all devices"
+    ),
+)
+@click.option(
+    "--order",
+    type=click.Choice([str(each) for each in DeviceCheckOrder]),
+    default=str(DeviceCheckOrder.name),
+    show_default=True,
+    help="order in which devices are started",
+)
+@click.option(
+    "--setup-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="per-device deadline, in seconds, for the device setup",
+)
+@click.option(
+    "--check-timeout",
+    "execute_timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="per-device deadline, in seconds, for executing all checks",
+)
+@click.option(
+    "--concurrent-checks",
+    is_flag=True,
+    help="execute the check collections of each device concurrently",
+)
+@click.option(
+    "--results-format",
+    type=click.Choice([str(each) for each in CheckResultsFormat]),
+    default=str(CheckResultsFormat.json),
+    show_default=True,
+    help="format of the check results files",
+)
+@click.option(
+    "--log-pass",
+    is_flag=True,
+    help="include the measured values of the PASS check logs in the results files",
+)
+@click.option(
+    "--store",
+    "use_store",
+    is_flag=True,
+    help="record the results in the checks-dir results store (results.db)",
+)
+@click.option(
+    "--failed-only",
+    is_flag=True,
+    help="execute only the checks that failed in the previous run",
+)
+@click.option(
+    "--changed-only",
+    is_flag=True,
+    help="execute only the checks that changed since the previous run",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="number of processes used to check the devices",
+)
+@click.option(
+    "--timing-file",
+    type=click.Path(path_type=Path, dir_okay=False, writable=True),
+    help="write the run timing spans to this file (JSON Lines)",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="display the slowest devices and checks after the run",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0, min_open=True),
+    help="monitor mode, re-execute the checks every interval seconds",
+)
+@click.option(
+    "--cycles",
+    type=click.IntRange(min=1),
+    help="monitor mode, stop after this number of cycles",
+)
 def cli_test_device(
     devices: Tuple[str],
     designs: Tuple[str],
     check_list: Tuple[str],
     checks_dir: Path,
     service_list: Tuple[str],
+    max_concurrent: int,
+    max_threads: int,
+    order: str,
+    setup_timeout: float | None,
+    execute_timeout: float | None,
+    concurrent_checks: bool,
+    results_format: str,
+    log_pass: bool,
+    use_store: bool,
+    failed_only: bool,
+    changed_only: bool,
+    workers: int,
+    timing_file: Path | None,
+    profile: bool,
+    interval: float | None,
+    cycles: int | None,
 ):
     """
     Execute checks to validate the operational state of devices.
@@ -113,10 +232,93 @@ def cli_test_device(
     checks_dir:
         The Path instance to the parent directory of checks.  Subdirectories
         exist for each device by hostname.
+
+    max_concurrent:
+        The maximum number of devices that are checked at the same time.
+
+    max_threads:
+        The maximum number of threads used to execute the plugins that use a
+        blocking device API, see DeviceUnderTest.  This also limits the number
+        of those devices checked at the same time.
+
+    order:
+        The policy used to determine the order devices are started; see
+        DeviceCheckOrder.
+
+    setup_timeout: optional
+        The per-device deadline, in seconds, for the DUT setup.
+
+    execute_timeout: optional
+        The per-device deadline, in seconds, for executing all device checks.
+
+    concurrent_checks:
+        When True, the check collections of each device are executed
+        concurrently, bounded by the plugin DUT `max_concurrent_checks`.
+
+    results_format:
+        The format of the results files; see CheckResultsFormat.  The JSON
+        Lines formats are written as the results are serialized.
+
+    log_pass:
+        When True, the PASS log entries of each check are written in full to
+        the results files.  By default the PASS entries are written with only
+        the expected value, since the measured value is the same.
+
+    use_store:
+        When True, the results are also recorded in the SQLite results store
+        located in the checks directory; creating it if needed.  Once the
+        store exists, it is always updated.
+
+    failed_only:
+        When True, only the checks that failed in the previous run are
+        executed.  The previous results of the other checks are retained.
+
+    changed_only:
+        When True, only the check collections whose checks file changed since
+        the previous run are executed.  When used with `failed_only`, the
+        check collections that changed or have failed checks are executed.
+
+    workers:
+        The number of processes used to check the devices.  When more than
+        one, the devices are split across a process pool and the
+        max-concurrent limit is divided across the workers.
+
+    timing_file: optional
+        When provided, the timing spans of the run are written to this file.
+        Each line is a JSON object with the keys device, phase, collection,
+        start, duration, and status.
+
+    profile:
+        When True, the profile report of the slowest devices and checks, and
+        the spread of time spent in each phase, is displayed after the
+        summary.
+
+    interval: optional
+        When provided, the command runs in monitor mode.  The devices are set
+        up once and the checks are executed every interval seconds; only the
+        checks that change between PASS and FAIL are reported.  The results
+        files are written each cycle.
+
+    cycles: optional
+        In monitor mode, the number of cycles to execute; otherwise the
+        command runs until interrupted.
     """
 
     log = get_logger()
 
+    if interval and (workers > 1 or timing_file or profile):
+        raise click.UsageError(
+            "--interval cannot be used with --workers, --timing-file, or --profile"
+        )
+
+    # the results format is checked before the run, rather than failing as
+    # each device saves its results.
+
+    try:
+        file_compression_check(CheckResultsFormat(results_format).compression)
+    except RuntimeError as exc:
+        raise click.BadParameter(str(exc), param_hint="--results-format")
+
     if not (device_objs := get_devices_from_designs(designs, include_devices=devices)):
         log.error("No devices located in the given designs")
         return
@@ -125,55 +327,84 @@ def cli_test_device(
         dev for dev in device_objs if not any((dev.is_pseudo, dev.is_not_managed))
     ]
 
-    # create the device-under-test (DUT) instances for each of the devices in
-    # the design. we keep this collection as a dictionary so that we can refer
-    # back to the DUT by device name when be build the summary table.
-
     tc_dir = checks_dir or netcad_globals.g_netcad_checks_dir
-    netcam_plugins = netcad_globals.g_netcam_plugins_os_catalog
-
-    duts = {}
 
-    async def run_tests():
-        cv_check_list.set(check_list)
-        cv_service_list.set(service_list)
+    options = CheckRunOptions(
+        checks_dir=tc_dir,
+        check_list=check_list,
+        service_list=service_list,
+        max_concurrent=max_concurrent,
+        max_threads=max_threads,
+        order=DeviceCheckOrder(order),
+        setup_timeout=setup_timeout,
+        execute_timeout=execute_timeout,
+        concurrent_checks=concurrent_checks,
+        results_format=CheckResultsFormat(results_format),
+        log_pass=log_pass,
+        compression=file_compression_config(),
+        rerun_select=frozenset(
+            select
+            for select, enabled in (
+                (RerunSelect.failed, failed_only),
+                (RerunSelect.changed, changed_only),
+            )
+            if enabled
+        ),
+        timing=bool(timing_file or profile),
+    )
 
-        for dev_obj in device_objs:
-            if not (pg_obj := netcam_plugins.get(dev_obj.os_name)):
-                log.error(
-                    f"Missing testing plugin for {dev_obj.name}: os-name: {dev_obj.os_name}, skipping."
-                )
-                continue
+    recorder = TimingRecorder() if options.timing else None
 
-            duts[dev_obj] = dut_obj = pg_obj.module.plugin_get_dut(device=dev_obj)
+    # the results store run is created here so that all devices, including
+    # those checked by worker processes, are recorded as part of the run.
 
-            # the device checks directory is subdir under the design name.
-            dut_obj.testcases_dir = tc_dir / dev_obj.design.name / dev_obj.name
+    if store := (
+        CheckResultsStore(CheckResultsStore.db_path(tc_dir))
+        if use_store
+        else CheckResultsStore.find(tc_dir)
+    ):
+        options.store_run_id = store.start_run()
+        store.close()
 
-        remove_unsupported = [dev for dev, dut in duts.items() if not dut]
-        for dev_obj in remove_unsupported:
-            log.warning(f"Missing DUT support for device: {dev_obj.name}, skipping.")
+    if interval:
+        try:
+            asyncio.run(
+                monitor_device_checks(options, device_objs, interval, cycles=cycles)
+            )
+        except KeyboardInterrupt:
+            log.info("Monitoring stopped.")
+        return
 
-        for dev_obj in remove_unsupported:
-            del duts[dev_obj]
+    summary = SummaryTable()
 
-        log.info(f"Starting tests for {len(duts)} devices.")
+    async def run_tests():
+        cv_timing.set(recorder)
 
-        # execute the tests concurrently to minimize the time it takes to run
-        # through all the tests.
+        # the summary is built as each device completes.
+        async for dut in run_device_checks(options, device_objs):
+            summary.add(dut)
+            log.debug(f"Completed {len(summary)} of {len(device_objs)} devices.")
 
-        # TODO: this _presumes_ that the underlying "netcam" plugin was written to
-        #       support asyncio.  This might not always be the case, so need to put
-        #       in a check and execute the plugin running differently. For now, only
-        #       asyncio plugins are supported.
+    ts_start = datetime.now()
 
-        await asyncio.gather(*(execute_device_checks(dut) for dut in duts.values()))
+    if workers > 1:
+        for dev_name, counts in shard_device_checks(
+            options, device_objs, workers, recorder=recorder
+        ):
+            summary.add_counts(dev_name, counts)
+            log.debug(f"Completed {len(summary)} of {len(device_objs)} devices.")
+    else:
+        asyncio.run(run_tests())
 
-    ts_start = datetime.now()
-    asyncio.run(run_tests())
     ts_end = datetime.now()
 
-    display_summary_table(duts, duration=ts_end - ts_start)
+    summary.display(duration=ts_end - ts_start)
+
+    if timing_file:
+        recorder.write(timing_file)
+
+    if profile:
+        display_profile_report(Console(), recorder.spans)
 
 
 # -----------------------------------------------------------------------------
@@ -183,21 +414,11 @@ def cli_test_device(
 # -----------------------------------------------------------------------------
 
 
-def display_summary_table(duts: Dict[str, DeviceUnderTest], duration):
-    # Display summary table for each device, and then a grand total summary
-
-    table = Table(
-        "Device",
-        "Status",
-        "Total",
-        "Pass",
-        "Fail",
-        "Info",
-        "Skip",
-        show_header=True,
-        header_style="bold magenta",
-        show_lines=True,
-    )
+class SummaryTable:
+    """
+    The device summary table is built incrementally as each device completes
+    its checks, and then displayed once all devices are done.
+    """
 
     colored_styles = (
         Style(color="green"),
@@ -206,35 +427,69 @@ def display_summary_table(duts: Dict[str, DeviceUnderTest], duration):
         Style(color="magenta"),
     )
 
-    grand_totals = Counter()
+    def __init__(self):
+        self.grand_totals = Counter()
+
+        # key=device-name, value=table row cells.  The rows are displayed
+        # sorted by device name regardless of the order of completion.
+        self.rows: Dict[str, tuple] = dict()
 
-    for dut in sorted(duts.values()):
-        cntrs = dut.result_counts
-        grand_totals.update(cntrs)
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, dut: DeviceUnderTest):
+        self.add_counts(dut.device.name, dut.result_counts)
+
+    def add_counts(self, dev_name: str, cntrs: Counter):
+        self.grand_totals.update(cntrs)
 
         totals = str(sum(cntrs.values()))
         clrd_cnts = [
             Text(str(cntr), style=clrd_style)
             for cntr, clrd_style in zip(
                 (cntrs["PASS"], cntrs["FAIL"], cntrs["INFO"], cntrs["SKIP"]),
-                colored_styles,
+                self.colored_styles,
             )
         ]
-        table.add_row(dut.device.name, color_pass_fail(cntrs), totals, *clrd_cnts)
-
-    gt_sum = sum(grand_totals.values())
-
-    console = Console()
-    pass_fail = color_pass_fail(grand_totals)
-
-    console.print(
-        "\n",
-        "Overall Check Results: ",
-        pass_fail,
-        "\n",
-        f"{len(duts)} Devices, {gt_sum} Checks\n",
-        f"Duration {duration}\n",
-    )
-
-    table.title = Text("Device Summaries", justify="left")
-    console.print(table, "\n")
+        self.rows[dev_name] = (
+            dev_name,
+            color_pass_fail(cntrs),
+            totals,
+            *clrd_cnts,
+        )
+
+    def display(self, duration):
+        # Display summary table for each device, and then a grand total summary
+
+        table = Table(
+            "Device",
+            "Status",
+            "Total",
+            "Pass",
+            "Fail",
+            "Info",
+            "Skip",
+            show_header=True,
+            header_style="bold magenta",
+            show_lines=True,
+        )
+
+        for dev_name in sorted(self.rows):
+            table.add_row(*self.rows[dev_name])
+
+        gt_sum = sum(self.grand_totals.values())
+
+        console = Console()
+        pass_fail = color_pass_fail(self.grand_totals)
+
+        console.print(
+            "\n",
+            "Overall Check Results: ",
+            pass_fail,
+            "\n",
+            f"{len(self.rows)} Devices, {gt_sum} Checks\n",
+            f"Duration {duration}\n",
+        )
+
+        table.title = Text("Device Summaries", justify="left")
+        console.print(table, "\n")
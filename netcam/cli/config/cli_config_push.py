@@ -24,6 +24,7 @@ from netcad.config import netcad_globals
 from netcad.logger import get_logger
 from netcad.device import Device, DeviceNonExclusive
 from netcam.dcfg import AsyncDeviceConfigurable
+from netcam.session_pool import get_session_pool
 from netcad.cli.device_inventory import get_devices_from_designs
 from netcad.cli.common_opts import opt_devices, opt_designs, opt_configs_dir
 from netcam.cli.netcam_filter_devices import netcam_filter_devices
@@ -124,3 +125,5 @@ async def run_deploy_configs(
     else:
         for task in tasks:
             await task
+
+    await get_session_pool().close()
@@ -4,7 +4,7 @@
 # System Imports
 # -----------------------------------------------------------------------------
 
-from typing import Tuple
+from typing import Tuple, Optional
 from pathlib import Path
 from itertools import groupby
 import shutil
@@ -22,6 +22,8 @@ from rich.console import Console
 
 from netcad.config import Environment, netcad_globals
 from netcad.logger import get_logger
+from netcad.checks.check_results_store import CheckResultsStore
+from netcad.checks.check_results_query import ResultsQuery
 
 from netcad.cli.common_opts import opt_devices, opt_designs
 from netcad.cli.device_inventory import get_devices_from_designs
@@ -29,8 +31,9 @@ from netcad.cli.device_inventory import get_devices_from_designs
 
 from ..cli_netcam_show import clig_show
 from .show_device_brief_table import show_device_brief_table
-from .show_device_check_logs import show_device_test_logs
+from .show_device_check_logs import show_device_test_logs, make_results_query
 from .show_design_summary import show_design_summary_table
+from .report_export import ReportExport
 
 # -----------------------------------------------------------------------------
 # Exports (none)
@@ -97,13 +100,47 @@ __all__ = []
 @click.option(
     "--summary", "summary_mode", is_flag=True, help="Show summary counts of design(s)"
 )
+@click.option(
+    "--where",
+    multiple=True,
+    metavar="KEY=PATTERN",
+    help=f"select results, KEY one of: {', '.join(ResultsQuery.keys())}",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "jsonl"]),
+    default="table",
+    show_default=True,
+    help="output the results as tables or as JSON Lines",
+)
+@click.option(
+    "--html",
+    "html_file",
+    type=click.Path(path_type=Path, dir_okay=False, writable=True),
+    help="also write the report to this HTML file",
+)
+@click.option(
+    "--json",
+    "json_file",
+    type=click.Path(path_type=Path, dir_okay=False, writable=True),
+    help="also write the reported results to this JSON file",
+)
 def cli_report_tests(
-    devices: Tuple[str], designs: Tuple[str], checks_dir: Path, **optionals
+    devices: Tuple[str],
+    designs: Tuple[str],
+    checks_dir: Path,
+    html_file: Optional[Path],
+    json_file: Optional[Path],
+    **optionals,
 ):
     """Show check results in tablular form."""
 
     log = get_logger()
 
+    if json_file and (optionals["brief_mode"] or optionals["summary_mode"]):
+        raise click.UsageError("--json is not supported with --brief or --summary")
+
     if not (device_objs := get_devices_from_designs(designs, include_devices=devices)):
         log.error("No devices located in the given designs")
         return
@@ -112,7 +149,10 @@ def cli_report_tests(
         dev for dev in device_objs if not any((dev.is_pseudo, dev.is_not_managed))
     ]
 
-    log.info(f"Showing test logs for {len(device_objs)} devices.")
+    # the JSON Lines output is not mixed with the log messages.
+
+    if optionals["output_format"] == "table":
+        log.info(f"Showing test logs for {len(device_objs)} devices.")
 
     # bind a test-case-dir Path attribute (tcr_dir) to each Device instance so
     # that the results can be retrieved and processed.
@@ -136,9 +176,36 @@ def cli_report_tests(
         sorted(device_objs, key=lambda d: id(d.design)), key=lambda d: d.design
     )
 
+    # if the User has enabled the results store, then use it rather than
+    # loading each of the results files.
+
+    store = CheckResultsStore.find(tc_dir)
+
+    # the console output is only recorded when the User wants the HTML report,
+    # and is written to the HTML file after each device; see ReportExport.
+
     term_sz = shutil.get_terminal_size()
-    console = Console(record=True, width=term_sz.columns)
+    console = Console(record=bool(html_file), width=term_sz.columns)
 
+    with ReportExport(console, html_file=html_file, json_file=json_file) as export:
+        _show_report(console, export, devices_by_design, devices, store, optionals)
+
+
+# -----------------------------------------------------------------------------
+#
+#                            PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def _show_report(
+    console: Console,
+    export: ReportExport,
+    devices_by_design,
+    devices: Tuple[str],
+    store: Optional[CheckResultsStore],
+    optionals: dict,
+):
     # -------------------------------------------------------------------------
     # Option --brief
     # -------------------------------------------------------------------------
@@ -148,13 +215,18 @@ def cli_report_tests(
 
         for design, device_objs in devices_by_design:
             show_design_summary_table(
-                console=console, design=design, optionals=optionals, devices=devices
+                console=console,
+                design=design,
+                optionals=optionals,
+                devices=devices,
+                store=store,
             )
+            export.flush()
 
         return
 
     # -------------------------------------------------------------------------
-    # Option --brief
+    # Option --summary
     # -------------------------------------------------------------------------
 
     if optionals["summary_mode"]:
@@ -163,6 +235,7 @@ def cli_report_tests(
         for design, device_objs in devices_by_design:
             for dev_obj in device_objs:
                 show_device_brief_table(console, dev_obj, optionals)
+                export.flush()
 
         # done with brief mode, exit CLI processing
         return
@@ -171,8 +244,14 @@ def cli_report_tests(
     # Full reporting mode
     # -------------------------------------------------------------------------
 
+    try:
+        query = make_results_query(optionals)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="--where")
+
     for design, device_objs in devices_by_design:
         for dev_obj in device_objs:
-            show_device_test_logs(console, dev_obj, optionals)
-
-    console.save_html(path="log.html")
+            show_device_test_logs(
+                console, dev_obj, optionals, query, store=store, export=export
+            )
+            export.flush()
@@ -1,5 +1,31 @@
-from typing import List, Dict
-from netcad.checks import CheckStatus
+from typing import Iterable, List, Dict, Set, Optional
+from pathlib import Path
+from collections import Counter
+
+from netcad.checks import CheckStatus, results_file_find, results_file_load
+from netcad.checks.check_results_summary import ResultsSummaryCounts
+
+
+def filter_status_allows(optionals: dict) -> Set[CheckStatus]:
+    """
+    Returns the set of result status values that the User wants to see based
+    on the User CLI flags.
+    """
+    inc_all = optionals["include_all"]
+
+    if optionals["pass_only"]:
+        status_allows = {CheckStatus.PASS}
+    else:
+        status_allows = {CheckStatus.FAIL}
+
+    if optionals["include_info"] or inc_all:
+        status_allows.add(CheckStatus.INFO)
+        status_allows.add(CheckStatus.SKIP)
+
+    if optionals["include_pass"] or inc_all:
+        status_allows.add(CheckStatus.PASS)
+
+    return status_allows
 
 
 def filter_results(results: dict, optionals: dict) -> List[Dict]:
@@ -19,28 +45,22 @@ def filter_results(results: dict, optionals: dict) -> List[Dict]:
     List of the filtered results.  If the results include a "skip" indicator,
     then an empty list is returned.
     """
-    inc_all = optionals["include_all"]
+    status_allows = filter_status_allows(optionals)
+    filter_status = lambda i: i["status"] in status_allows
 
-    if optionals["pass_only"]:
-        status_allows = {CheckStatus.PASS}
-    else:
-        status_allows = {CheckStatus.FAIL}
+    return list(filter_fields(filter(filter_status, results), optionals))
 
+
+def filter_fields(results: Iterable[Dict], optionals: dict) -> Iterable[Dict]:
+    """
+    Filters the results by the User CLI include and exclude field flags; the
+    results are filtered as they are consumed.
+    """
     inc_fields = optionals["include_fields"]
     exc_fields = optionals["exclude_fields"]
 
-    if optionals["include_info"] or inc_all:
-        status_allows.add(CheckStatus.INFO)
-        status_allows.add(CheckStatus.SKIP)
-
-    if optionals["include_pass"] or inc_all:
-        status_allows.add(CheckStatus.PASS)
-
     filter_flds_in = lambda i: i.get("field") in inc_fields
     filter_flds_out = lambda i: i.get("field") not in exc_fields
-    filter_status = lambda i: i["status"] in status_allows
-
-    results = filter(filter_status, results)
 
     if exc_fields:
         results = filter(filter_flds_out, results)
@@ -48,4 +68,55 @@ def filter_results(results: dict, optionals: dict) -> List[Dict]:
     if inc_fields:
         results = filter(filter_flds_in, results)
 
-    return list(results)
+    return results
+
+
+def filter_summary_counts(counts: ResultsSummaryCounts, optionals: dict) -> Counter:
+    """
+    Returns the status counters of the results summary counts, filtered in the
+    same manner as filter_results.
+    """
+    status_allows = filter_status_allows(optionals)
+
+    inc_fields = optionals["include_fields"]
+    exc_fields = optionals["exclude_fields"]
+
+    cntrs = Counter()
+
+    for status, field, count in counts:
+        if status not in status_allows:
+            continue
+
+        if (exc_fields and field in exc_fields) or (
+            inc_fields and field not in inc_fields
+        ):
+            continue
+
+        cntrs[status] += count
+
+    return cntrs
+
+
+def collection_status_counts(
+    results_dir: Path, tc_name: str, summary: Dict[str, dict], optionals: dict
+) -> Optional[Counter]:
+    """
+    Returns the filtered status counters of the check collection results using
+    the device results summary, see results_summary_load, when available;
+    otherwise from the results file.
+
+    Returns
+    -------
+    None if there are no results for the check collection.
+    """
+    if tc_summary := summary.get(tc_name):
+        return filter_summary_counts(tc_summary["counts"], optionals)
+
+    # if the test results file does not exist, it means that the tests were
+    # not executed.  For now, silently skip.  TODO: may show User warning?
+
+    if not (results_file := results_file_find(results_dir, tc_name)):
+        return None
+
+    results = filter_results(results_file_load(results_file), optionals)
+    return Counter(res["status"] for res in results)
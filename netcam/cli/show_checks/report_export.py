@@ -0,0 +1,129 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, IO
+from pathlib import Path
+import json
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+from rich.console import Console
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["ReportExport"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+class ReportExport:
+    """
+    Writes the `netcam show check` report to the User's --html and --json
+    files as the report is produced, rather than retaining the complete
+    report in memory.
+
+    The HTML file is written from the console record, which is enabled only
+    when there is an HTML file; the record is written and cleared by `flush`,
+    which is called after each device report.  The JSON file is a list of the
+    reported results, each with the check collection name, written by
+    `write_result`.
+
+    Examples
+    --------
+        console = Console(record=bool(html_file))
+        with ReportExport(console, html_file, json_file) as export:
+            for device in devices:
+                ...
+                export.flush()
+    """
+
+    def __init__(
+        self,
+        console: Console,
+        html_file: Optional[Path] = None,
+        json_file: Optional[Path] = None,
+    ):
+        self.console = console
+        self.html_file = html_file
+        self.json_file = json_file
+        self._html: Optional[IO] = None
+        self._json: Optional[IO] = None
+        self._json_count = 0
+
+    @property
+    def has_json(self) -> bool:
+        return self._json is not None
+
+    def __enter__(self) -> "ReportExport":
+        if self.html_file:
+            self._html = self.html_file.open("w", encoding="utf-8")
+            self._html.write(_HTML_HEADER)
+
+        if self.json_file:
+            self._json = self.json_file.open("w", encoding="utf-8")
+            self._json.write("[")
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._html:
+            self.flush()
+            self._html.write(_HTML_FOOTER)
+            self._html.close()
+
+        if self._json:
+            self._json.write("\n]\n")
+            self._json.close()
+
+    def write_result(self, result: dict):
+        """Write the reported result to the JSON file"""
+        self._json.write(",\n" if self._json_count else "\n")
+        self._json.write(json.dumps(result))
+        self._json_count += 1
+
+    def flush(self):
+        """Write the console output recorded so far to the HTML file"""
+        if not self._html:
+            return
+
+        self._html.write(
+            self.console.export_html(inline_styles=True, code_format="{code}")
+        )
+
+
+# -----------------------------------------------------------------------------
+#
+#                            PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+# the console record is exported with inline styles so that each part of the
+# report can be written without a common stylesheet.
+
+_HTML_HEADER = """\
+<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+</head>
+<body>
+<pre style="font-family:Menlo,'DejaVu Sans Mono',consolas,'Courier New',monospace">
+"""
+
+_HTML_FOOTER = """\
+</pre>
+</body>
+</html>
+"""
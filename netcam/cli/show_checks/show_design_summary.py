@@ -5,8 +5,7 @@
 # System Imports
 # -----------------------------------------------------------------------------
 
-import json
-from typing import Tuple
+from typing import Tuple, Optional
 from collections import Counter
 
 # -----------------------------------------------------------------------------
@@ -22,14 +21,20 @@ from rich.console import Console
 
 from netcad.design import Design
 from netcad.checks import CheckStatus
+from netcad.checks.check_results_summary import results_summary_load
+from netcad.checks.check_results_store import CheckResultsStore
 from netcad.cli.keywords import color_pass_fail
 
 from .find_check_services import find_check_services
-from .filter_results import filter_results
+from .filter_results import collection_status_counts, filter_status_allows
 
 
 def show_design_summary_table(
-    console: Console, design: Design, optionals: dict, devices: Tuple[str]
+    console: Console,
+    design: Design,
+    optionals: dict,
+    devices: Tuple[str],
+    store: Optional[CheckResultsStore] = None,
 ):
     table = Table(
         "Test Cases",
@@ -57,27 +62,31 @@ def show_design_summary_table(
     ]
 
     if devices:
-        dev_objs = filter(lambda d: d.name in devices, dev_objs)
+        dev_objs = list(filter(lambda d: d.name in devices, dev_objs))
+
+    # when the results store is available the device counts are obtained
+    # using a single aggregate query rather than loading each results file.
+
+    store_counts = _store_counts(store, dev_objs, optionals) if store else None
 
     for device in dev_objs:
         dev_cntrs.clear()
 
-        for check_svc in find_check_services(device, optionals):
-            # if the test results file does not exist, it means that the tests were
-            # not executed.  For now, silently skip.  TODO: may show User warning?
+        if store_counts is not None:
+            dev_cntrs.update(store_counts.get(device.name, {}))
 
-            tc_name = check_svc.get_name()
-            results_file = device.tcr_dir.joinpath(f"{tc_name}.json")
-            if not results_file.exists():
-                continue
+        # otherwise the counts are taken from the device results summary, and
+        # only the results files of the collections missing from the summary
+        # are loaded.
 
-            results = json.load(results_file.open())
+        else:
+            summary = results_summary_load(device.tcr_dir)
 
-            if not (results := filter_results(results=results, optionals=optionals)):
-                continue
-
-            tcr_cntrs = Counter(res["status"] for res in results)
-            dev_cntrs.update(tcr_cntrs)
+            for check_svc in find_check_services(device, optionals):
+                if tcr_cntrs := collection_status_counts(
+                    device.tcr_dir, check_svc.get_name(), summary, optionals
+                ):
+                    dev_cntrs.update(tcr_cntrs)
 
         dev_tc_counts = sum(dev_cntrs.values())
         design_tc_counts += dev_tc_counts
@@ -97,3 +106,19 @@ def show_design_summary_table(
     )
 
     console.print("\n", table, "\n")
+
+
+def _store_counts(store: CheckResultsStore, dev_objs, optionals: dict) -> dict:
+    collections = {
+        check_svc.get_name()
+        for device in dev_objs
+        for check_svc in find_check_services(device, optionals)
+    }
+
+    return store.count_results(
+        designs=list({device.design.name for device in dev_objs}),
+        collections=list(collections),
+        statuses=[str(status) for status in filter_status_allows(optionals)],
+        include_fields=optionals["include_fields"],
+        exclude_fields=optionals["exclude_fields"],
+    )
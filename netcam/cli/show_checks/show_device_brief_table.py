@@ -5,9 +5,7 @@
 # System Imports
 # -----------------------------------------------------------------------------
 
-import json
 from pathlib import Path
-from collections import Counter
 
 # -----------------------------------------------------------------------------
 # Public Imports
@@ -22,10 +20,11 @@ from rich.console import Console
 
 from netcad.device import Device
 from netcad.checks import CheckStatus
+from netcad.checks.check_results_summary import results_summary_load
 from netcad.cli.keywords import color_pass_fail
 
 from .find_check_services import find_check_services
-from .filter_results import filter_results
+from .filter_results import collection_status_counts
 
 
 def show_device_brief_table(console: Console, device: Device, optionals: dict):
@@ -44,22 +43,19 @@ def show_device_brief_table(console: Console, device: Device, optionals: dict):
         show_lines=True,
     )
 
+    # the status counts are taken from the device results summary rather than
+    # loading each of the results files.
+
+    summary = results_summary_load(tcr_dir)
+
     dev_tc_count = 0
     for check_svc in find_check_services(device, optionals):
-        # if the test results file does not exist, it means that the tests were
-        # not executed.  For now, silently skip.  TODO: may show User warning?
         tc_name = check_svc.get_name()
-
-        results_file = tcr_dir.joinpath(f"{tc_name}.json")
-        if not results_file.exists():
-            continue
-
-        results = json.load(results_file.open())
-
-        if not (results := filter_results(results=results, optionals=optionals)):
+        if not (
+            tcr_cntrs := collection_status_counts(tcr_dir, tc_name, summary, optionals)
+        ):
             continue
 
-        tcr_cntrs = Counter(res["status"] for res in results)
         tcr_total = sum(tcr_cntrs.values())
         dev_tc_count += tcr_total
 
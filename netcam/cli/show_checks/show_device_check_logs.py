@@ -5,8 +5,10 @@
 # System Imports
 # -----------------------------------------------------------------------------
 
+from typing import Optional
 from pathlib import Path
 import json
+import sys
 
 # -----------------------------------------------------------------------------
 # Public Imports
@@ -19,29 +21,104 @@ from rich.console import Console
 # -----------------------------------------------------------------------------
 
 from netcad.device import Device
+from netcad.checks import results_file_find
+from netcad.checks.check_results_store import CheckResultsStore
+from netcad.checks.check_results_query import ResultsQuery, results_query_file
 
 from .find_check_services import find_check_services
-from .filter_results import filter_results
+from .filter_results import filter_fields, filter_status_allows
 from .show_log_table import show_log_table
+from .report_export import ReportExport
 
 
-def show_device_test_logs(console: Console, device: Device, optionals: dict):
+def make_results_query(optionals: dict) -> ResultsQuery:
+    """
+    Returns the results query for the User `--where` expressions.  Unless the
+    User provides a status expression, the status is selected by the CLI
+    status flags.
+    """
+    where = optionals["where"]
+
+    if any(expr.partition("=")[0].strip() == "status" for expr in where):
+        return ResultsQuery.from_where(where)
+
+    return ResultsQuery.from_where(
+        where, status=[str(st) for st in filter_status_allows(optionals)]
+    )
+
+
+def show_device_test_logs(
+    console: Console,
+    device: Device,
+    optionals: dict,
+    query: ResultsQuery,
+    store: Optional[CheckResultsStore] = None,
+    export: Optional[ReportExport] = None,
+):
     tcr_dir: Path = device.tcr_dir
+    to_json = export and export.has_json
+    as_jsonl = optionals["output_format"] == "jsonl"
+
+    if not query.match("device", device.name):
+        return
+
+    # when the User provides query expressions the results store is not used
+    # since it only supports the status and field filters.
+
+    if optionals["where"]:
+        store = None
 
     for check_svc in find_check_services(device, optionals):
+        check_svc_name = check_svc.get_name()
+        if not query.match("collection", check_svc_name):
+            continue
+
+        # when the results store is available, only the matching results are
+        # read using the store indexes.  Otherwise only the matching results
+        # are read from the results file, using the results file index when
+        # available.
+
+        if store:
+            results = store.load_results(
+                design=device.design.name,
+                device=device.name,
+                collection=check_svc_name,
+                statuses=[str(st) for st in filter_status_allows(optionals)],
+                include_fields=optionals["include_fields"],
+                exclude_fields=optionals["exclude_fields"],
+            )
+            filename = check_svc_name
+
+        elif results_file := results_file_find(tcr_dir, check_svc_name):
+            results = filter_fields(
+                results_query_file(tcr_dir, check_svc_name, results_file, query),
+                optionals,
+            )
+            filename = results_file.name
+
         # if the test results file does not exist, it means that the tests were
         # not executed.  For now, silently skip.  TODO: may show User warning?
 
-        check_svc_name = check_svc.get_name()
-
-        results_file = tcr_dir.joinpath(f"{check_svc_name}.json")
-        if not results_file.exists():
+        else:
             continue
 
-        results = json.load(results_file.open())
+        # the results are streamed as JSON Lines, or displayed in a Table form,
+        # and written to the JSON report file if requested.
 
-        if not (results := filter_results(results=results, optionals=optionals)):
-            continue
+        if not as_jsonl:
+            if not (results := list(results)):
+                continue
+
+            show_log_table(console, device, filename, results)
+
+            if not to_json:
+                continue
+
+        for result in results:
+            result = dict(collection=check_svc_name, **result)
+
+            if as_jsonl:
+                sys.stdout.write(json.dumps(result) + "\n")
 
-        # display the results in a Table form.
-        show_log_table(console, device, results_file.name, results)
+            if to_json:
+                export.write_result(result)
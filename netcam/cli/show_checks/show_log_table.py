@@ -79,7 +79,7 @@ def _pretty_dict_table(obj):
         return table
 
     if isinstance(obj[0], list):
-        log_table = CheckResultLogs.parse_obj(obj)
+        log_table = CheckResultLogs.model_validate(obj)
         return log_table.pretty_table(table)
 
     return Pretty(obj)
@@ -22,6 +22,7 @@ import aiofiles.os
 # -----------------------------------------------------------------------------
 
 from netcad.device import Device
+from .session_pool import DeviceSessionsMixin
 
 # -----------------------------------------------------------------------------
 # Exports
@@ -30,7 +31,7 @@ from netcad.device import Device
 __all__ = ["AsyncDeviceConfigurable"]
 
 
-class DeviceConfigurable:
+class DeviceConfigurable(DeviceSessionsMixin):
     """
     Attributes
     ----------
@@ -298,8 +299,15 @@ class AsyncDeviceConfigurable(DeviceConfigurable):
         username, password = self._scp_creds
         dst_fp = dst_filename or self.config_file.name
 
-        async with asyncssh.connect(
-            host, username=username, password=password, known_hosts=None
+        # the SSH connection is pooled so that it can be reused by subsequent
+        # file copies to the same device.
+
+        async with self.pooled_session(
+            factory=lambda: asyncssh.connect(
+                host, username=username, password=password, known_hosts=None
+            ),
+            close=_ssh_close,
+            kind="ssh",
         ) as conn:
             await asyncssh.scp(self.config_file, (conn, dst_fp))
 
@@ -312,3 +320,15 @@ class AsyncDeviceConfigurable(DeviceConfigurable):
         be called during a "cleanup" process.
         """
         raise NotImplementedError()
+
+
+# -----------------------------------------------------------------------------
+#
+#                          PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+async def _ssh_close(conn: asyncssh.SSHClientConnection):
+    conn.close()
+    await conn.wait_closed()
@@ -5,10 +5,13 @@
 # System Imports
 # -----------------------------------------------------------------------------
 
-from typing import Optional, Dict
+from typing import Optional, Dict, Callable, Any
 from typing import TYPE_CHECKING
-from functools import singledispatchmethod
+from functools import singledispatchmethod, partial
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
 from pathlib import Path
+import asyncio
 import json
 from collections import Counter
 
@@ -24,6 +27,7 @@ import aiofiles
 
 from netcad.device import Device
 from netcad.checks import CheckCollection
+from .session_pool import DeviceSessionsMixin
 
 
 # -----------------------------------------------------------------------------
@@ -31,7 +35,14 @@ from netcad.checks import CheckCollection
 # -----------------------------------------------------------------------------
 
 
-__all__ = ["DeviceUnderTest", "AsyncDeviceUnderTest", "SetupError"]
+__all__ = [
+    "DeviceUnderTest",
+    "AsyncDeviceUnderTest",
+    "SetupError",
+    "cv_dut_threads",
+    "dut_call",
+    "dut_threads_shutdown",
+]
 
 
 # -----------------------------------------------------------------------------
@@ -48,7 +59,14 @@ class SetupError(RuntimeError):
     pass
 
 
-class _BaseDeviceUnderTest:
+class _BaseDeviceUnderTest(DeviceSessionsMixin):
+    # The number of check collections that the DUT can execute at the same
+    # time when the User enables concurrent checks.  The default is to execute
+    # one collection at a time; a plugin that supports multiple in-flight
+    # requests to the device can increase this value.
+
+    max_concurrent_checks: int = 1
+
     def __init__(self, *, device: Device):
         self.device = device
         self.testcases_dir: Optional[Path] = None
@@ -67,14 +85,33 @@ class _BaseDeviceUnderTest:
 
 
 class DeviceUnderTest(_BaseDeviceUnderTest):
+    """
+    The base class for plugins that use a blocking device API.  The methods
+    are executed on a bounded pool of threads, see `dut_call`, so that the
+    synchronous DUTs are checked concurrently with the asyncio DUTs.  A
+    synchronous DUT must not use the asyncio session pool.
+    """
+
     def setup(self):
-        raise NotImplementedError()
+        """
+        The default setup process is to load the "device info" testcases file;
+        see AsyncDeviceUnderTest.setup.
+        """
+        self.device_info = json.loads((self.testcases_dir / "device.json").read_text())
 
-    def execute_checks(self):
-        raise NotImplementedError()
+    @singledispatchmethod
+    def execute_checks(
+        self, testcases: CheckCollection
+    ) -> Optional["CheckResultsCollection"]:
+        """
+        The default testcase executor behavior will return None to indicate that
+        the underlying plugin does not support the specific test-cases.
+        """
+        return None
 
     def teardown(self):
-        raise NotImplementedError()
+        """There is no specific default behavior for the DUT teardown process"""
+        pass
 
 
 class AsyncDeviceUnderTest(_BaseDeviceUnderTest):
@@ -107,3 +144,66 @@ class AsyncDeviceUnderTest(_BaseDeviceUnderTest):
         resources that were created during the setup method.
         """
         pass
+
+
+# the maximum number of threads used to execute the synchronous DUT methods;
+# this bounds the number of blocking dut_call calls running at the same time,
+# across all devices, not the number of devices being checked.
+
+DEFAULT_MAX_DUT_THREADS = 32
+
+cv_dut_threads = ContextVar("dut_threads", default=DEFAULT_MAX_DUT_THREADS)
+
+
+async def dut_call(dut: _BaseDeviceUnderTest, method: Callable, *args) -> Any:
+    """
+    Call the DUT method, for example `dut.setup`, and return its result.  The
+    methods of a synchronous DUT are executed on the DUT thread pool, with a
+    copy of the current context, so that a blocking device API does not stall
+    the event loop.
+
+    Notes
+    -----
+    If the Caller cancels the call, for example on a deadline, the thread
+    continues to run the method until it returns.
+    """
+    if not isinstance(dut, DeviceUnderTest):
+        return await method(*args)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _dut_executor(), partial(copy_context().run, method, *args)
+    )
+
+
+def dut_threads_shutdown():
+    """
+    Shutdown the DUT thread pool; this is called at the end of a command run.
+    The methods still running, for example those that exceeded a deadline,
+    are not waited on so that the event loop is not blocked.
+    """
+    global _dut_threads
+
+    if _dut_threads:
+        _dut_threads.shutdown(wait=False, cancel_futures=True)
+        _dut_threads = None
+
+
+# -----------------------------------------------------------------------------
+#
+#                          PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+_dut_threads: Optional[ThreadPoolExecutor] = None
+
+
+def _dut_executor() -> ThreadPoolExecutor:
+    global _dut_threads
+
+    if not _dut_threads:
+        _dut_threads = ThreadPoolExecutor(
+            max_workers=cv_dut_threads.get(), thread_name_prefix="netcam-dut"
+        )
+
+    return _dut_threads
@@ -5,7 +5,11 @@
 # System Imports
 # -----------------------------------------------------------------------------
 
+import asyncio
+from typing import Iterator, List, Optional
 from collections import Counter
+from contextlib import nullcontext
+from functools import partial
 from logging import Logger
 from contextvars import ContextVar
 
@@ -18,15 +22,28 @@ from netcad.cli.keywords import markup_color
 from netcad.debug import debug_enabled, format_exc_message
 from netcam.dut import SetupError
 
-from netcad.checks import CheckStatus, CheckResult, Check
+from netcad.checks import CheckStatus, CheckResult, Check, CheckCollectionT
+from netcad.checks.check_results_summary import ResultsSummaryRecorder
+from netcad.checks.check_results_query import ResultsIndexRecorder
 from .save_check_results import device_checks_save_results
-from .dut import AsyncDeviceUnderTest
+from .rerun_checks import cv_rerun_select, rerun_plan, checks_digest_record
+from .timing import timing_span, TimingPhase
+from .dut import AsyncDeviceUnderTest, dut_call
 
 # -----------------------------------------------------------------------------
 # Exports
 # -----------------------------------------------------------------------------
 
-__all__ = ["execute_device_checks", "cv_check_list", "cv_service_list"]
+__all__ = [
+    "execute_device_checks",
+    "cv_check_list",
+    "cv_service_list",
+    "cv_setup_timeout",
+    "cv_execute_timeout",
+    "cv_concurrent_checks",
+    "cv_results_observer",
+    "cv_log_collections",
+]
 
 # -----------------------------------------------------------------------------
 #
@@ -37,6 +54,24 @@ __all__ = ["execute_device_checks", "cv_check_list", "cv_service_list"]
 cv_check_list = ContextVar("check_list")
 cv_service_list = ContextVar("service_list")
 
+# per-device deadlines, in seconds, for the DUT setup and for the execution of
+# all the device checks.  None means there is no deadline.
+cv_setup_timeout = ContextVar("setup_timeout", default=None)
+cv_execute_timeout = ContextVar("execute_timeout", default=None)
+
+# when True, the check collections of a single DUT are executed concurrently
+# bounded by the DUT `max_concurrent_checks` value.
+cv_concurrent_checks = ContextVar("concurrent_checks", default=False)
+
+# optional callable(dut, collection-name, result) that is called with each
+# check result as it is saved; used by the monitoring mode to track changes in
+# check status.
+cv_results_observer = ContextVar("results_observer", default=None)
+
+# when False, the status of each check collection is not logged; used by the
+# monitoring mode that reports only changes in check status.
+cv_log_collections = ContextVar("log_collections", default=True)
+
 
 PASS_CLRD = markup_color("PASS", "green")
 FAIL_CLRD = markup_color("FAIL", "red")
@@ -64,7 +99,24 @@ async def execute_device_checks(dut: AsyncDeviceUnderTest):
     log.info(f"{dut_name}: Starting Checks ...")
 
     try:
-        await dut.setup()
+        with timing_span(dev_name, TimingPhase.setup):
+            await asyncio.wait_for(
+                dut_call(dut, dut.setup), timeout=cv_setup_timeout.get()
+            )
+
+    except asyncio.TimeoutError:
+        log.error(
+            f"{dut_name}: {FAIL_CLRD}: Setup exceeded {cv_setup_timeout.get()}s deadline, aborting."
+        )
+
+        dut.result_counts["FAIL"] = 1
+        log.info(f"{dut_name}: {SUMMARY_CLRD} ----\tChecks: PASS=0, FAIL=1, INFO=0")
+
+        # the setup was cancelled part way, so the DUT is torn down to close
+        # any sessions it has already opened.
+
+        await dut_teardown(dut, log)
+        return
 
     except SetupError as exc:
         errmsg = str(exc) or exc.__class__.__name__
@@ -91,7 +143,18 @@ async def execute_device_checks(dut: AsyncDeviceUnderTest):
     # Execute all of the tests
     # -------------------------------------------------------------------------
 
-    await run_tests(dut, log)
+    try:
+        await asyncio.wait_for(run_tests(dut, log), timeout=cv_execute_timeout.get())
+
+    except asyncio.TimeoutError:
+        # the results of any check collections completed before the deadline
+        # have already been saved; the device is marked with a failure so the
+        # User knows the run is incomplete.
+
+        log.error(
+            f"{dut_name}: {FAIL_CLRD}: Checks exceeded {cv_execute_timeout.get()}s deadline, aborting."
+        )
+        dut.result_counts["FAIL"] += 1
 
     # -------------------------------------------------------------------------
     # Testing Epilogue
@@ -112,11 +175,7 @@ async def execute_device_checks(dut: AsyncDeviceUnderTest):
         f"{dut_name}: {SUMMARY_CLRD} {ttc:4}\tChecks: PASS={c_pass}, FAIL={c_fail}, INFO={c_info}, SKIP={c_skip}"
     )
 
-    try:
-        await dut.teardown()
-
-    except Exception as exc:
-        log.error(f"{dut_name}: Teardown failed: {exc}")
+    await dut_teardown(dut, log)
 
 
 # -----------------------------------------------------------------------------
@@ -126,10 +185,49 @@ async def execute_device_checks(dut: AsyncDeviceUnderTest):
 # -----------------------------------------------------------------------------
 
 
+async def dut_teardown(dut: AsyncDeviceUnderTest, log: Logger):
+    try:
+        with timing_span(dut.device.name, TimingPhase.teardown):
+            await dut_call(dut, dut.teardown)
+
+    except Exception as exc:
+        log.error(f"{dut.device.name:<16}: Teardown failed: {exc}")
+
+
 async def run_tests(dut: AsyncDeviceUnderTest, log: Logger):
+    check_collections = list(find_device_check_collections(dut))
+
+    # by default the check collections are executed one after the other.
+
+    if not cv_concurrent_checks.get():
+        for testing_service in check_collections:
+            await run_check_collection(dut, testing_service, log)
+        return
+
+    # otherwise, all of the check collections for the DUT are started at once
+    # so that loading the checks and saving the results overlaps with the
+    # device I/O of other collections.  The DUT execution itself is bounded by
+    # the number of concurrent check collections the plugin supports.
+
+    exec_limit = asyncio.Semaphore(dut.max_concurrent_checks)
+
+    await asyncio.gather(
+        *(
+            run_check_collection(dut, testing_service, log, exec_limit=exec_limit)
+            for testing_service in check_collections
+        )
+    )
+
+
+def find_device_check_collections(
+    dut: AsyncDeviceUnderTest,
+) -> Iterator[CheckCollectionT]:
+    """
+    Yields the check collections to be executed for the DUT based on the User
+    provided feature and check lists, and only those that have a checks file.
+    """
     device = dut.device
     dev_tc_dir = dut.testcases_dir
-    dut_name = f"{device.name:<16}"
 
     check_service_list = cv_check_list.get()
     service_list = cv_service_list.get()
@@ -166,85 +264,156 @@ async def run_tests(dut: AsyncDeviceUnderTest, log: Logger):
                 # leaving it out for now.
                 continue
 
-            testcases = await testing_service.load(testcase_dir=dev_tc_dir)
+            yield testing_service
 
-            if not len(testcases.checks):
-                # if the test file was generated with an empty set of tests,
-                # which could happen depending on the Developer of the testing
-                # service, then skill this and go onto the next one.
-                continue
 
-            try:
-                results = await dut.execute_checks(testcases)
-
-                # if the testing plugin returns None, then these tests are
-                # marked as "skipped"
-
-                if not results:
-                    results = [
-                        CheckResult[Check](
-                            device=device,
-                            status=CheckStatus.SKIP,
-                            check=Check(check_type="skip", expected_results={}),
-                            measurement=(
-                                f"Missing: device {device.name} support for "
-                                f"Checks: {tc_name}",
-                            ),
-                        )
-                    ]
-
-            except IndexError as exc:
-                tc_registry = dut.__class__.__dict__[
-                    "execute_checks"
-                ].dispatcher.registry
-                tc_type = type(testcases)
-                if not tc_registry.get(tc_type):
-                    log.error(
-                        f"{dut_name}: No DUT check processor for {tc_type.__name__}, skipping."
-                    )
-                    continue
-
-                raise exc
-
-            except Exception as exc:
-                import traceback
-
-                exc_info = traceback.format_tb(exc.__traceback__, -2)
-                trace_txt = "\n".join(exc_info)
-                log.critical(
-                    f"{dut_name}: Exception during exection: {repr(exc)}, aborting {tc_name}\n"
-                )
-                log.critical(f"{dut_name}: Trace: \n{trace_txt}")
-                continue
+async def run_check_collection(
+    dut: AsyncDeviceUnderTest,
+    testing_service: CheckCollectionT,
+    log: Logger,
+    exec_limit: Optional[asyncio.Semaphore] = None,
+):
+    device = dut.device
+    dev_tc_dir = dut.testcases_dir
+    dut_name = f"{device.name:<16}"
+    tc_name = testing_service.get_name()
+    tc_file = testing_service.filepath(testcase_dir=dev_tc_dir, service=tc_name)
+    dev_resuls_dir = dev_tc_dir / "results"
 
-            result_counts = Counter(r.status for r in results)
-            dut.result_counts.update(result_counts)
+    with timing_span(device.name, TimingPhase.load, tc_name):
+        testcases = await testing_service.load(testcase_dir=dev_tc_dir)
 
-            c_pass, c_fail, c_info, c_skip = (
-                result_counts[CheckStatus.PASS],
-                result_counts[CheckStatus.FAIL],
-                result_counts[CheckStatus.INFO],
-                result_counts[CheckStatus.SKIP],
-            )
+    if not len(testcases.checks):
+        # if the test file was generated with an empty set of tests,
+        # which could happen depending on the Developer of the testing
+        # service, then skill this and go onto the next one.
+        return
 
-            dev_resuls_dir = dev_tc_dir / "results"
-            dev_resuls_dir.mkdir(exist_ok=True)
+    # if the User only wants to re-run the failed or changed checks, then
+    # determine the subset of checks, if any, to execute using the previous
+    # results.
 
-            if c_fail:
-                log.warning(
-                    f"{dut_name}: {FAIL_CLRD}\tChecks: {tc_name}: "
-                    f"PASS={c_pass}, FAIL={c_fail}, INFO={c_info}",
-                )
-            elif c_skip:
-                log.info(
-                    f"{dut_name}: {SKIP_CLRD}\tChecks: {tc_name}",
-                )
-            else:
-                log.info(
-                    f"{dut_name}: {PASS_CLRD}\tChecks: {tc_name}: "
-                    f"PASS={c_pass}, INFO={c_info}",
-                )
+    plan = None
+
+    if rerun_select := cv_rerun_select.get():
+        plan = rerun_plan(
+            dev_resuls_dir, testing_service, testcases, tc_file, rerun_select
+        )
+        if plan and not plan.checks:
+            log.info(f"{dut_name}: {SKIP_CLRD}\tChecks: {tc_name}: no re-run")
+            return
 
-            await device_checks_save_results(
-                dut, tc_name, results, results_dir=dev_resuls_dir
+        if plan:
+            testcases.checks = plan.checks
+
+    try:
+        async with exec_limit or nullcontext():
+            with timing_span(device.name, TimingPhase.execute, tc_name):
+                results = await dut_call(dut, dut.execute_checks, testcases)
+
+        # if the testing plugin returns None, then these tests are
+        # marked as "skipped"
+
+        if not results:
+            results = [
+                CheckResult[Check](
+                    device=device,
+                    status=CheckStatus.SKIP,
+                    check=Check(check_type="skip", expected_results={}),
+                    measurement=(
+                        f"Missing: device {device.name} support for Checks: {tc_name}",
+                    ),
+                )
+            ]
+
+    except IndexError as exc:
+        tc_registry = dut.__class__.__dict__["execute_checks"].dispatcher.registry
+        tc_type = type(testcases)
+        if not tc_registry.get(tc_type):
+            log.error(
+                f"{dut_name}: No DUT check processor for {tc_type.__name__}, skipping."
             )
+            return
+
+        raise exc
+
+    except Exception as exc:
+        import traceback
+
+        exc_info = traceback.format_tb(exc.__traceback__, -2)
+        trace_txt = "\n".join(exc_info)
+        log.critical(
+            f"{dut_name}: Exception during exection: {repr(exc)}, aborting {tc_name}\n"
+        )
+        log.critical(f"{dut_name}: Trace: \n{trace_txt}")
+        return
+
+    result_counts = Counter(r.status for r in results)
+    dut.result_counts.update(result_counts)
+
+    c_pass, c_fail, c_info, c_skip = (
+        result_counts[CheckStatus.PASS],
+        result_counts[CheckStatus.FAIL],
+        result_counts[CheckStatus.INFO],
+        result_counts[CheckStatus.SKIP],
+    )
+
+    dev_resuls_dir.mkdir(exist_ok=True)
+
+    if not cv_log_collections.get():
+        pass
+    elif c_fail:
+        log.warning(
+            f"{dut_name}: {FAIL_CLRD}\tChecks: {tc_name}: "
+            f"PASS={c_pass}, FAIL={c_fail}, INFO={c_info}",
+        )
+    elif c_skip:
+        log.info(
+            f"{dut_name}: {SKIP_CLRD}\tChecks: {tc_name}",
+        )
+    else:
+        log.info(
+            f"{dut_name}: {PASS_CLRD}\tChecks: {tc_name}: PASS={c_pass}, INFO={c_info}",
+        )
+
+    # when only a subset of checks was executed, the previous results of the
+    # other checks are retained so the results file continues to reflect the
+    # complete check collection.
+
+    if plan:
+        results = list(map(testing_service.parse_result, plan.previous)) + results
+
+    # the sidecar records are built as each result is saved, and each result
+    # is released once it is written, so that the results of a large check
+    # collection are not all retained until the results file is complete.
+
+    summary, index = ResultsSummaryRecorder(), ResultsIndexRecorder()
+    recorders = [summary.add, index.add]
+
+    if observer := cv_results_observer.get():
+        recorders.append(partial(observer, dut, tc_name))
+
+    with timing_span(device.name, TimingPhase.save, tc_name):
+        results_file = await device_checks_save_results(
+            dut,
+            tc_name,
+            _release_results(results),
+            results_dir=dev_resuls_dir,
+            recorders=recorders,
+        )
+
+        # the sidecar files are written by threads so that the event loop
+        # continues with the other devices and check collections.
+
+        await asyncio.gather(
+            asyncio.to_thread(checks_digest_record, dev_resuls_dir, tc_name, tc_file),
+            asyncio.to_thread(summary.write, dev_resuls_dir, tc_name, results_file),
+            asyncio.to_thread(index.write, dev_resuls_dir, tc_name, results_file),
+        )
+
+
+def _release_results(results: List[CheckResult]) -> Iterator[CheckResult]:
+    # each result is removed from the list as it is consumed.
+    results.reverse()
+    while results:
+        yield results.pop()
@@ -0,0 +1,257 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+import asyncio
+import time
+from typing import Iterable, List, Dict, Tuple, Optional
+from collections import Counter
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.logger import get_logger
+from netcad.device import Device
+from netcad.checks import CheckResult, CheckStatus
+from netcad.checks.check_collection_cache import cv_checks_cache, checks_cache_clear
+from netcad.checks.check_results_store import CheckResultsStore
+from netcad.cli.keywords import markup_color
+from netcad.igather import as_completed
+
+from .dut import AsyncDeviceUnderTest, dut_call, dut_threads_shutdown
+from .execute_checks import (
+    run_tests,
+    cv_setup_timeout,
+    cv_execute_timeout,
+    cv_results_observer,
+    cv_log_collections,
+)
+from .run_checks import CheckRunOptions, get_device_duts
+from .save_check_results import cv_results_store
+from .schedule_checks import order_duts
+from .session_pool import get_session_pool
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["CheckTransitions", "monitor_device_checks"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+# key=(device-name, collection-name, check-id)
+CheckKeyT = Tuple[str, str, str]
+
+
+class CheckTransitions:
+    """
+    Tracks the PASS/FAIL status of each check across monitoring cycles so
+    that only the changes in status are reported.  A check is FAIL if any of
+    its results are FAIL, and PASS if any are PASS otherwise; the INFO and
+    SKIP results do not change the check status.
+    """
+
+    def __init__(self):
+        self.status: Dict[CheckKeyT, CheckStatus] = dict()
+        self.cycle: Dict[CheckKeyT, CheckStatus] = dict()
+
+    def observe(self, dut: AsyncDeviceUnderTest, collection: str, res: CheckResult):
+        """The results observer called as each check result is saved"""
+        if res.status not in (CheckStatus.PASS, CheckStatus.FAIL):
+            return
+
+        key = (dut.device.name, collection, res.check.check_id())
+        if self.cycle.get(key) != CheckStatus.FAIL:
+            self.cycle[key] = res.status
+
+    def end_cycle(self) -> List[Tuple[CheckKeyT, CheckStatus, CheckStatus]]:
+        """
+        Complete the cycle, returning the list of checks that changed status
+        since the previous cycle as (key, previous-status, status).  The first
+        time a check is observed is not a transition.
+        """
+        transitions = [
+            (key, prev, status)
+            for key, status in self.cycle.items()
+            if (prev := self.status.get(key)) and prev != status
+        ]
+
+        self.status.update(self.cycle)
+        self.cycle = dict()
+        return transitions
+
+
+async def monitor_device_checks(
+    options: CheckRunOptions,
+    device_objs: Iterable[Device],
+    interval: float,
+    cycles: Optional[int] = None,
+):
+    """
+    Execute the device checks every `interval` seconds, until cancelled or for
+    the given number of `cycles`.  The DUTs are set up once and their sessions
+    are kept for the duration of the monitoring; a DUT that fails setup is
+    retried on the next cycle.  The results files are written each cycle, and
+    only the checks that changed between PASS and FAIL are reported.
+    """
+    log = get_logger()
+    options.apply()
+
+    # the checks files are re-validated only when they change.
+    cv_checks_cache.set(True)
+
+    transitions = CheckTransitions()
+    cv_results_observer.set(transitions.observe)
+    cv_log_collections.set(False)
+
+    # the results store is kept up to date each cycle, as part of the run
+    # created by the Caller.
+
+    store = None
+    if options.store_run_id is not None:
+        store = CheckResultsStore(CheckResultsStore.db_path(options.checks_dir))
+        store.run_id = options.store_run_id
+        cv_results_store.set(store)
+
+    duts = list()
+    all_duts = get_device_duts(device_objs, options.checks_dir)
+
+    for dut in order_duts(all_duts, options.order):
+        if not dut.testcases_dir.is_dir():
+            log.error(
+                f"{dut.device.name:<16}:Missing expected checks directory: "
+                f"{dut.testcases_dir.absolute()}, skipping"
+            )
+            continue
+        duts.append(dut)
+
+    ready: Dict[AsyncDeviceUnderTest, bool] = dict()
+
+    log.info(f"Monitoring {len(duts)} devices, interval {interval}s.")
+
+    cycle = 0
+
+    try:
+        while cycles is None or cycle < cycles:
+            cycle += 1
+            ts_start = time.monotonic()
+
+            async for _ in as_completed(
+                (_monitor_dut(dut, ready) for dut in duts),
+                limit=options.max_concurrent,
+            ):
+                pass
+
+            _report_cycle(cycle, duts, transitions.end_cycle(), ts_start)
+
+            if cycles is not None and cycle >= cycles:
+                break
+
+            if (delay := interval - (time.monotonic() - ts_start)) < 0:
+                log.warning(
+                    f"Cycle {cycle} exceeded the interval by {-delay:.1f}s, "
+                    "starting next cycle now."
+                )
+
+            await asyncio.sleep(max(delay, 0))
+
+    finally:
+        for dut in (dut for dut, is_ready in ready.items() if is_ready):
+            try:
+                await dut_call(dut, dut.teardown)
+            except Exception as exc:
+                log.error(f"{dut.device.name}: Teardown failed: {exc}")
+
+        await get_session_pool().close()
+        dut_threads_shutdown()
+        checks_cache_clear()
+        if store:
+            store.close()
+
+
+# -----------------------------------------------------------------------------
+#
+#                          PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+PASS_CLRD = markup_color("PASS", "green")
+FAIL_CLRD = markup_color("FAIL", "red")
+
+
+async def _monitor_dut(dut: AsyncDeviceUnderTest, ready: Dict):
+    log = get_logger()
+    dut_name = f"{dut.device.name:<16}"
+    dut.result_counts.clear()
+
+    if not ready.get(dut):
+        try:
+            await asyncio.wait_for(
+                dut_call(dut, dut.setup), timeout=cv_setup_timeout.get()
+            )
+            ready[dut] = True
+
+        except Exception as exc:
+            errmsg = str(exc) or exc.__class__.__name__
+            log.error(
+                f"{dut_name}: {FAIL_CLRD}: Setup failed, retry next cycle: {errmsg}"
+            )
+            dut.result_counts[CheckStatus.FAIL] = 1
+            return
+
+    try:
+        await asyncio.wait_for(run_tests(dut, log), timeout=cv_execute_timeout.get())
+
+    except asyncio.TimeoutError:
+        log.error(
+            f"{dut_name}: {FAIL_CLRD}: Checks exceeded {cv_execute_timeout.get()}s deadline."
+        )
+        dut.result_counts[CheckStatus.FAIL] += 1
+
+    # if the checks fail unexpectedly, for example the device session was
+    # lost, then the DUT is setup again on the next cycle.
+
+    except Exception as exc:
+        errmsg = str(exc) or exc.__class__.__name__
+        log.error(f"{dut_name}: {FAIL_CLRD}: Checks failed: {errmsg}")
+        dut.result_counts[CheckStatus.FAIL] += 1
+        ready[dut] = False
+
+        try:
+            await dut_call(dut, dut.teardown)
+        except Exception:  # noqa
+            pass
+
+
+def _report_cycle(
+    cycle: int,
+    duts: List[AsyncDeviceUnderTest],
+    transitions: List[Tuple[CheckKeyT, CheckStatus, CheckStatus]],
+    ts_start: float,
+):
+    log = get_logger()
+
+    for (dev_name, collection, check_id), prev, status in sorted(transitions):
+        msg = f"{dev_name:<16}: {collection}: {check_id}: {prev} -> {status}"
+        if status == CheckStatus.FAIL:
+            log.warning(f"{FAIL_CLRD} {msg}")
+        else:
+            log.info(f"{PASS_CLRD} {msg}")
+
+    totals = Counter()
+    for dut in duts:
+        totals.update(dut.result_counts)
+
+    log.info(
+        f"Cycle {cycle}: {len(duts)} devices, PASS={totals[CheckStatus.PASS]}, "
+        f"FAIL={totals[CheckStatus.FAIL]}, transitions={len(transitions)}, "
+        f"duration {time.monotonic() - ts_start:.1f}s"
+    )
@@ -0,0 +1,74 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The replay netcam plugin answers the device checks from previously recorded
+results, with a simulated device latency, so that the check execution can be
+exercised without access to the network devices.  The plugin is configured in
+the netcad configuration file like any other netcam plugin, for example:
+
+    [[netcam.plugins]]
+        name = "replay"
+        package = "netcam.replay"
+        supports = ["eos", "nxos"]
+        features = ["topology"]
+
+        [netcam.plugins.config]
+            fixtures_dir = "$PROJECT_DIR/fixtures"
+            latency = 0.05
+            jitter = 0.02
+"""
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad import __version__ as plugin_version  # noqa
+from netcad.device import Device
+
+# -----------------------------------------------------------------------------
+# Private Module Imports
+# -----------------------------------------------------------------------------
+
+from .replay_dut import ReplayDeviceUnderTest, ReplayConfig, record_fixtures
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    "ReplayDeviceUnderTest",
+    "ReplayConfig",
+    "record_fixtures",
+    "plugin_version",
+    "plugin_init",
+    "plugin_get_dut",
+    "plugin_get_dcfg",
+]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+plugin_description = "Replays recorded check results, for testing without devices"
+
+_replay_config = ReplayConfig()
+
+
+def plugin_init(config: dict):
+    """Initialize the replay options from the plugin "config" table"""
+    global _replay_config
+    _replay_config = ReplayConfig.from_dict(config.get("config") or {})
+
+
+def plugin_get_dut(device: Device) -> ReplayDeviceUnderTest:
+    """Returns the replay DUT instance for the device"""
+    return ReplayDeviceUnderTest(device=device, config=_replay_config)
+
+
+# noinspection PyUnusedLocal
+def plugin_get_dcfg(device: Device):
+    """The replay plugin does not support device configuration"""
+    return None
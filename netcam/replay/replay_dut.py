@@ -0,0 +1,260 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+import os
+import json
+import random
+import asyncio
+import shutil
+from typing import Optional, Dict, List
+from dataclasses import dataclass
+from functools import singledispatchmethod
+from collections import defaultdict
+from pathlib import Path
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+from pydantic import BaseModel
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.device import Device
+from netcad.checks import (
+    Check,
+    CheckCollection,
+    CheckResult,
+    CheckResultsFormat,
+    results_file_find,
+    results_file_load,
+)
+
+from netcam.dut import AsyncDeviceUnderTest
+from netcad.checks.check_results_summary import RESULTS_SUMMARY_FILENAME
+from netcam.rerun_checks import CHECKS_DIGEST_FILENAME
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["ReplayConfig", "ReplayDeviceUnderTest", "record_fixtures"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+@dataclass
+class ReplayConfig:
+    """
+    The replay plugin options.
+
+    Attributes
+    ----------
+    fixtures_dir: optional
+        The directory of recorded results, one subdirectory per device using
+        the same layout as the device "results" directory; see
+        `record_fixtures`.  Checks without a recorded result are answered
+        with a measurement equal to the expected values, that is a PASS.
+
+    latency:
+        The simulated device response time, in seconds, for each check
+        collection.
+
+    jitter:
+        The latency is varied by a random amount, in seconds, up to this value
+        in either direction.
+
+    setup_latency:
+        The simulated device login time, in seconds.
+
+    seed: optional
+        When provided, the random jitter is repeatable for each device.
+    """
+
+    fixtures_dir: Optional[Path] = None
+    latency: float = 0.0
+    jitter: float = 0.0
+    setup_latency: float = 0.0
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, config: dict) -> "ReplayConfig":
+        """Returns the options from the plugin configuration table"""
+        fixtures_dir = config.get("fixtures_dir")
+
+        return cls(
+            fixtures_dir=Path(os.path.expandvars(fixtures_dir))
+            if fixtures_dir
+            else None,
+            latency=float(config.get("latency", 0.0)),
+            jitter=float(config.get("jitter", 0.0)),
+            setup_latency=float(config.get("setup_latency", 0.0)),
+            seed=config.get("seed"),
+        )
+
+
+class ReplayDeviceUnderTest(AsyncDeviceUnderTest):
+    """
+    The replay DUT answers any check collection from the recorded results of
+    the device, after waiting the configured latency, rather than
+    communicating with the device.
+    """
+
+    def __init__(self, *, device: Device, config: Optional[ReplayConfig] = None):
+        super().__init__(device=device)
+        self.config = config or ReplayConfig()
+        self._random = random.Random(
+            f"{self.config.seed}:{device.name}"
+            if self.config.seed is not None
+            else None
+        )
+
+        # the recorded result payloads, by check collection name, and then by
+        # check-id.
+
+        self._fixtures: Dict[str, Dict[str, List[dict]]] = dict()
+
+    async def setup(self):
+        """
+        Simulate the device login.  The "device info" file is loaded when it
+        exists so that the replay DUT can be used with checks directories
+        that were not generated from a design.
+        """
+        await self._delay(self.config.setup_latency)
+
+        if (dev_info_file := self.testcases_dir / "device.json").exists():
+            self.device_info = json.loads(dev_info_file.read_text())
+
+    @singledispatchmethod
+    async def execute_checks(
+        self, testcases: CheckCollection
+    ) -> Optional[List[CheckResult]]:
+        """
+        Returns the recorded results for the checks in the collection.  Since
+        the checks may have been filtered, for example when re-running only
+        the failed checks, only the recorded results of the given checks are
+        returned.
+        """
+        await self._delay(self.config.latency)
+
+        recorded = self._recorded(testcases)
+        results = list()
+        check_ids = set()
+
+        for check in testcases.checks:
+            check_ids.add(check_id := check.check_id())
+
+            if payloads := recorded.get(check_id):
+                results.extend(map(testcases.parse_result, payloads))
+            elif result := self._synthesize(testcases, check):
+                results.append(result)
+
+        # the results of the exclusive checks, those for items not in the
+        # checks list, do not correspond to a specific check.
+
+        if testcases.exclusive:
+            for check_id, payloads in recorded.items():
+                if check_id not in check_ids:
+                    results.extend(map(testcases.parse_result, payloads))
+
+        return results
+
+    # -------------------------------------------------------------------------
+    #                             Private Methods
+    # -------------------------------------------------------------------------
+
+    async def _delay(self, latency: float):
+        jitter = self.config.jitter
+        if latency <= 0 and jitter <= 0:
+            return
+
+        await asyncio.sleep(max(0.0, latency + self._random.uniform(-jitter, jitter)))
+
+    def _recorded(self, testcases: CheckCollection) -> Dict[str, List[dict]]:
+        name = testcases.get_name()
+
+        if (recorded := self._fixtures.get(name)) is not None:
+            return recorded
+
+        recorded = self._fixtures[name] = defaultdict(list)
+
+        if not (fixtures_dir := self.config.fixtures_dir):
+            return recorded
+
+        if results_file := results_file_find(fixtures_dir / self.device.name, name):
+            for payload in results_file_load(results_file):
+                # results files written before the check_id was recorded in
+                # the payload require parsing the check.
+                if not (check_id := payload.get("check_id")):
+                    check_id = testcases.parse_result(payload).check.check_id()
+
+                recorded[check_id].append(payload)
+
+        return recorded
+
+    def _synthesize(
+        self, testcases: CheckCollection, check: Check
+    ) -> Optional[CheckResult]:
+        # the result is measured as if the device state matches the expected
+        # values, so that the measure processing is included in the replay.
+
+        if not (res_cls := testcases._check_results_type_map.get(check.check_type)):
+            return None
+
+        result = res_cls(device=self.device.name, check=check)
+        msrd, expd = result.measurement, check.expected_results
+
+        if not isinstance(msrd, BaseModel) or not isinstance(expd, BaseModel):
+            return result
+
+        for field in type(expd).model_fields.keys() & type(msrd).model_fields.keys():
+            setattr(msrd, field, getattr(expd, field))
+
+        return result.measure()
+
+
+def record_fixtures(checks_dir: Path, fixtures_dir: Path) -> int:
+    """
+    Copy the device results files from a `netcam check` run into the replay
+    fixtures directory, one subdirectory per device.
+
+    Parameters
+    ----------
+    checks_dir:
+        The parent directory of the design/device checks.
+
+    fixtures_dir:
+        The replay plugin fixtures directory.
+
+    Returns
+    -------
+    The number of devices recorded.
+    """
+    suffixes = tuple(fmt.suffix for fmt in CheckResultsFormat)
+    sidecars = (CHECKS_DIGEST_FILENAME, RESULTS_SUMMARY_FILENAME)
+    count = 0
+
+    for results_dir in sorted(checks_dir.glob("*/*/results")):
+        dev_fixtures_dir = fixtures_dir / results_dir.parent.name
+        dev_fixtures_dir.mkdir(parents=True, exist_ok=True)
+
+        for results_file in results_dir.iterdir():
+            if (
+                results_file.name.endswith(suffixes)
+                and results_file.name not in sidecars
+            ):
+                shutil.copy2(results_file, dev_fixtures_dir / results_file.name)
+
+        count += 1
+
+    return count
@@ -0,0 +1,222 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, List, FrozenSet
+from dataclasses import dataclass, field
+from contextvars import ContextVar
+from pathlib import Path
+from enum import auto
+import threading
+import hashlib
+import json
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.helpers import StrEnum
+from netcad.checks import (
+    CheckCollection,
+    CheckCollectionT,
+    CheckStatus,
+    results_file_find,
+    results_file_load,
+)
+from netcad.checks.check_results_file import CHECKS_DIGEST_FILENAME
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    "RerunSelect",
+    "RerunPlan",
+    "cv_rerun_select",
+    "rerun_plan",
+    "checks_digest_record",
+]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+# noinspection PyArgumentList
+class RerunSelect(StrEnum):
+    """
+    The criteria used to select which check collections are executed when the
+    User does not want to re-execute all of them.
+    """
+
+    # only the checks that failed in the previous run.
+    failed = auto()
+
+    # only the check collections whose checks file changed since the previous
+    # run.
+    changed = auto()
+
+
+# the set of RerunSelect criteria; an empty set means all checks are executed.
+cv_rerun_select: ContextVar[FrozenSet[RerunSelect]] = ContextVar(
+    "rerun_select", default=frozenset()
+)
+
+
+@dataclass
+class RerunPlan:
+    """
+    The result of selecting the checks to re-execute for a check collection.
+
+    Attributes
+    ----------
+    checks:
+        The checks that should be executed; empty if there is nothing to do.
+
+    previous:
+        The previous result payloads for the checks that are not executed.
+        These are merged with the new results so that the results file
+        continues to reflect the complete check collection.
+    """
+
+    checks: list
+    previous: List[dict] = field(default_factory=list)
+
+
+def rerun_plan(
+    results_dir: Path,
+    testing_service: CheckCollectionT,
+    testcases: CheckCollection,
+    checks_file: Path,
+    select: FrozenSet[RerunSelect],
+) -> Optional[RerunPlan]:
+    """
+    Determine which checks of the collection should be executed for the given
+    re-run criteria.
+
+    Returns
+    -------
+    None when the complete check collection should be executed; which is
+    always the case when there are no previous results.  Otherwise the
+    RerunPlan for the subset of checks.
+    """
+    tc_name = testing_service.get_name()
+
+    if not (results_file := results_file_find(results_dir, tc_name)):
+        return None
+
+    if RerunSelect.changed in select and _checks_file_changed(
+        results_dir, tc_name, checks_file
+    ):
+        return None
+
+    if RerunSelect.failed not in select:
+        return RerunPlan(checks=[])
+
+    prev_results = list(results_file_load(results_file))
+
+    # results files written before the check_id was recorded in the payload
+    # cannot be matched to the checks, so execute the complete collection.
+
+    if not all("check_id" in res for res in prev_results):
+        return None
+
+    failed_ids = {
+        res["check_id"] for res in prev_results if res["status"] == CheckStatus.FAIL
+    }
+
+    # the checks added since the previous run have no results, so these are
+    # executed along with the failed checks.  The previous results of checks
+    # no longer in the collection are not retained.
+
+    check_ids = {chk.check_id() for chk in testcases.checks}
+    new_ids = check_ids - {res["check_id"] for res in prev_results}
+    run_ids = failed_ids | new_ids
+
+    if not run_ids & check_ids:
+        return RerunPlan(checks=[])
+
+    # an exclusive check collection reports on items found on the device that
+    # are not in the checks; executing a subset would report the other checks
+    # as unexpected.  Re-execute the complete collection instead.
+
+    if testcases.exclusive:
+        return None
+
+    keep_ids = check_ids - run_ids
+
+    return RerunPlan(
+        checks=[chk for chk in testcases.checks if chk.check_id() in run_ids],
+        previous=[res for res in prev_results if res["check_id"] in keep_ids],
+    )
+
+
+def checks_digest_record(results_dir: Path, tc_name: str, checks_file: Path):
+    """
+    Record the digest of the checks file that was used to produce the results
+    for the check collection so that a later `--changed-only` run can
+    determine if the checks have since changed.
+    """
+    with _checks_digest_lock:
+        digests = _checks_digest_load(results_dir)
+        digests[tc_name] = _checks_file_digest(checks_file, digests.get(tc_name))
+        _checks_digest_file(results_dir).write_text(json.dumps(digests, indent=3))
+
+
+# -----------------------------------------------------------------------------
+#
+#                          PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+# the digest file is shared by the check collections of the device, which may
+# be recorded at the same time by the threads of a concurrent run.
+
+_checks_digest_lock = threading.Lock()
+
+
+def _checks_digest_file(results_dir: Path) -> Path:
+    return results_dir / CHECKS_DIGEST_FILENAME
+
+
+def _checks_digest_load(results_dir: Path) -> dict:
+    if not (digest_file := _checks_digest_file(results_dir)).exists():
+        return dict()
+
+    try:
+        return json.loads(digest_file.read_text())
+    except json.JSONDecodeError:
+        return dict()
+
+
+def _checks_file_digest(checks_file: Path, recorded: Optional[dict]) -> dict:
+    """
+    Returns the digest record of the checks file.  The file content hash is
+    only computed when the file stat is different from the recorded one.
+    """
+    st = checks_file.stat()
+    digest = dict(mtime_ns=st.st_mtime_ns, size=st.st_size)
+
+    if recorded and all(recorded.get(key) == value for key, value in digest.items()):
+        digest["sha256"] = recorded["sha256"]
+    else:
+        digest["sha256"] = hashlib.sha256(checks_file.read_bytes()).hexdigest()
+
+    return digest
+
+
+def _checks_file_changed(results_dir: Path, tc_name: str, checks_file: Path) -> bool:
+    # when there is no recorded digest, the checks are treated as changed.
+    # The `netcad build checks` command re-writes all files, so the content
+    # hash is used to determine if the checks actually changed.
+
+    if not (recorded := _checks_digest_load(results_dir).get(tc_name)):
+        return True
+
+    return _checks_file_digest(checks_file, recorded)["sha256"] != recorded["sha256"]
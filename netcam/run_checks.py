@@ -0,0 +1,187 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Iterable, List, Optional, Tuple, FrozenSet, AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.config import netcad_globals
+from netcad.logger import get_logger
+from netcad.device import Device
+from netcad.checks import CheckResultsFormat
+from netcad.checks.check_results_store import CheckResultsStore
+from netcad.checks.check_result_log import cv_log_pass
+from netcad.checks.check_file_compression import FileCompression, cv_file_compression
+
+from .dut import (
+    AsyncDeviceUnderTest,
+    cv_dut_threads,
+    dut_threads_shutdown,
+    DEFAULT_MAX_DUT_THREADS,
+)
+from .session_pool import get_session_pool
+from .execute_checks import (
+    cv_check_list,
+    cv_service_list,
+    cv_setup_timeout,
+    cv_execute_timeout,
+    cv_concurrent_checks,
+)
+from .save_check_results import cv_results_format, cv_results_store
+from .rerun_checks import cv_rerun_select, RerunSelect
+from .schedule_checks import (
+    schedule_device_checks,
+    DeviceCheckOrder,
+    DEFAULT_MAX_CONCURRENT_DEVICES,
+)
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["CheckRunOptions", "get_device_duts", "run_device_checks"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+@dataclass
+class CheckRunOptions:
+    """
+    The `netcam check` options that control the execution of the device
+    checks.  The options are kept together so that they can be handed to a
+    worker process, see shard_checks.
+
+    Attributes
+    ----------
+    checks_dir:
+        The parent directory of the design/device checks.
+
+    store_run_id: optional
+        When the results store is enabled, the run ID created by the Caller;
+        the results of all devices are recorded as part of this run.
+
+    timing:
+        When True, the timing spans of the run are recorded; see timing.
+
+    max_threads:
+        The number of threads used to execute the synchronous DUT plugins.
+
+    log_pass:
+        When True, the PASS log entries are written to the results files with
+        the measured values.
+
+    compression:
+        The compression of the results files, from the netcad.toml
+        configuration.
+    """
+
+    checks_dir: Path
+    check_list: Tuple[str, ...] = ()
+    service_list: Tuple[str, ...] = ()
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT_DEVICES
+    order: DeviceCheckOrder = DeviceCheckOrder.name
+    setup_timeout: Optional[float] = None
+    execute_timeout: Optional[float] = None
+    concurrent_checks: bool = False
+    results_format: CheckResultsFormat = CheckResultsFormat.json
+    rerun_select: FrozenSet[RerunSelect] = frozenset()
+    store_run_id: Optional[int] = None
+    timing: bool = False
+    max_threads: int = DEFAULT_MAX_DUT_THREADS
+    log_pass: bool = False
+    compression: FileCompression = FileCompression.none
+
+    def apply(self):
+        """Set the context variables used by the device checks execution"""
+        cv_check_list.set(self.check_list)
+        cv_service_list.set(self.service_list)
+        cv_setup_timeout.set(self.setup_timeout)
+        cv_execute_timeout.set(self.execute_timeout)
+        cv_concurrent_checks.set(self.concurrent_checks)
+        cv_results_format.set(self.results_format)
+        cv_rerun_select.set(self.rerun_select)
+        cv_dut_threads.set(self.max_threads)
+        cv_log_pass.set(self.log_pass)
+        cv_file_compression.set(self.compression)
+
+
+def get_device_duts(
+    device_objs: Iterable[Device], checks_dir: Path
+) -> List[AsyncDeviceUnderTest]:
+    """
+    Create the device-under-test (DUT) instances for each of the devices using
+    the netcam plugin for the device OS.  Devices without plugin support are
+    skipped.
+    """
+    log = get_logger()
+    netcam_plugins = netcad_globals.g_netcam_plugins_os_catalog
+    duts = list()
+
+    for dev_obj in device_objs:
+        if not (pg_obj := netcam_plugins.get(dev_obj.os_name)):
+            log.error(
+                f"Missing testing plugin for {dev_obj.name}: os-name: {dev_obj.os_name}, skipping."
+            )
+            continue
+
+        if not (dut_obj := pg_obj.module.plugin_get_dut(device=dev_obj)):
+            log.warning(f"Missing DUT support for device: {dev_obj.name}, skipping.")
+            continue
+
+        # the device checks directory is subdir under the design name.
+        dut_obj.testcases_dir = checks_dir / dev_obj.design.name / dev_obj.name
+        duts.append(dut_obj)
+
+    return duts
+
+
+async def run_device_checks(
+    options: CheckRunOptions, device_objs: Iterable[Device]
+) -> AsyncIterator[AsyncDeviceUnderTest]:
+    """
+    Execute the checks for the devices using the given options, yielding each
+    DUT as its checks complete.
+    """
+    log = get_logger()
+    options.apply()
+
+    store = None
+    if options.store_run_id is not None:
+        store = CheckResultsStore(CheckResultsStore.db_path(options.checks_dir))
+        store.run_id = options.store_run_id
+        cv_results_store.set(store)
+
+    duts = get_device_duts(device_objs, options.checks_dir)
+
+    log.info(
+        f"Starting tests for {len(duts)} devices, max-concurrent {options.max_concurrent}."
+    )
+
+    # execute the tests concurrently to minimize the time it takes to run
+    # through all the tests, but bounded so that we do not open a session
+    # to every device at once.  The synchronous DUT plugins are executed on
+    # a thread pool; see dut_call.
+
+    try:
+        async for dut in schedule_device_checks(
+            duts, max_concurrent=options.max_concurrent, order=options.order
+        ):
+            yield dut
+
+    finally:
+        await get_session_pool().close()
+        dut_threads_shutdown()
+        if store:
+            store.close()
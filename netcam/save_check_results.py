@@ -6,8 +6,9 @@
 # -----------------------------------------------------------------------------
 
 import json
-from typing import List
+from typing import Callable, Iterable, List, Iterator, Optional, Sequence
 from pathlib import Path
+from contextvars import ContextVar
 
 
 # -----------------------------------------------------------------------------
@@ -20,24 +21,43 @@ import aiofiles
 # Private Imports
 # -----------------------------------------------------------------------------
 
-from netcad.checks import CheckResult
+from netcad.checks import CheckResult, CheckResultsFormat
+from netcad.checks.check_results_file import results_file_write
+from netcad.checks.check_file_compression import (
+    FileCompression,
+    cv_file_compression,
+    file_compress,
+)
+from netcad.checks.check_results_store import CheckResultsStore, ResultsStoreRow
+from netcad.checks.check_result_log import RESULTS_FILE_CONTEXT
 from .dut import AsyncDeviceUnderTest
 
 # -----------------------------------------------------------------------------
 # Exports
 # -----------------------------------------------------------------------------
 
-__all__ = ["device_checks_save_results"]
+__all__ = ["device_checks_save_results", "cv_results_format", "cv_results_store"]
+
+
+# the format used to write the results files, see CheckResultsFormat.  The
+# format is combined with the configured file compression, if any.
+cv_results_format = ContextVar("results_format", default=CheckResultsFormat.json)
+
+# the results store, when enabled, that is updated in addition to the results
+# files.
+cv_results_store = ContextVar("results_store", default=None)
 
 
 async def device_checks_save_results(
     dut: AsyncDeviceUnderTest,
     filename: str,
-    results: List[CheckResult],
+    results: Iterable[CheckResult],
     results_dir: Path,
-):
+    recorders: Sequence[Callable[[CheckResult], None]] = (),
+) -> Path:
     """
     This function saves the testcase results to a JSON file.
+
     Parameters
     ----------
     dut:
@@ -47,20 +67,119 @@ async def device_checks_save_results(
         The name of the JSON file to save, without the .json extension.
 
     results:
-        The list of testcase results.
+        The testcase results, iterated once.  The Caller can release each
+        result as it is consumed so that the results are not retained once
+        they are written.
 
     results_dir:
         The Path instance where the JSON file will be stored to the filesystem.
 
+    recorders:
+        The callables that are called with each result as it is saved, used
+        to build the records of the results, for example the results summary,
+        without retaining the results.
+
+    Returns
+    -------
+    The Path of the results file.
     """
-    results_file = results_dir / f"{filename}.json"
+    results_format = cv_results_format.get().with_compression(cv_file_compression.get())
+    store: Optional[CheckResultsStore] = cv_results_store.get()
+    store_rows = list() if store else None
+
+    # the streaming formats serialize each result directly to JSON as the
+    # file is written, rather than building the complete payload in memory.
+
+    if results_format.is_jsonl:
+        results_file = await results_file_write(
+            results_dir,
+            filename,
+            payloads=_results_json_lines(dut, results, store_rows, recorders),
+            results_format=results_format,
+        )
+        _store_save(store, dut, filename, store_rows)
+        return results_file
+
+    results_file = results_dir / f"{filename}{results_format.suffix}"
     json_payload = list()
 
     for res in results:
         res.device = dut.device.name
-        payload = res.model_dump(warnings="none")
+        payload = res.model_dump(warnings="none", context=RESULTS_FILE_CONTEXT)
         payload["check_id"] = res.check.check_id()
         json_payload.append(payload)
 
-    async with aiofiles.open(results_file, "w+") as ofile:
-        await ofile.write(json.dumps(json_payload, indent=3))
+        if store_rows is not None:
+            store_rows.append(_store_row(res, json.dumps(payload)))
+
+        for record in recorders:
+            record(res)
+
+    # the uncompressed results files are indented for the benefit of the User
+    # reading them.
+
+    compression = results_format.compression
+    indent = 3 if compression == FileCompression.none else None
+    content = json.dumps(json_payload, indent=indent).encode()
+
+    async with aiofiles.open(results_file, "wb") as ofile:
+        await ofile.write(file_compress(content, compression))
+
+    for fmt in CheckResultsFormat:
+        if fmt != results_format:
+            results_dir.joinpath(f"{filename}{fmt.suffix}").unlink(missing_ok=True)
+
+    _store_save(store, dut, filename, store_rows)
+    return results_file
+
+
+# -----------------------------------------------------------------------------
+#
+#                            PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def _results_json_lines(
+    dut: AsyncDeviceUnderTest,
+    results: Iterable[CheckResult],
+    store_rows: Optional[List[ResultsStoreRow]],
+    recorders: Sequence[Callable[[CheckResult], None]],
+) -> Iterator[str]:
+    dev_name = dut.device.name
+
+    for res in results:
+        res.device = dev_name
+        res.check_id = res.check.check_id()
+        payload = res.model_dump_json(warnings="none", context=RESULTS_FILE_CONTEXT)
+
+        if store_rows is not None:
+            store_rows.append(_store_row(res, payload))
+
+        for record in recorders:
+            record(res)
+
+        yield payload
+
+
+def _store_row(res: CheckResult, payload: str) -> ResultsStoreRow:
+    return (
+        res.check.check_type,
+        res.check.check_id(),
+        str(res.status),
+        res.field,
+        payload,
+    )
+
+
+def _store_save(
+    store: Optional[CheckResultsStore],
+    dut: AsyncDeviceUnderTest,
+    collection: str,
+    store_rows: Optional[List[ResultsStoreRow]],
+):
+    if not store:
+        return
+
+    device = dut.device
+    store.save_results(device.design.name, device.name, collection, store_rows)
@@ -0,0 +1,132 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Iterable, List, AsyncIterator
+from pathlib import Path
+from enum import auto
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.helpers import StrEnum
+from netcad.igather import as_completed
+
+from .execute_checks import execute_device_checks
+from .timing import timing_span, TimingPhase
+from .dut import AsyncDeviceUnderTest
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    "DeviceCheckOrder",
+    "order_duts",
+    "schedule_device_checks",
+    "checks_dir_size",
+]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+DEFAULT_MAX_CONCURRENT_DEVICES = 100
+
+
+# noinspection PyArgumentList
+class DeviceCheckOrder(StrEnum):
+    """
+    The ordering policies used to determine which devices are started first
+    when the number of devices exceeds the max-concurrent limit.
+    """
+
+    # by device hostname, the same "eye sorting" used by the summary table.
+    name = auto()
+
+    # grouped by design name, then by hostname.
+    design = auto()
+
+    # largest set of checks first, so that the long-running devices are not
+    # started last and become the tail of the run.
+    largest = auto()
+
+
+def order_duts(
+    duts: Iterable[AsyncDeviceUnderTest], order: DeviceCheckOrder
+) -> List[AsyncDeviceUnderTest]:
+    """
+    Return the list of DUTs in the order they should be scheduled.
+
+    Parameters
+    ----------
+    duts:
+        The DUT instances to schedule.
+
+    order:
+        The ordering policy.
+    """
+    match DeviceCheckOrder(order):
+        case DeviceCheckOrder.design:
+            return sorted(duts, key=lambda d: (d.device.design.name, d.device.name))
+
+        case DeviceCheckOrder.largest:
+            return sorted(
+                duts, key=lambda d: (-checks_dir_size(d.testcases_dir), d.device.name)
+            )
+
+        case _:
+            return sorted(duts)
+
+
+async def schedule_device_checks(
+    duts: Iterable[AsyncDeviceUnderTest],
+    max_concurrent: int | None = None,
+    order: DeviceCheckOrder = DeviceCheckOrder.name,
+) -> AsyncIterator[AsyncDeviceUnderTest]:
+    """
+    Execute the device checks for each of the DUTs with no more than
+    `max_concurrent` devices in progress at any given time.  Each DUT is
+    yielded as soon as its checks complete so that the Caller can process the
+    results incrementally rather than waiting on the slowest device.
+
+    Parameters
+    ----------
+    duts:
+        The DUT instances to execute.
+
+    max_concurrent: optional
+        The maximum number of devices that are checked concurrently.
+
+    order: optional
+        The policy used to order the devices before scheduling.
+    """
+
+    async def run_dut(_dut):
+        with timing_span(_dut.device.name, TimingPhase.device):
+            await execute_device_checks(_dut)
+        return _dut
+
+    async for _, dut in as_completed(
+        map(run_dut, order_duts(duts, order)),
+        limit=max_concurrent or DEFAULT_MAX_CONCURRENT_DEVICES,
+    ):
+        yield dut
+
+
+def checks_dir_size(tc_dir: Path | None) -> int:
+    """
+    Use the total size of the device checks files as the measure of how much
+    work there is for the device.  If the checks directory does not exist, the
+    device will fail quickly anyway, so it sorts last.
+    """
+    if not tc_dir or not tc_dir.is_dir():
+        return 0
+
+    return sum(each.stat().st_size for each in tc_dir.iterdir() if each.is_file())
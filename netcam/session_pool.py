@@ -0,0 +1,271 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+import asyncio
+import inspect
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+from typing import TYPE_CHECKING
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.logger import get_logger
+
+if TYPE_CHECKING:
+    from netcad.device import Device
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["SessionPool", "DeviceSessionsMixin", "get_session_pool"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+DEFAULT_SESSION_IDLE_TIMEOUT = 60.0
+DEFAULT_MAX_SESSIONS_PER_DEVICE = 1
+
+SessionFactory = Callable[[], Awaitable[Any]]
+SessionCloser = Callable[[Any], Any]
+
+
+class SessionPool:
+    """
+    A pool of authenticated device sessions, for example SSH connections or
+    API clients, so that the DUT and device-configurable plugins can reuse
+    a session rather than log in to the device for each check collection or
+    file copy.
+
+    Sessions are keyed by the device name and an optional session kind, for
+    example "ssh".  Idle sessions are closed after `idle_timeout` seconds,
+    and no more than `max_per_device` sessions are open for a key at the same
+    time; additional Callers wait for a session to be released.
+
+    Sessions are bound to the event loop that created them; all sessions must
+    be closed, see `close`, before that event loop ends.
+
+    Examples
+    --------
+        async with self.pooled_session(factory=lambda: asyncssh.connect(...),
+                                       close=close_ssh, kind="ssh") as conn:
+            ...
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = DEFAULT_SESSION_IDLE_TIMEOUT,
+        max_per_device: int = DEFAULT_MAX_SESSIONS_PER_DEVICE,
+    ):
+        self.idle_timeout = idle_timeout
+        self.max_per_device = max_per_device
+        self._keys: Dict[Hashable, _KeySessions] = dict()
+
+    @asynccontextmanager
+    async def session(
+        self,
+        key: Hashable,
+        factory: SessionFactory,
+        close: Optional[SessionCloser] = None,
+    ):
+        """
+        Context manager that provides a session for the key, creating one with
+        the `factory` if there is no idle session.  If the enclosed code
+        raises an exception, the session is closed rather than returned to
+        the pool since its state is not known.
+        """
+        session = await self.acquire(key, factory, close)
+
+        try:
+            yield session
+
+        except BaseException:
+            await self.discard(key, session)
+            raise
+
+        else:
+            await self.release(key, session)
+
+    async def acquire(
+        self,
+        key: Hashable,
+        factory: SessionFactory,
+        close: Optional[SessionCloser] = None,
+    ) -> Any:
+        """
+        Returns an idle session for the key, or a new session from the factory.
+        The Caller must `release` or `discard` the session when done.
+        """
+        await self.expire()
+        entry = self._key_sessions(key, close)
+
+        async with entry.cond:
+            while not entry.idle and entry.open >= self.max_per_device:
+                await entry.cond.wait()
+
+            if entry.idle:
+                session, _ = entry.idle.pop()
+                return session
+
+            entry.open += 1
+
+        try:
+            return await factory()
+
+        except BaseException:
+            async with entry.cond:
+                entry.open -= 1
+                entry.cond.notify()
+            raise
+
+    async def release(self, key: Hashable, session: Any):
+        """Return the session to the pool for reuse"""
+        entry = self._keys[key]
+
+        async with entry.cond:
+            entry.idle.append((session, time.monotonic()))
+            entry.cond.notify()
+
+    async def discard(self, key: Hashable, session: Any):
+        """Close the session and remove it from the pool"""
+        entry = self._keys[key]
+        await self._close_session(entry, session)
+
+        async with entry.cond:
+            entry.open -= 1
+            entry.cond.notify()
+
+    async def expire(self):
+        """Close the idle sessions that have exceeded the idle timeout"""
+        deadline = time.monotonic() - self.idle_timeout
+        expired = list()
+
+        # the expired sessions are collected before any are closed since other
+        # Callers may add keys to the pool while a session is being closed.
+
+        for entry in list(self._keys.values()):
+            expired.extend(
+                (entry, session) for session, ts in entry.idle if ts < deadline
+            )
+            entry.idle = [item for item in entry.idle if item[1] >= deadline]
+
+        # the expired sessions count as open until they are closed; then any
+        # Caller waiting at the per-key limit is notified.
+
+        for entry, session in expired:
+            await self._close_session(entry, session)
+
+            async with entry.cond:
+                entry.open -= 1
+                entry.cond.notify()
+
+    async def close(self, key: Optional[Hashable] = None):
+        """
+        Close the idle sessions for the key, or for all keys when not given.
+        This is called at the end of a command run.
+        """
+        keys = [key] if key is not None else list(self._keys)
+
+        for each_key in keys:
+            if not (entry := self._keys.get(each_key)):
+                continue
+
+            idle, entry.idle = entry.idle, list()
+            entry.open -= len(idle)
+
+            for session, _ in idle:
+                await self._close_session(entry, session)
+
+            # sessions that are still in use are closed by a later call.
+            if not entry.open:
+                del self._keys[each_key]
+
+    # -------------------------------------------------------------------------
+    #                             Private Methods
+    # -------------------------------------------------------------------------
+
+    def _key_sessions(
+        self, key: Hashable, close: Optional[SessionCloser]
+    ) -> "_KeySessions":
+        loop = asyncio.get_running_loop()
+        entry = self._keys.get(key)
+
+        # sessions created by a prior event loop cannot be used, nor closed
+        # properly, so they are dropped.
+
+        if not entry or entry.loop is not loop:
+            entry = self._keys[key] = _KeySessions(loop=loop, close=close)
+
+        return entry
+
+    @staticmethod
+    async def _close_session(entry: "_KeySessions", session: Any):
+        if not entry.close:
+            return
+
+        try:
+            if inspect.isawaitable(rv := entry.close(session)):
+                await rv
+
+        except Exception as exc:
+            get_logger().debug(f"Session close failed: {exc}")
+
+
+class DeviceSessionsMixin:
+    """
+    Provides the DUT and device-configurable classes access to the shared
+    session pool, keyed by the device name and the kind of session.
+    """
+
+    device: "Device"
+
+    def pooled_session(
+        self,
+        factory: SessionFactory,
+        close: Optional[SessionCloser] = None,
+        kind: str = "default",
+    ):
+        """
+        Context manager that provides a pooled session to the device of the
+        given kind; see SessionPool.session.
+        """
+        return get_session_pool().session((self.device.name, kind), factory, close)
+
+
+def get_session_pool() -> SessionPool:
+    """Returns the process-wide session pool shared by DUT and DCFG plugins"""
+    global _session_pool
+
+    if not _session_pool:
+        _session_pool = SessionPool()
+
+    return _session_pool
+
+
+# -----------------------------------------------------------------------------
+#
+#                          PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+_session_pool: Optional[SessionPool] = None
+
+
+@dataclass
+class _KeySessions:
+    loop: asyncio.AbstractEventLoop
+    close: Optional[SessionCloser] = None
+    open: int = 0
+    idle: List[tuple] = field(default_factory=list)
+    cond: asyncio.Condition = field(default_factory=asyncio.Condition)
@@ -0,0 +1,188 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+import asyncio
+from typing import Sequence, List, Dict, Tuple, Iterator, Optional
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from math import ceil
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.config import netcad_globals
+from netcad.logger import get_logger
+from netcad.device import Device
+from netcad.checks import CheckStatus
+
+from .run_checks import CheckRunOptions, run_device_checks
+from .timing import TimingRecorder, cv_timing
+from .schedule_checks import checks_dir_size
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["shard_devices", "shard_device_checks"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def shard_devices(
+    options: CheckRunOptions, device_objs: Sequence[Device], workers: int
+) -> List[List[str]]:
+    """
+    Split the devices into `workers` shards, by device name, such that each
+    shard has about the same amount of checks work.  The devices are assigned
+    largest first to the shard with the least amount of work so far.
+    """
+    shards: List[List[str]] = [list() for _ in range(min(workers, len(device_objs)))]
+    loads = [0] * len(shards)
+
+    def dev_size(dev_obj: Device) -> int:
+        return checks_dir_size(options.checks_dir / dev_obj.design.name / dev_obj.name)
+
+    for size, dev_obj in sorted(
+        ((dev_size(dev_obj), dev_obj) for dev_obj in device_objs),
+        key=lambda item: (-item[0], item[1].name),
+    ):
+        idx = loads.index(min(loads))
+        shards[idx].append(dev_obj.name)
+
+        # a device without checks still costs a session setup.
+        loads[idx] += size or 1
+
+    return shards
+
+
+def shard_device_checks(
+    options: CheckRunOptions,
+    device_objs: Sequence[Device],
+    workers: int,
+    recorder: Optional[TimingRecorder] = None,
+) -> Iterator[Tuple[str, Counter]]:
+    """
+    Execute the device checks across a pool of worker processes.  Each worker
+    runs its own event loop, and DUT plugins, for its shard of devices.  The
+    results directories are per device, so the workers do not share any
+    files other than the optional results store.
+
+    The max-concurrent limit is divided across the workers so that the total
+    number of devices checked at the same time is the same as a single
+    process run.  This function is called from outside of the event loop
+    as the workers are created by forking the current process.
+
+    Each worker is given the names of its devices and of their designs so
+    that the worker loads only those designs.
+
+    When the timing `recorder` is provided, the timing spans of each worker
+    are added to it as each worker completes.
+
+    Yields
+    ------
+    tuple: device-name, result-counts; for each device as each worker
+    completes.
+    """
+    log = get_logger()
+    shards = shard_devices(options, device_objs, workers)
+
+    worker_options = replace(
+        options, max_concurrent=ceil(options.max_concurrent / len(shards))
+    )
+
+    log.info(f"Starting tests for {len(device_objs)} devices, workers {len(shards)}.")
+
+    dev_designs = {dev_obj.name: dev_obj.design.name for dev_obj in device_objs}
+
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        futures = {
+            pool.submit(
+                _shard_worker,
+                worker_options,
+                tuple(sorted({dev_designs[dev_name] for dev_name in shard})),
+                shard,
+            ): shard
+            for shard in shards
+        }
+
+        for future in as_completed(futures):
+            try:
+                shard_counts, shard_timing = future.result()
+
+            # if a worker fails, the other shards continue so that their
+            # results are not lost; each device in the failed shard is
+            # reported as failed.
+
+            except Exception as exc:
+                errmsg = str(exc) or exc.__class__.__name__
+                log.critical(f"Worker failed: {errmsg}")
+                shard_counts = {
+                    dev_name: Counter({CheckStatus.FAIL: 1})
+                    for dev_name in futures[future]
+                }
+                shard_timing = None
+
+            if recorder and shard_timing:
+                recorder.extend(*shard_timing)
+
+            yield from shard_counts.items()
+
+
+# -----------------------------------------------------------------------------
+#
+#                          PRIVATE CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+def _shard_worker(
+    options: CheckRunOptions, designs: Tuple[str, ...], device_names: List[str]
+) -> Tuple[Dict[str, Counter], Optional[Tuple[List[dict], float]]]:
+    """
+    The worker process entry point, returns the result counts of each device
+    in the shard, and when enabled, the timing spans with the time the worker
+    recording started.
+    """
+    _worker_init()
+
+    from netcad.cli.device_inventory import get_devices_from_designs
+
+    device_objs = get_devices_from_designs(designs, include_devices=device_names)
+
+    recorder = TimingRecorder() if options.timing else None
+
+    async def run_shard():
+        cv_timing.set(recorder)
+        return {
+            dut.device.name: Counter(dut.result_counts)
+            async for dut in run_device_checks(options, device_objs)
+        }
+
+    shard_counts = asyncio.run(run_shard())
+    return shard_counts, (recorder.spans, recorder.started) if recorder else None
+
+
+def _worker_init():
+    """
+    When the worker process is forked from the `netcam` process the netcad
+    environment is already initialized; otherwise, for example when the
+    process is spawned, the environment and plugins are initialized here.
+    """
+    if netcad_globals.g_netcam_plugins_os_catalog is not None:
+        return
+
+    from netcad.init import init, init_netcam_plugins, init_netcad_origin_plugins
+
+    init()
+    init_netcad_origin_plugins.init_netcad_origin_plugins()
+    init_netcam_plugins.import_netcam_plugins()
@@ -0,0 +1,125 @@
+#  Copyright (c) 2021 Jeremy Schulman
+#  GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, List, Iterable
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from enum import auto
+import json
+import time
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from netcad.helpers import StrEnum
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["TimingPhase", "TimingRecorder", "cv_timing", "timing_span"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+# noinspection PyArgumentList
+class TimingPhase(StrEnum):
+    """
+    The phases of a device check run that are timed.  The `measure` phase is
+    available for DUT plugins that want to separate the time spent measuring
+    results from the time spent collecting data from the device.
+    """
+
+    device = auto()
+    setup = auto()
+    load = auto()
+    execute = auto()
+    measure = auto()
+    save = auto()
+    teardown = auto()
+
+
+class TimingRecorder:
+    """
+    Records the timing spans of a check run.  Each span is a dict with the
+    keys: device, phase, collection (or None), start (seconds since the start
+    of the run), duration (seconds), and status ("ok", or the name of the
+    exception that ended the span).
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.spans: List[dict] = list()
+
+    @contextmanager
+    def span(self, device: str, phase: TimingPhase, collection: Optional[str] = None):
+        start = time.perf_counter()
+        status = "ok"
+
+        try:
+            yield
+
+        except BaseException as exc:
+            status = exc.__class__.__name__
+            raise
+
+        finally:
+            self.spans.append(
+                dict(
+                    device=device,
+                    phase=str(phase),
+                    collection=collection,
+                    start=round(start - self._t0, 6),
+                    duration=round(time.perf_counter() - start, 6),
+                    status=status,
+                )
+            )
+
+    def extend(self, spans: Iterable[dict], started: float):
+        """
+        Add the spans recorded by another recorder, for example in a worker
+        process, that was started at the `started` time.
+        """
+        offset = started - self.started
+        self.spans.extend(
+            {**span, "start": round(span["start"] + offset, 6)} for span in spans
+        )
+
+    def write(self, timing_file: Path):
+        """Write the timing spans as JSON Lines, one span per line"""
+        with timing_file.open("w") as ofile:
+            for span in self.spans:
+                ofile.write(json.dumps(span) + "\n")
+
+
+# the timing recorder for the current check run; None when timing is not
+# enabled.
+
+cv_timing: ContextVar[Optional[TimingRecorder]] = ContextVar("timing", default=None)
+
+
+def timing_span(device: str, phase: TimingPhase, collection: Optional[str] = None):
+    """
+    Returns the context manager that times the enclosed code as a span of the
+    current check run; or a no-op when timing is not enabled.
+
+    Examples
+    --------
+        with timing_span(dut.device.name, TimingPhase.measure, "interfaces"):
+            results = self.measure_interfaces(...)
+    """
+    if not (recorder := cv_timing.get()):
+        return nullcontext()
+
+    return recorder.span(device, phase, collection)
@@ -0,0 +1,52 @@
+import pytest
+
+from netcad.feats.topology.checks.check_interfaces import (
+    InterfaceCheck,
+    InterfaceCheckParams,
+    InterfaceCheckUsedExpectations,
+    InterfaceCheckResult,
+)
+
+
+@pytest.fixture
+def interface_check():
+    """factory of the InterfaceCheck of a used, up, 1000 speed interface"""
+
+    def make(interface: str = "Ethernet1", desc: str = "uplink") -> InterfaceCheck:
+        return InterfaceCheck(
+            check_params=InterfaceCheckParams(
+                interface=interface, interface_flags=None
+            ),
+            expected_results=InterfaceCheckUsedExpectations(
+                used=True, desc=desc, oper_up=True, speed=1000
+            ),
+        )
+
+    return make
+
+
+@pytest.fixture
+def interface_result(interface_check):
+    """
+    factory of the InterfaceCheckResult of the interface check, with the
+    measurement set to the expected values except for the given `measured`
+    values.  The result is not yet measured.
+    """
+
+    def make(
+        interface: str = "Ethernet1",
+        device: str = "sw1",
+        expected_desc: str = "uplink",
+        **measured,
+    ) -> InterfaceCheckResult:
+        result = InterfaceCheckResult(
+            device=device, check=interface_check(interface, desc=expected_desc)
+        )
+        msrd = result.measurement
+        msrd.used, msrd.desc, msrd.oper_up = True, expected_desc, True
+        msrd.speed = 1000
+        for name, value in measured.items():
+            setattr(msrd, name, value)
+        return result
+
+    return make
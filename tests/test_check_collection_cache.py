@@ -0,0 +1,70 @@
+import asyncio
+import os
+
+import pytest
+
+from netcad.checks.check_collection_cache import (
+    cv_checks_cache,
+    checks_cache_get,
+    checks_cache_clear,
+)
+from netcad.feats.topology.checks.check_interfaces import InterfaceCheckCollection
+
+
+@pytest.fixture
+def checks_cache():
+    token = cv_checks_cache.set(True)
+    yield
+    cv_checks_cache.reset(token)
+    checks_cache_clear()
+
+
+def _write_checks(checks_file, interface_check, desc, mtime_ns=None):
+    collection = InterfaceCheckCollection(
+        device="sw1", checks=[interface_check(desc=desc)]
+    )
+    checks_file.write_text(collection.model_dump_json())
+    if mtime_ns is not None:
+        os.utime(checks_file, ns=(mtime_ns, mtime_ns))
+    return checks_file.stat().st_mtime_ns
+
+
+def _load_desc(testcase_dir):
+    collection = asyncio.run(InterfaceCheckCollection.load(testcase_dir))
+    return collection.checks[0].expected_results.desc
+
+
+def test_checks_cache_hit(tmp_path, interface_check, checks_cache):
+    checks_file = tmp_path / "interfaces.json"
+    mtime_ns = _write_checks(checks_file, interface_check, "uplink1")
+    assert _load_desc(tmp_path) == "uplink1"
+
+    # the same size and mtime is a cache hit, so the file is not read again.
+    _write_checks(checks_file, interface_check, "uplink2", mtime_ns=mtime_ns)
+    assert _load_desc(tmp_path) == "uplink1"
+
+    # the Caller is given a copy of the cached collection.
+    cached = checks_cache_get(checks_file)
+    cached.checks = []
+    assert checks_cache_get(checks_file).checks
+
+
+def test_checks_cache_disabled(tmp_path, interface_check):
+    checks_file = tmp_path / "interfaces.json"
+    _write_checks(checks_file, interface_check, "uplink1")
+    assert _load_desc(tmp_path) == "uplink1"
+    assert checks_cache_get(checks_file) is None
+
+
+def test_checks_cache_invalidate(tmp_path, interface_check, checks_cache):
+    checks_file = tmp_path / "interfaces.json"
+    mtime_ns = _write_checks(checks_file, interface_check, "uplink1")
+    assert _load_desc(tmp_path) == "uplink1"
+
+    # a changed mtime, with the same size, invalidates the cached collection.
+    _write_checks(checks_file, interface_check, "uplink2", mtime_ns=mtime_ns + 1)
+    assert _load_desc(tmp_path) == "uplink2"
+
+    # a changed size, with the same mtime, invalidates the cached collection.
+    _write_checks(checks_file, interface_check, "uplink-33", mtime_ns=mtime_ns + 1)
+    assert _load_desc(tmp_path) == "uplink-33"
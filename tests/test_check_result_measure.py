@@ -0,0 +1,68 @@
+from netcad.checks import CheckStatus, measure_many
+from netcad.checks.check_result_log import cv_log_pass, RESULTS_FILE_CONTEXT
+from netcad.feats.topology.checks.check_interfaces import InterfaceCheckResult
+
+
+def test_measure_many_status_and_logs(interface_result):
+    passed, failed, skipped = measure_many(
+        [
+            interface_result(),
+            interface_result(desc="other", oper_up=False),
+            interface_result(desc="other"),
+        ],
+        on_mismatch=lambda field, *_: (
+            CheckStatus.SKIP if field == "desc" else CheckStatus.FAIL
+        ),
+    )
+
+    assert passed.status == CheckStatus.PASS
+    assert passed.field is None
+    assert [log[0] for log in passed.logs.root] == [CheckStatus.PASS] * 4
+
+    # the mismatched fields are reported in the measurement field order.
+    assert failed.status == CheckStatus.FAIL
+    assert failed.field == "oper_up"
+    assert failed.logs.root[2] == (
+        CheckStatus.FAIL,
+        "oper_up",
+        {"expected": True, "measured": False},
+    )
+
+    assert skipped.status == CheckStatus.PASS
+    assert skipped.logs.root[1][0] == CheckStatus.SKIP
+
+
+def test_logs_pass_entries_results_file(interface_result):
+    result = measure_many([interface_result(desc="other")])[0]
+    assert len(result.logs.root) == 4
+
+    # the logs are serialized in full, other than for the results file.
+    full_logs = result.model_dump(mode="json")["logs"]
+    assert full_logs[0] == ["PASS", "used", {"expected": True, "measured": True}]
+
+    # the results file has the PASS entries without the measured value.
+    payload = result.model_dump(mode="json", context=RESULTS_FILE_CONTEXT)
+    assert payload["logs"] == [
+        ["PASS", "used", {"expected": True}],
+        ["FAIL", "desc", {"expected": "uplink", "measured": "other"}],
+        ["PASS", "oper_up", {"expected": True}],
+        ["PASS", "speed", {"expected": 1000}],
+    ]
+
+    token = cv_log_pass.set(True)
+    try:
+        assert (
+            result.model_dump(mode="json", context=RESULTS_FILE_CONTEXT)["logs"]
+            == full_logs
+        )
+    finally:
+        cv_log_pass.reset(token)
+
+    # the logs read back are stored as tuples with the status member, and the
+    # PASS entries can be shown.
+    parsed = InterfaceCheckResult.model_validate(payload)
+    assert parsed.logs.root[:2] == [
+        (CheckStatus.PASS, "used", {"expected": True}),
+        (CheckStatus.FAIL, "desc", {"expected": "uplink", "measured": "other"}),
+    ]
+    assert parsed.logs.pretty_table().row_count == 4
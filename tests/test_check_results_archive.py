@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from netcad.checks.check_results_archive import CheckResultsArchive
+from netcad.checks.check_results_file import CHECKS_DIGEST_FILENAME
+from netcad.checks.check_results_summary import RESULTS_SUMMARY_FILENAME
+
+
+def _payload(status, interface, check_type="interface", logs=None):
+    return dict(
+        status=status,
+        check=dict(check_type=check_type, check_id=interface),
+        check_id=interface,
+        field="oper_up",
+        logs=logs or [],
+    )
+
+
+def _checks_dir(tmp_path):
+    checks_dir = tmp_path / "checks"
+
+    for device, statuses in (("sw1", ["PASS", "FAIL"]), ("sw2", ["PASS"])):
+        (results_dir := checks_dir / "des" / device / "results").mkdir(parents=True)
+        payloads = [
+            _payload(status, f"Ethernet{i}", logs=[[status, "oper_up", i]])
+            for i, status in enumerate(statuses)
+        ]
+        (results_dir / "interfaces.json").write_text(json.dumps(payloads))
+
+        # the sidecar files are not results files.
+        (results_dir / CHECKS_DIGEST_FILENAME).write_text(json.dumps({"a": "b"}))
+        (results_dir / RESULTS_SUMMARY_FILENAME).write_text(
+            json.dumps([_payload("FAIL", "Ethernet9")])
+        )
+
+    return checks_dir
+
+
+@pytest.mark.parametrize("suffix", [".ncra", ".parquet"])
+def test_results_archive_query(tmp_path, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+
+    archive_file = tmp_path / f"run{suffix}"
+    archive = CheckResultsArchive.create(archive_file, _checks_dir(tmp_path))
+    assert len(archive) == 3
+
+    archive = CheckResultsArchive(archive_file)
+    (row,) = archive.query(status=["FAIL"], with_logs=True)
+    assert row["device"] == "sw1"
+    assert row["collection"] == "interfaces"
+    assert row["check_id"] == "Ethernet1"
+    assert row["logs"] == [["FAIL", "oper_up", 1]]
+
+    assert [r["device"] for r in archive.query(device=["sw2"])] == ["sw2"]
+    assert archive.counts(by="device", status=["PASS"]) == dict(sw1=1, sw2=1)
+    assert not list(archive.query(check_type=["lag"]))
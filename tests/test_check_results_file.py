@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import pytest
+
+from netcad.checks import CheckResultsFormat, results_file_find, results_file_load
+from netcad.checks.check_results_file import results_file_write
+from netcad.checks import check_file_compression
+from netcad.checks.check_file_compression import (
+    FileCompression,
+    cv_file_compression,
+    file_compress,
+    file_compression_check,
+)
+from netcad.feats.topology.checks.check_interfaces import InterfaceCheckCollection
+
+
+@pytest.mark.parametrize(
+    "results_format", [CheckResultsFormat.jsonl, CheckResultsFormat.jsonl_gz]
+)
+def test_results_file_write_load(tmp_path, results_format):
+    payloads = [{"status": "PASS", "check_id": f"Eth{i}"} for i in range(2500)]
+
+    # a legacy results file for the same collection is replaced.
+    tmp_path.joinpath("interfaces.json").write_text("[]")
+
+    results_file = asyncio.run(
+        results_file_write(
+            tmp_path,
+            "interfaces",
+            payloads=map(json.dumps, payloads),
+            results_format=results_format,
+        )
+    )
+
+    assert results_file.name == f"interfaces{results_format.suffix}"
+    assert results_file_find(tmp_path, "interfaces") == results_file
+    assert list(results_file_load(results_file)) == payloads
+
+
+def test_results_file_legacy(tmp_path):
+    payloads = [{"status": "FAIL", "check_id": "Eth1"}]
+    tmp_path.joinpath("interfaces.json").write_text(json.dumps(payloads, indent=3))
+
+    results_file = results_file_find(tmp_path, "interfaces")
+    assert CheckResultsFormat.from_path(results_file) == CheckResultsFormat.json
+    assert list(results_file_load(results_file)) == payloads
+    assert results_file_find(tmp_path, "cabling") is None
+
+
+def test_checks_file_compressed(tmp_path, interface_check):
+    collection = InterfaceCheckCollection(
+        device="sw1",
+        checks=[interface_check(f"Ethernet{i}", desc=f"uplink {i}") for i in range(3)],
+    )
+
+    asyncio.run(collection.save(tmp_path))
+    token = cv_file_compression.set(FileCompression.gzip)
+    try:
+        asyncio.run(collection.save(tmp_path))
+    finally:
+        cv_file_compression.reset(token)
+
+    # the uncompressed checks file is replaced by the compressed one.
+    checks_file = InterfaceCheckCollection.filepath(tmp_path, collection.name)
+    assert checks_file.name == "interfaces.json.gz"
+    assert not tmp_path.joinpath("interfaces.json").exists()
+
+    loaded = asyncio.run(InterfaceCheckCollection.load(tmp_path))
+    assert loaded.checks == collection.checks
+
+    # the results readers detect the compressed content.
+    payloads = [{"status": "PASS", "check_id": "Eth1"}]
+    tmp_path.joinpath("cabling.json.gz").write_bytes(
+        file_compress(json.dumps(payloads).encode(), FileCompression.gzip)
+    )
+    results_file = results_file_find(tmp_path, "cabling")
+    assert CheckResultsFormat.from_path(results_file) == CheckResultsFormat.json_gz
+    assert list(results_file_load(results_file)) == payloads
+
+
+def test_file_compression_check(monkeypatch):
+    # the zstd results formats are rejected when zstandard is not installed.
+    monkeypatch.setattr(check_file_compression, "zstandard", None)
+
+    with pytest.raises(RuntimeError, match="zstandard"):
+        file_compression_check(CheckResultsFormat.jsonl_zst.compression)
+
+    file_compression_check(CheckResultsFormat.jsonl_gz.compression)
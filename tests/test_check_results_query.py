@@ -0,0 +1,57 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from netcad.checks import CheckResultsFormat
+from netcad.checks.check_results_query import (
+    ResultsQuery,
+    results_index_record,
+    results_query_file,
+)
+from netcam.save_check_results import device_checks_save_results, cv_results_format
+
+
+@pytest.mark.parametrize(
+    "results_format", [CheckResultsFormat.json, CheckResultsFormat.jsonl]
+)
+def test_results_query(tmp_path, results_format, interface_result):
+    dut = SimpleNamespace(device=SimpleNamespace(name="sw1"))
+    results = [
+        interface_result(f"Ethernet{i}", speed=100 if i % 3 == 0 else 1000).measure()
+        for i in range(10)
+    ]
+
+    token = cv_results_format.set(results_format)
+    try:
+        results_file = asyncio.run(
+            device_checks_save_results(dut, "interfaces", results, tmp_path)
+        )
+    finally:
+        cv_results_format.reset(token)
+
+    def query_ids(query):
+        return [
+            res["check_id"]
+            for res in results_query_file(tmp_path, "interfaces", results_file, query)
+        ]
+
+    queries = [
+        ResultsQuery.from_where(["status=FAIL", "field=speed"]),
+        ResultsQuery.from_where(["status=PASS", "check_id=Ethernet[1-4]"]),
+        ResultsQuery.from_where(["check_type=lag"]),
+    ]
+
+    # the results are the same without, and with, the results file index.
+    expected = [query_ids(query) for query in queries]
+    assert expected == [
+        ["Ethernet0", "Ethernet3", "Ethernet6", "Ethernet9"],
+        ["Ethernet1", "Ethernet2", "Ethernet4"],
+        [],
+    ]
+
+    results_index_record(tmp_path, "interfaces", results_file, results)
+    assert [query_ids(query) for query in queries] == expected
+
+    with pytest.raises(ValueError):
+        ResultsQuery.from_where(["interface=Ethernet1"])
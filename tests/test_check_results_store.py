@@ -0,0 +1,33 @@
+import json
+
+from netcad.checks.check_results_store import CheckResultsStore
+
+
+def test_check_results_store(tmp_path):
+    assert CheckResultsStore.find(tmp_path) is None
+
+    store = CheckResultsStore(CheckResultsStore.db_path(tmp_path))
+    store.start_run()
+
+    rows = [
+        ("interfaces", "Eth1", "PASS", "desc", json.dumps({"field": "desc"})),
+        ("interfaces", "Eth1", "FAIL", "oper_up", json.dumps({"field": "oper_up"})),
+        ("interfaces", "Eth2", "INFO", None, json.dumps({"field": None})),
+    ]
+    store.save_results("des", "sw1", "interfaces", rows)
+
+    # saving again replaces, rather than duplicates, the collection results.
+    store.save_results("des", "sw1", "interfaces", rows)
+    store.close()
+
+    store = CheckResultsStore.find(tmp_path)
+    counts = store.count_results(
+        designs=["des"], collections=["interfaces"], statuses=["PASS", "FAIL", "INFO"]
+    )
+    assert counts["sw1"] == {"PASS": 1, "FAIL": 1, "INFO": 1}
+
+    results = store.load_results(
+        "des", "sw1", "interfaces", statuses=["FAIL", "INFO"], exclude_fields=["desc"]
+    )
+    assert [res["field"] for res in results] == ["oper_up", None]
+    store.close()
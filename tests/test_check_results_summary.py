@@ -0,0 +1,49 @@
+import asyncio
+from types import SimpleNamespace
+
+from netcad.checks.check_results_summary import (
+    results_summary_record,
+    results_summary_load,
+)
+from netcam.save_check_results import device_checks_save_results
+from netcam.cli.show_checks.filter_results import collection_status_counts
+
+
+def test_results_summary(tmp_path, interface_result):
+    dut = SimpleNamespace(device=SimpleNamespace(name="sw1"))
+    results = [
+        interface_result(
+            f"Ethernet{i}", expected_desc=f"uplink {i}", desc="uplink 0"
+        ).measure()
+        for i in range(3)
+    ]
+
+    results_file = asyncio.run(
+        device_checks_save_results(dut, "interfaces", results, tmp_path)
+    )
+    results_summary_record(tmp_path, "interfaces", results_file, results)
+
+    summary = results_summary_load(tmp_path)
+    assert summary["interfaces"]["failed"] == ["Ethernet1", "Ethernet2"]
+
+    # the summary counts match the counts from the results file.
+    optionals = dict(
+        include_all=True,
+        pass_only=False,
+        include_info=False,
+        include_pass=False,
+        include_fields=(),
+        exclude_fields=(),
+    )
+    counts = collection_status_counts(tmp_path, "interfaces", summary, optionals)
+    assert counts == collection_status_counts(tmp_path, "interfaces", {}, optionals)
+    assert counts == dict(PASS=1, FAIL=2)
+
+    optionals["exclude_fields"] = ("desc",)
+    assert collection_status_counts(tmp_path, "interfaces", summary, optionals) == (
+        collection_status_counts(tmp_path, "interfaces", {}, optionals)
+    )
+
+    # the summary is not used once the results file is changed.
+    results_file.write_text("[]")
+    assert "interfaces" not in results_summary_load(tmp_path)
@@ -0,0 +1,38 @@
+import time
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from netcam.dut import DeviceUnderTest, AsyncDeviceUnderTest, dut_call
+from netcam.dut import dut_threads_shutdown
+
+
+class BlockingDUT(DeviceUnderTest):
+    def setup(self):
+        time.sleep(0.2)
+        return threading.current_thread().name
+
+
+class NonBlockingDUT(AsyncDeviceUnderTest):
+    async def setup(self):
+        return threading.current_thread().name
+
+
+def test_dut_call_sync_and_async():
+    duts = [BlockingDUT(device=SimpleNamespace(name=f"sw{i}")) for i in range(4)] + [
+        NonBlockingDUT(device=SimpleNamespace(name="sw9"))
+    ]
+
+    async def run():
+        return await asyncio.gather(*(dut_call(dut, dut.setup) for dut in duts))
+
+    ts_start = time.monotonic()
+    thread_names = asyncio.run(run())
+    dut_threads_shutdown()
+
+    # the blocking setups run concurrently on the DUT threads, and the async
+    # setup runs on the event loop thread.
+
+    assert time.monotonic() - ts_start < 0.6
+    assert all(name.startswith("netcam-dut") for name in thread_names[:4])
+    assert thread_names[4] == threading.main_thread().name
@@ -0,0 +1,110 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from netcad.checks import CheckStatus
+from netcad.checks.check_results_summary import results_summary_load
+from netcad.checks.check_results_query import results_index_load
+from netcad.logger import get_logger
+from netcam import execute_checks
+from netcam.dut import AsyncDeviceUnderTest
+from netcam.execute_checks import (
+    execute_device_checks,
+    run_tests,
+    cv_concurrent_checks,
+    cv_setup_timeout,
+)
+
+
+class _Collection:
+    def __init__(self, name, checks):
+        self.name, self.checks = name, checks
+
+    def get_name(self):
+        return self.name
+
+    @staticmethod
+    def filepath(testcase_dir, service):
+        return testcase_dir / f"{service}.json"
+
+    async def load(self, testcase_dir):
+        return SimpleNamespace(checks=self.checks)
+
+
+class _DUT(AsyncDeviceUnderTest):
+    max_concurrent_checks = 2
+
+    def __init__(self, make_result, **kwargs):
+        super().__init__(**kwargs)
+        self.make_result = make_result
+        self.running = self.peak = 0
+        self.torn_down = False
+
+    async def setup(self):
+        await asyncio.sleep(1)
+
+    async def execute_checks(self, testcases):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.05)
+        self.running -= 1
+
+        return [
+            self.make_result(check.check_params.interface).measure()
+            for check in testcases.checks
+        ]
+
+    async def teardown(self):
+        self.torn_down = True
+
+
+def test_run_tests_concurrent(tmp_path, monkeypatch, interface_check, interface_result):
+    dut = _DUT(interface_result, device=SimpleNamespace(name="sw1"))
+    dut.testcases_dir = tmp_path
+
+    collections = [
+        _Collection(name, [interface_check(f"Ethernet{i}") for i in range(3)])
+        for name in ("interfaces", "cabling", "lags", "vlans")
+    ]
+    for each in collections:
+        (tmp_path / f"{each.name}.json").write_text(json.dumps({}))
+
+    monkeypatch.setattr(
+        execute_checks, "find_device_check_collections", lambda _dut: collections
+    )
+
+    token = cv_concurrent_checks.set(True)
+    try:
+        asyncio.run(run_tests(dut, get_logger()))
+    finally:
+        cv_concurrent_checks.reset(token)
+
+    # the collections are executed at the same time up to the DUT limit, and
+    # the sidecar records of each collection are kept.
+
+    assert dut.peak == dut.max_concurrent_checks
+    assert dut.result_counts == {CheckStatus.PASS: 12}
+
+    summary = results_summary_load(tmp_path / "results")
+    assert sorted(summary) == ["cabling", "interfaces", "lags", "vlans"]
+    digests = json.loads((tmp_path / "results" / "checks-digest.json").read_text())
+    assert sorted(digests) == sorted(summary)
+
+    index = results_index_load(tmp_path / "results", "lags")
+    assert index["check_id"] == ["Ethernet0", "Ethernet1", "Ethernet2"]
+    assert summary["lags"]["counts"] == [["PASS", None, 3]]
+
+
+def test_execute_device_checks_setup_timeout(tmp_path, interface_result):
+    dut = _DUT(interface_result, device=SimpleNamespace(name="sw1"))
+    dut.testcases_dir = tmp_path
+
+    token = cv_setup_timeout.set(0.01)
+    try:
+        asyncio.run(execute_device_checks(dut))
+    finally:
+        cv_setup_timeout.reset(token)
+
+    # the DUT is torn down to close any sessions opened by the setup.
+    assert dut.torn_down
+    assert dut.result_counts == {"FAIL": 1}
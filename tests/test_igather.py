@@ -0,0 +1,34 @@
+import asyncio
+
+from netcad.igather import as_completed
+
+
+def test_igather_as_completed_order():
+    async def work(name, delay):
+        await asyncio.sleep(delay)
+        return name
+
+    async def run():
+        coros = [work("slow", 0.05), work("fast", 0.0), work("mid", 0.02)]
+        return [value async for _, value in as_completed(coros, limit=3)]
+
+    assert asyncio.run(run()) == ["fast", "mid", "slow"]
+
+
+def test_igather_as_completed_limit():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def work(value):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.001 * (value % 3))
+        in_flight -= 1
+        return value
+
+    async def run():
+        return [value async for _, value in as_completed(map(work, range(20)), 4)]
+
+    assert sorted(asyncio.run(run())) == list(range(20))
+    assert max_in_flight == 4
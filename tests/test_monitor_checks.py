@@ -0,0 +1,120 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from netcad.checks import CheckStatus
+from netcad.checks.check_results_store import CheckResultsStore
+from netcam import execute_checks, monitor_checks
+from netcam.dut import AsyncDeviceUnderTest
+from netcam.monitor_checks import CheckTransitions, monitor_device_checks
+from netcam.run_checks import CheckRunOptions
+
+
+def _result(check_id, status):
+    return SimpleNamespace(
+        status=status, check=SimpleNamespace(check_id=lambda: check_id)
+    )
+
+
+def test_monitor_check_transitions():
+    dut = SimpleNamespace(device=SimpleNamespace(name="sw1"))
+    tracker = CheckTransitions()
+
+    def observe(results):
+        for res in results:
+            tracker.observe(dut, "interfaces", res)
+
+    # the first cycle is the baseline; any FAIL result fails the check.
+    observe(
+        [
+            _result("Eth1", CheckStatus.PASS),
+            _result("Eth2", CheckStatus.PASS),
+            _result("Eth2", CheckStatus.FAIL),
+            _result("Eth3", CheckStatus.INFO),
+        ]
+    )
+    assert tracker.end_cycle() == []
+
+    observe([_result("Eth1", CheckStatus.FAIL), _result("Eth2", CheckStatus.PASS)])
+    assert sorted(tracker.end_cycle()) == [
+        (("sw1", "interfaces", "Eth1"), CheckStatus.PASS, CheckStatus.FAIL),
+        (("sw1", "interfaces", "Eth2"), CheckStatus.FAIL, CheckStatus.PASS),
+    ]
+
+
+class _Collection:
+    def __init__(self, checks):
+        self.checks = checks
+
+    @staticmethod
+    def get_name():
+        return "interfaces"
+
+    @staticmethod
+    def filepath(testcase_dir, service):
+        return testcase_dir / f"{service}.json"
+
+    async def load(self, testcase_dir):
+        return SimpleNamespace(checks=self.checks)
+
+
+class _DUT(AsyncDeviceUnderTest):
+    """the measured description of Ethernet2 changes each cycle"""
+
+    def __init__(self, make_result, descs, **kwargs):
+        super().__init__(**kwargs)
+        self.make_result, self.descs = make_result, iter(descs)
+        self.setups = 0
+
+    async def setup(self):
+        self.setups += 1
+
+    async def execute_checks(self, testcases):
+        desc = next(self.descs)
+        return [
+            self.make_result("Ethernet1").measure(),
+            self.make_result("Ethernet2", desc=desc).measure(),
+        ]
+
+    async def teardown(self):
+        pass
+
+
+def test_monitor_results_store(
+    tmp_path, monkeypatch, interface_check, interface_result
+):
+    device = SimpleNamespace(name="sw1", design=SimpleNamespace(name="dc1"))
+    dut = _DUT(interface_result, ["uplink", "other"], device=device)
+    dut.testcases_dir = tmp_path / "dc1" / "sw1"
+    dut.testcases_dir.mkdir(parents=True)
+    dut.testcases_dir.joinpath("interfaces.json").write_text(json.dumps({}))
+
+    collection = _Collection(
+        [interface_check("Ethernet1"), interface_check("Ethernet2")]
+    )
+    monkeypatch.setattr(
+        execute_checks, "find_device_check_collections", lambda _dut: [collection]
+    )
+    monkeypatch.setattr(monitor_checks, "get_device_duts", lambda *_args: [dut])
+
+    store = CheckResultsStore(CheckResultsStore.db_path(tmp_path))
+    options = CheckRunOptions(checks_dir=tmp_path, store_run_id=store.start_run())
+    store.close()
+
+    asyncio.run(monitor_device_checks(options, [device], interval=0, cycles=2))
+
+    # the DUT is setup once, and the store holds the results of the last
+    # cycle, recorded as part of the run created by the Caller.
+
+    assert dut.setups == 1
+
+    store = CheckResultsStore.find(tmp_path)
+    counts = store.count_results(
+        designs=["dc1"], collections=["interfaces"], statuses=["PASS", "FAIL"]
+    )
+    assert counts["sw1"][str(CheckStatus.FAIL)] == 1
+    assert dut.result_counts == counts["sw1"]
+
+    run_ids = {run_id for (run_id,) in store.conn.execute("SELECT run_id FROM results")}
+    assert run_ids == {options.store_run_id}
+    store.close()
@@ -0,0 +1,39 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from netcad.checks import CheckStatus
+from netcad.feats.topology.checks.check_interfaces import InterfaceCheckCollection
+from netcam.replay import ReplayDeviceUnderTest, ReplayConfig
+
+
+def test_replay_dut_synthesized_and_recorded(tmp_path, interface_check):
+    device = SimpleNamespace(name="sw1")
+    collection = InterfaceCheckCollection(
+        device="sw1",
+        checks=[interface_check(f"Ethernet{i}", desc=f"uplink {i}") for i in (1, 2)],
+    )
+
+    # without fixtures, the checks are measured against the expected values.
+    dut = ReplayDeviceUnderTest(device=device)
+    results = asyncio.run(dut.execute_checks(collection))
+    assert [r.status for r in results] == [CheckStatus.PASS, CheckStatus.PASS]
+
+    # the recorded result is replayed, and only for the checks executed.
+    recorded = results[0].model_copy()
+    recorded.measurement.desc = "changed"
+    recorded.measure()
+    assert recorded.status == CheckStatus.FAIL
+
+    (fixtures_dir := tmp_path / "sw1").mkdir()
+    (fixtures_dir / "interfaces.json").write_text(
+        json.dumps([recorded.model_dump(mode="json")])
+    )
+
+    dut = ReplayDeviceUnderTest(
+        device=device, config=ReplayConfig(fixtures_dir=tmp_path)
+    )
+    collection.checks = collection.checks[:1]
+    results = asyncio.run(dut.execute_checks(collection))
+    assert [r.status for r in results] == [CheckStatus.FAIL]
+    assert results[0].measurement.desc == "changed"
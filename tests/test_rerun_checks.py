@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from netcad.checks import CheckStatus
+from netcad.feats.topology.checks.check_interfaces import InterfaceCheckCollection
+from netcam.rerun_checks import RerunSelect, rerun_plan, checks_digest_record
+
+
+@pytest.fixture
+def rerun(tmp_path, interface_check):
+    """
+    factory of the rerun plan for the interface checks, given the previous
+    results as {check-id: status}
+    """
+    (results_dir := tmp_path / "results").mkdir()
+    checks_file = tmp_path / "interfaces.json"
+    checks_file.write_text("{}")
+
+    def make(interfaces, previous, select=(RerunSelect.failed,), exclusive=False):
+        testcases = InterfaceCheckCollection(
+            device="sw1",
+            exclusive=exclusive,
+            checks=[interface_check(if_name) for if_name in interfaces],
+        )
+        if previous is not None:
+            results_dir.joinpath("interfaces.json").write_text(
+                json.dumps(
+                    [
+                        dict(check_id=check_id, status=str(status))
+                        for check_id, status in previous.items()
+                    ]
+                )
+            )
+
+        return rerun_plan(
+            results_dir,
+            InterfaceCheckCollection,
+            testcases,
+            checks_file,
+            frozenset(select),
+        )
+
+    make.results_dir, make.checks_file = results_dir, checks_file
+    return make
+
+
+def _check_ids(plan):
+    return [chk.check_id() for chk in plan.checks]
+
+
+def test_rerun_plan_failed(rerun):
+    # without previous results the complete collection is executed.
+    assert rerun(["Ethernet1"], previous=None) is None
+
+    plan = rerun(
+        ["Ethernet1", "Ethernet2"],
+        previous=dict(Ethernet1=CheckStatus.FAIL, Ethernet2=CheckStatus.PASS),
+    )
+    assert _check_ids(plan) == ["Ethernet1"]
+    assert [res["check_id"] for res in plan.previous] == ["Ethernet2"]
+
+    plan = rerun(["Ethernet1"], previous=dict(Ethernet1=CheckStatus.PASS))
+    assert plan.checks == []
+
+
+def test_rerun_plan_new_checks(rerun):
+    # the checks added since the previous run are executed, and the results of
+    # the checks that were removed are not retained.
+
+    plan = rerun(
+        ["Ethernet1", "Ethernet2", "Ethernet3"],
+        previous=dict(Ethernet1=CheckStatus.PASS, Ethernet9=CheckStatus.PASS),
+    )
+    assert _check_ids(plan) == ["Ethernet2", "Ethernet3"]
+    assert [res["check_id"] for res in plan.previous] == ["Ethernet1"]
+
+
+def test_rerun_plan_exclusive(rerun):
+    # a subset of an exclusive collection is not executed.
+    previous = dict(Ethernet1=CheckStatus.FAIL, Ethernet2=CheckStatus.PASS)
+    assert rerun(["Ethernet1", "Ethernet2"], previous, exclusive=True) is None
+
+    previous = dict(Ethernet1=CheckStatus.PASS)
+    assert rerun(["Ethernet1"], previous, exclusive=True).checks == []
+
+
+def test_rerun_plan_changed(rerun):
+    previous = dict(Ethernet1=CheckStatus.PASS)
+    select = (RerunSelect.changed,)
+
+    # without a recorded digest the checks are treated as changed.
+    assert rerun(["Ethernet1"], previous, select=select) is None
+
+    checks_digest_record(rerun.results_dir, "interfaces", rerun.checks_file)
+    assert rerun(["Ethernet1"], previous, select=select).checks == []
+
+    rerun.checks_file.write_text('{"changed": true}')
+    assert rerun(["Ethernet1"], previous, select=select) is None
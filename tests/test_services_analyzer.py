@@ -0,0 +1,245 @@
+import asyncio
+from operator import itemgetter
+from types import SimpleNamespace
+
+from netcad.config import netcad_globals
+from netcad.checks import CheckStatus
+from netcad.feats.topology.checks.check_interfaces import (
+    InterfaceCheckCollection,
+    InterfaceCheckResult,
+)
+from netcad.services.graph_query import GraphQuery
+from netcad.services import (
+    ServicesAnalyzer,
+    DesignService,
+    DesignServiceCheck,
+    CheckResultRef,
+)
+from netcam.save_check_results import device_checks_save_results
+
+_IF_NAMES = ("Ethernet1", "Ethernet2")
+
+
+class _Service(DesignService):
+    def build_design_graph(self, ai):
+        for dev_name in ("sw1", "sw2"):
+            ai.add_design_node(dev_name, kind_type="device", device=dev_name)
+            ai.add_service_edge(self, self, dev_name)
+
+            for if_name in _IF_NAMES:
+                interface = (dev_name, if_name)
+                assert ai.add_design_node(interface, kind_type="interface")
+                assert not ai.add_design_node(interface, kind_type="interface")
+                ai.add_design_edge(dev_name, interface)
+                ai.add_service_edge(self, dev_name, interface)
+
+
+def _analyzer(tmp_path, monkeypatch):
+    monkeypatch.setattr(netcad_globals, "g_netcad_checks_dir", tmp_path)
+    design = SimpleNamespace(devices={}, features={}, services={})
+    svc = _Service(design, name="fabric", owner="netops")
+    return ServicesAnalyzer(design=design), svc
+
+
+def test_services_analyzer_build(tmp_path, monkeypatch):
+    ai, svc = _analyzer(tmp_path, monkeypatch)
+    ai.build()
+
+    # the queued nodes and edges are added to the graph by the build.
+    assert ai.graph.vcount() == 7
+    assert ai.graph.ecount() == 10
+
+    svc_node = ai.nodes_map[svc]
+    assert svc_node["kind"] == "s" and svc_node["service"] == "fabric"
+
+    if_node = ai.nodes_map[("sw2", "Ethernet1")]
+    assert if_node["kind_type"] == "interface" and if_node["service"] is None
+    assert ai.nodes_map.inverse[if_node] == ("sw2", "Ethernet1")
+
+    dev_node = ai.nodes_map["sw2"]
+    assert {edge["kind"] for edge in dev_node.out_edges()} == {"d", "s"}
+    assert {edge.target_vertex for edge in dev_node.out_edges()} == {
+        ai.nodes_map[("sw2", "Ethernet1")],
+        ai.nodes_map[("sw2", "Ethernet2")],
+    }
+
+    # nodes added after the build are committed before the analysis.
+    ai.add_check_node(svc, DesignServiceCheck())
+    assert ai.graph.vcount() == 7
+    ai.commit()
+    assert ai.graph.vcount() == 8
+
+
+class _CheckService(_Service):
+    def build_results_graph(self, ai):
+        # each interface has a check result, and the cabling check is the
+        # parent of the sw1 and sw2 Ethernet1 check results; so that these
+        # results are shared by the interface and cabling check nodes.
+
+        self.cabling = DesignServiceCheck()
+        ai.add_service_check(self, self.cabling)
+
+        # the links check is the parent of the cabling check and of the sw1
+        # Ethernet1 check result; so that this result is reached from the links
+        # check by two paths.
+
+        self.links = DesignServiceCheck()
+        ai.add_service_check(self, self.links)
+        ai.add_check_edge(self, self.links, self.cabling)
+
+        interfaces = [(dev, ifn) for dev in ("sw1", "sw2") for ifn in _IF_NAMES]
+
+        for interface in interfaces:
+            status = "FAIL" if interface == ("sw2", "Ethernet1") else "PASS"
+            ai.add_node(
+                result := DesignServiceCheck(),
+                kind="r",
+                check_id=interface[1],
+                status=status,
+                pass_count=int(status == "PASS"),
+                fail_count=int(status == "FAIL"),
+            )
+            ai.add_check_edge(self, interface, result)
+
+            if interface[1] == "Ethernet1":
+                ai.add_check_edge(self, self.cabling, result)
+
+            if interface == ("sw1", "Ethernet1"):
+                ai.add_check_edge(self, self.links, result)
+
+            self.results[interface] = result
+
+
+def test_services_analyzer_analyze(tmp_path, monkeypatch):
+    monkeypatch.setattr(netcad_globals, "g_netcad_checks_dir", tmp_path)
+    design = SimpleNamespace(devices={}, features={}, services={})
+    svc = _CheckService(design, name="fabric", owner="netops")
+    svc.results = dict()
+
+    ai = ServicesAnalyzer(design=design)
+    ai.build()
+    ai.analyze(svc)
+
+    # each check result is counted once in the service.
+    svc_node = ai.nodes_map[svc]
+    assert (svc_node["pass_count"], svc_node["fail_count"]) == (3, 1)
+    assert svc.status == "FAIL" and svc_node["status"] == "FAIL"
+    assert svc.failed == [svc.results[("sw2", "Ethernet1")]]
+
+    cabling_node = ai.nodes_map[svc.cabling]
+    assert (cabling_node["pass_count"], cabling_node["fail_count"]) == (1, 1)
+
+    # the interior nodes also count each check result once.
+    links_node = ai.nodes_map[svc.links]
+    assert (links_node["pass_count"], links_node["fail_count"]) == (1, 1)
+
+    # the devices aggregate the counts of the interfaces.
+    dev_node = ai.nodes_map["sw2"]
+    assert (dev_node["pass_count"], dev_node["fail_count"]) == (1, 1)
+
+
+def test_services_graph_query(tmp_path, monkeypatch):
+    ai, svc = _analyzer(tmp_path, monkeypatch)
+    ai.build()
+
+    query = ai.query()(ai.nodes_map["sw1"]).out_(service="fabric", kind="s")
+    assert query.nodes == [
+        ai.nodes_map[("sw1", "Ethernet1")],
+        ai.nodes_map[("sw1", "Ethernet2")],
+    ]
+    assert query.explain().splitlines()[-1] == (
+        "out_(service='fabric', kind='s') index[service, kind] -> 2 nodes"
+    )
+
+    # the traversals match those of the igraph selects.
+    assert len(ai.query()(*query.nodes).in_(kind="d")) == 1
+    assert len(ai.query().select(kind="d").out_().in_(kind="s")) == 2
+
+    query = ai.query().select(kind_type="device").node(device="sw2")
+    assert query.nodes == [ai.nodes_map["sw2"]]
+    assert query.explain().splitlines() == [
+        "select(kind_type='device') select[kind_type] -> 2 nodes",
+        "node(device='sw2') index[device] -> 1 nodes",
+    ]
+
+    # without the index, the query steps use the igraph selects, and the index
+    # is created only by the select step.
+    query = GraphQuery(ai.graph)(ai.nodes_map["sw1"]).out_(service="fabric")
+    assert len(query) == 2 and query._index is None
+    assert query.explain().splitlines()[-1] == (
+        "out_(service='fabric') select[service] -> 2 nodes"
+    )
+    assert len(query.in_(kind="d").node(device="sw1")) == 1
+    assert query._index is None
+
+    query = GraphQuery(ai.graph).select(kind="d", device="sw1")
+    assert query.nodes == [ai.nodes_map["sw1"]] and query._index is not None
+
+    # the query nodes are a set: a node reached by more than one path, here sw1
+    # from each of its interfaces, is included and grouped once.
+    for query in (ai.query(), GraphQuery(ai.graph)):
+        diamond = query(ai.nodes_map["sw1"]).out_(kind="d").in_(kind="d")
+        assert diamond.nodes == [ai.nodes_map["sw1"]]
+        assert diamond.groupby(itemgetter("kind_type")) == {
+            "device": [ai.nodes_map["sw1"]]
+        }
+
+    # the index is discarded when the graph is changed.
+    index = ai.graph_index
+    ai.add_service_check(svc, DesignServiceCheck())
+    ai.commit()
+    assert ai.graph_index is not index
+    assert len(ai.query().select(service="fabric", kind="r")) == 1
+
+
+class _Device:
+    def __init__(self, name, design):
+        self.name, self.design, self.is_pseudo = name, design, False
+
+
+def _save_results(results_dir, device, results):
+    for res in results:
+        res.measure()
+
+    # an INFO result that is not loaded by the analyzer.
+    results[-1].status = CheckStatus.INFO
+
+    dut = SimpleNamespace(device=SimpleNamespace(name=device))
+    asyncio.run(device_checks_save_results(dut, "interfaces", results, results_dir))
+
+
+def test_services_analyzer_load_results(tmp_path, monkeypatch, interface_result):
+    monkeypatch.setattr(netcad_globals, "g_netcad_checks_dir", tmp_path)
+    design = SimpleNamespace(name="fabric", services={})
+    design.devices = {name: _Device(name, design) for name in ("sw1", "sw2", "sw3")}
+    design.features = {
+        "topology": SimpleNamespace(
+            name="topology", check_collections=[InterfaceCheckCollection]
+        )
+    }
+
+    # the sw3 device does not have a results file.
+    for device in ("sw1", "sw2"):
+        (results_dir := tmp_path / "fabric" / device / "results").mkdir(parents=True)
+        results = [
+            interface_result(f"Ethernet{i}", device, speed=1000 if i else 100)
+            for i in range(4)
+        ]
+        _save_results(results_dir, device, results)
+
+    ai = ServicesAnalyzer(design=design, max_workers=2)
+    assert ai.graph.vcount() == 6
+
+    for device in ("sw1", "sw2"):
+        results = ai.results_map[design.devices[device]]["interface"]
+        assert sorted(results) == ["Ethernet0", "Ethernet1", "Ethernet2"]
+        assert results["Ethernet0"].status == CheckStatus.FAIL
+        assert ai.nodes_map[results["Ethernet0"]]["fail_count"] == 1
+
+    # the check results are hydrated from the results file when used.
+    res_ref = ai.results_map[design.devices["sw2"]]["interface"]["Ethernet1"]
+    assert isinstance(res_ref, CheckResultRef) and res_ref.row == 1
+    result = res_ref.result
+    assert isinstance(result, InterfaceCheckResult) and result.device == "sw2"
+    assert result.check.check_params.interface == "Ethernet1"
+    assert res_ref.result is result
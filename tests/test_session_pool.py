@@ -0,0 +1,90 @@
+import asyncio
+
+from netcam.session_pool import SessionPool
+
+
+def test_session_pool_reuse_and_limit():
+    created, closed = list(), list()
+
+    async def factory():
+        created.append(len(created))
+        return created[-1]
+
+    async def run():
+        pool = SessionPool(max_per_device=1)
+
+        async def use(key):
+            async with pool.session(key, factory, close=closed.append) as sess:
+                await asyncio.sleep(0.001)
+                return sess
+
+        # the sessions for the same device are serialized and reused.
+        assert await asyncio.gather(*(use("sw1") for _ in range(4))) == [0] * 4
+        assert await use("sw2") == 1
+
+        await pool.close()
+
+    asyncio.run(run())
+    assert created == [0, 1]
+    assert sorted(closed) == [0, 1]
+
+
+def test_session_pool_idle_timeout():
+    closed = list()
+
+    async def factory():
+        return object()
+
+    async def run():
+        pool = SessionPool(idle_timeout=0)
+
+        async with pool.session("sw1", factory, close=closed.append) as first:
+            pass
+
+        async with pool.session("sw1", factory, close=closed.append) as second:
+            pass
+
+        await pool.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is not second
+    assert closed == [first, second]
+
+
+def test_session_pool_expire_concurrent():
+    closed = list()
+
+    async def factory():
+        return object()
+
+    async def slow_close(session):
+        await asyncio.sleep(0.05)
+        closed.append(session)
+
+    async def run():
+        pool = SessionPool(idle_timeout=0.01, max_per_device=1)
+
+        async with pool.session("sw1", factory, close=slow_close) as first:
+            pass
+
+        await asyncio.sleep(0.02)
+
+        async def use(key):
+            async with pool.session(key, factory, close=slow_close) as sess:
+                return sess
+
+        # new keys are added to the pool while the expired session is being
+        # closed, and the Caller waiting at the sw1 limit is notified once the
+        # expired session is closed.
+
+        sessions = await asyncio.wait_for(
+            asyncio.gather(use("sw2"), use("sw1"), use("sw3"), use("sw4")), timeout=1
+        )
+
+        await pool.close()
+        return first, sessions
+
+    first, sessions = asyncio.run(run())
+    assert closed[0] is first
+    assert sorted(map(id, closed[1:])) == sorted(map(id, sessions))
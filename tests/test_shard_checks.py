@@ -0,0 +1,89 @@
+from collections import Counter
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+from netcad.checks import CheckStatus
+from netcam import shard_checks
+from netcam.run_checks import CheckRunOptions
+from netcam.shard_checks import shard_devices, shard_device_checks
+
+
+def _device(name, design="dc1"):
+    return SimpleNamespace(name=name, design=SimpleNamespace(name=design))
+
+
+class _Pool:
+    """runs the submitted shard workers in this process"""
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    @staticmethod
+    def submit(func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+
+def test_shard_devices(tmp_path):
+    sizes = dict(sw1=700, sw2=500, sw3=400, sw4=300, sw5=0)
+    for dev_name, size in sizes.items():
+        if size:
+            (dev_dir := tmp_path / "dc1" / dev_name).mkdir(parents=True)
+            dev_dir.joinpath("interfaces.json").write_bytes(b" " * size)
+
+    options = CheckRunOptions(checks_dir=tmp_path)
+    device_objs = [_device(dev_name) for dev_name in sizes]
+
+    # the devices are assigned largest first to the least loaded shard; the
+    # device without checks counts as the smallest amount of work.
+
+    assert shard_devices(options, device_objs, workers=2) == [
+        ["sw1", "sw4"],
+        ["sw2", "sw3", "sw5"],
+    ]
+
+    # no more shards than devices.
+    assert shard_devices(options, device_objs[:2], workers=4) == [["sw1"], ["sw2"]]
+
+
+def test_shard_device_checks_worker_failed(tmp_path, monkeypatch):
+    device_objs = [
+        _device("sw1", "dc1"),
+        _device("sw2", "dc2"),
+        _device("sw3", "dc1"),
+        _device("sw4", "dc3"),
+    ]
+    worker_designs = dict()
+
+    def shard_worker(options, designs, device_names):
+        worker_designs[tuple(device_names)] = designs
+        if "sw2" in device_names:
+            raise RuntimeError("worker failed")
+        return {name: Counter({CheckStatus.PASS: 2}) for name in device_names}, None
+
+    monkeypatch.setattr(shard_checks, "ProcessPoolExecutor", _Pool)
+    monkeypatch.setattr(shard_checks, "_shard_worker", shard_worker)
+
+    options = CheckRunOptions(checks_dir=tmp_path, max_concurrent=10)
+    counts = dict(shard_device_checks(options, device_objs, workers=2))
+
+    # each worker loads only the designs of its devices, and the devices of the
+    # failed worker are reported as failed.
+
+    assert worker_designs == {("sw1", "sw3"): ("dc1",), ("sw2", "sw4"): ("dc2", "dc3")}
+    assert counts == {
+        "sw1": Counter({CheckStatus.PASS: 2}),
+        "sw3": Counter({CheckStatus.PASS: 2}),
+        "sw2": Counter({CheckStatus.FAIL: 1}),
+        "sw4": Counter({CheckStatus.FAIL: 1}),
+    }
@@ -0,0 +1,113 @@
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+from rich.console import Console
+
+from netcam import timing
+from netcam.timing import TimingPhase, TimingRecorder, cv_timing, timing_span
+from netcam.cli import check_profile_report
+from netcam.cli.check_profile_report import display_profile_report
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """the timing clock, advanced by the test to give known span durations"""
+    clock = SimpleNamespace(now=100.0)
+    monkeypatch.setattr(
+        timing,
+        "time",
+        SimpleNamespace(perf_counter=lambda: clock.now, time=lambda: 1000.0),
+    )
+    return clock
+
+
+def test_timing_span(clock):
+    recorder = TimingRecorder()
+
+    clock.now += 1.5
+    with recorder.span("sw1", TimingPhase.setup):
+        clock.now += 2.25
+
+    with pytest.raises(TimeoutError):
+        with recorder.span("sw1", TimingPhase.execute, "interfaces"):
+            clock.now += 0.5
+            raise TimeoutError()
+
+    assert recorder.spans == [
+        dict(
+            device="sw1",
+            phase="setup",
+            collection=None,
+            start=1.5,
+            duration=2.25,
+            status="ok",
+        ),
+        dict(
+            device="sw1",
+            phase="execute",
+            collection="interfaces",
+            start=3.75,
+            duration=0.5,
+            status="TimeoutError",
+        ),
+    ]
+
+    # without a recorder the span is a no-op.
+    with timing_span("sw1", TimingPhase.load):
+        pass
+
+    token = cv_timing.set(recorder)
+    try:
+        with timing_span("sw1", TimingPhase.load, "interfaces"):
+            clock.now += 1
+    finally:
+        cv_timing.reset(token)
+
+    assert recorder.spans[-1]["duration"] == 1
+
+
+def test_timing_file(tmp_path, clock):
+    recorder = TimingRecorder()
+    with recorder.span("sw1", TimingPhase.device):
+        clock.now += 2
+
+    # the spans of a worker started 5 seconds later are offset to this run.
+    worker = dict(device="sw2", phase="device", collection=None, start=1.0)
+    recorder.extend([dict(worker, duration=3.0, status="ok")], started=1005.0)
+
+    recorder.write(timing_file := tmp_path / "timing.jsonl")
+    spans = [json.loads(line) for line in timing_file.read_text().splitlines()]
+
+    assert spans == recorder.spans
+    assert [(span["device"], span["start"]) for span in spans] == [
+        ("sw1", 0.0),
+        ("sw2", 6.0),
+    ]
+
+
+def test_profile_percentiles():
+    # the inclusive percentiles of the durations 1..100 seconds.
+    durations = [float(value) for value in range(1, 101)]
+    p50, p95, p99 = check_profile_report._percentiles(durations)
+    assert (p50, p95, p99) == pytest.approx((50.5, 95.05, 99.01))
+
+    assert check_profile_report._percentiles([2.5]) == (2.5, 2.5, 2.5)
+
+    spans = [
+        dict(
+            device=f"sw{value}",
+            phase="execute",
+            collection="interfaces",
+            duration=value,
+        )
+        for value in durations
+    ]
+    console = Console(file=io.StringIO(), width=200)
+    display_profile_report(console, spans)
+
+    spread = console.file.getvalue().split("Phase Spread")[1]
+    row = next(line for line in spread.splitlines() if "execute" in line)
+    cells = [cell.strip() for cell in row.split("│")[2:7]]
+    assert cells == ["100", "50.500", "95.050", "99.010", "100.000"]